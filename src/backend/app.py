@@ -1,23 +1,24 @@
+import atexit
 from flask import Flask, jsonify
 from flask_cors import CORS
-from config import Config
-from routes import users_routes, events_routes, ticket_routes, organization_routes, organization_members_routes
+from config import get_config
+from routes import users_routes, events_routes, ticket_routes, organization_routes, organization_members_routes, analytics_routes, metrics_routes
+from db.crud import crud_analytics
 from db import db
+from db.serialization import JSONProvider
+from db.utils import create_missing_indexes
+from utils import instrumentation, profiling, slow_queries
 
-app = Flask(__name__)
-app.config.from_object(Config)
+ROUTE_MODULES = (
+    users_routes,
+    events_routes,
+    ticket_routes,
+    organization_routes,
+    organization_members_routes,
+    analytics_routes,
+    metrics_routes,
+)
 
-CORS(app)
-
-db.init_app(app)
-
-users_routes.register_routes(app)
-events_routes.register_routes(app)
-ticket_routes.register_routes(app)
-organization_routes.register_routes(app)
-organization_members_routes.register_routes(app)
-
-@app.route('/')
 def index():
     """Root endpoint for verifying API availability.
 
@@ -27,17 +28,81 @@ def index():
     """
     return jsonify({"message": "Hello, this is root"})
 
+def create_app(config=None, bare=False):
+    """Build and configure a Flask application.
+
+    Parameters: config (type or str or None): A config class, a profile name (see
+    config.PROFILES), or None for the profile named by APP_PROFILE.
+    bare (bool): Only load the config and bind the database, without the request
+    hooks and routes; tests add the ones they exercise.
+
+    Returns: Flask: The application.
+
+    Raises: RuntimeError: If the config has no QR_SIGNING_KEY.
+    """
+    if config is None or isinstance(config, str):
+        config = get_config(config)
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+    app.config.from_object(config)
+    if not app.config.get('QR_SIGNING_KEY'):
+        raise RuntimeError("QR_SIGNING_KEY is not set; set it in the environment to sign ticket QR codes")
+
+    CORS(app)
+
+    db.init_app(app)
+    if bare:
+        return app
+
+    instrumentation.init_app(app)
+    slow_queries.init_app(app)
+    profiling.init_app(app)
+
+    for module in ROUTE_MODULES:
+        module.register_routes(app)
+    app.add_url_rule('/', view_func=index)
+    return app
+
+def prepare_database(app):
+    """Create missing tables and indexes, and rebuild the analytics summary counters if enabled.
+
+    Parameters: app (Flask): The application whose database is prepared.
+    """
+    with app.app_context():
+        db.create_all()
+        create_missing_indexes(db.engine, db.metadata)
+        if app.config['ANALYTICS_SUMMARY_TABLE']:
+            crud_analytics.refresh_summary_table()
+
+def after_fork(app):
+    """Reset the per-process state a forked worker inherited from the process that built the app.
+
+    Pooled connections are dropped without closing them, since the parent still owns
+    them, and a write queue started before the fork is discarded without draining it
+    at exit (its writer thread does not exist in the child); a new one starts on first use.
+
+    Parameters: app (Flask): The application the worker serves.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    write_queue = app.extensions.pop('write_queue', None)
+    if write_queue is not None:
+        atexit.unregister(write_queue.close)
+
 if __name__ == '__main__':
     """Application entry point.
 
     Behavior:
         - Initializes the database and creates all tables if they do not exist.
+        - Adds any model index missing from a database created by an older version.
+        - Rebuilds the analytics summary counters when ANALYTICS_SUMMARY_TABLE is enabled.
         - Runs the Flask development server with debug mode enabled.
 
     Note:
         Running with debug=True enables auto-reload and improved error messages,
-        but should not be used in production.
+        but should not be used in production; serve wsgi.py with gunicorn instead.
     """
-    with app.app_context():
-        db.create_all()
+    app = create_app()
+    prepare_database(app)
     app.run(debug=True)
@@ -0,0 +1,121 @@
+"""Read/write concurrency benchmark for the database engine profiles.
+
+Reader threads list an event's tickets while writer threads issue new tickets
+on the same SQLite file, once per profile: SQLite's defaults (rollback journal,
+no PRAGMAs), the dev profile and the prod profile (WAL, synchronous=NORMAL,
+larger cache and mmap, bigger pool). The benchmark reports reads and writes per
+second and how many operations failed with "database is locked".
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_engine_profiles --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import threading
+import time
+from benchmarks.common import make_app, report, temp_database
+from config import Config, DevelopmentConfig, ProductionConfig
+from db import db
+from db.crud import crud_ticket
+from db.models import Event
+
+
+class DefaultsConfig(Config):
+    SQLITE_PRAGMAS = {}
+
+
+PROFILES = {
+    "sqlite defaults": DefaultsConfig,
+    "dev": DevelopmentConfig,
+    "prod": ProductionConfig,
+}
+
+
+def run(name, config, readers, writers, seconds, seed):
+    """Run readers and writers against one profile for a fixed time and return its measurements."""
+    with temp_database() as path:
+        app = make_app(path, config=config, ENTITY_CACHE_SIZE=0)
+        with app.app_context():
+            event = Event(title="Concurrency")
+            db.session.add(event)
+            db.session.commit()
+            event_id = event.id
+            for attendee_id in range(seed):
+                crud_ticket.create_ticket({"attendee_id": attendee_id, "event_id": event_id})
+            db.session.remove()
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def work(operation):
+            done = locked = 0
+            with app.app_context():
+                while not stop.is_set():
+                    try:
+                        operation()
+                        done += 1
+                    except RuntimeError as e:
+                        if "locked" not in str(e):
+                            raise
+                        locked += 1
+                    finally:
+                        db.session.remove()
+            return done, locked
+
+        def reader():
+            done, locked = work(lambda: crud_ticket.get_tickets_by_event(event_id))
+            with lock:
+                counts["reads"] += done
+                counts["locked"] += locked
+
+        attendee_ids = iter(range(seed, 10 ** 9))
+
+        def writer():
+            done, locked = work(lambda: crud_ticket.create_ticket({"attendee_id": next(attendee_ids), "event_id": event_id}))
+            with lock:
+                counts["writes"] += done
+                counts["locked"] += locked
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        with app.app_context():
+            db.engine.dispose()
+
+    return {
+        "profile": name,
+        "readers": readers,
+        "writers": writers,
+        "reads/s": f"{counts['reads'] / elapsed:.0f}",
+        "writes/s": f"{counts['writes'] / elapsed:.0f}",
+        "locked": counts["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=500, help="tickets created before the run")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    args = parser.parse_args()
+
+    rows = [
+        run(name, PROFILES[name], args.readers, args.writers, args.seconds, args.seed)
+        for name in args.profiles
+    ]
+    report(f"Engine profiles: {args.readers} readers, {args.writers} writers, {args.seconds:g}s", rows)
+
+
+if __name__ == "__main__":
+    main()
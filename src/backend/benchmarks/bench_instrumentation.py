@@ -0,0 +1,64 @@
+"""Overhead benchmark for request and SQL instrumentation.
+
+Serves the same requests through the Flask test client with METRICS_ENABLED
+off and on: a single event lookup (a few statements, one row) and the full
+event list (one statement, many rows, where per-row counting costs the most).
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_instrumentation --events 5000 --requests 200
+"""
+import argparse
+from benchmarks.common import make_app, report, temp_database, timer
+from db import db
+from db.models import Event
+from db.serialization import JSONProvider
+from routes import events_routes, metrics_routes
+from utils import instrumentation
+
+
+def run(enabled, events, requests):
+    """Time the requests with instrumentation on or off and return the measurements."""
+    rows = []
+    with temp_database() as path:
+        app = make_app(path, METRICS_ENABLED=enabled, ENTITY_CACHE_SIZE=0)
+        app.json = JSONProvider(app)
+        instrumentation.init_app(app)
+        events_routes.register_routes(app)
+        metrics_routes.register_routes(app)
+        with app.app_context():
+            db.session.add_all(Event(title=f"Event {i}") for i in range(events))
+            db.session.commit()
+            db.session.remove()
+
+        client = app.test_client()
+        for label, url in (("GET /events/1", "/events/1"), ("GET /events", "/events")):
+            count = requests * 10 if url == "/events/1" else requests
+            client.get(url)
+            with timer() as elapsed:
+                for _ in range(count):
+                    client.get(url)
+            rows.append({
+                "request": label,
+                "metrics": "on" if enabled else "off",
+                "requests": count,
+                "ms/request": f"{elapsed['seconds'] * 1000 / count:.3f}",
+            })
+        with app.app_context():
+            db.engine.dispose()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    rows = run(False, args.events, args.requests) + run(True, args.events, args.requests)
+    rows.sort(key=lambda row: row["request"])
+    report(f"Instrumentation overhead ({args.events} events)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Throughput benchmark for rejecting ticket QR codes at the door.
+
+Compares checking the signature of a scanned QR payload, which needs no
+database access, with looking the ticket up by primary key, which is what
+validating a bare ticket ID costs. Both are timed on forged codes, the case
+the signature check exists to make cheap.
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_qr_validation --tickets 10000 --scans 50000
+"""
+import argparse
+import random
+from benchmarks.common import make_app, report, temp_database, timer
+from db import db
+from db.crud import crud_ticket
+from db.models import Event, Ticket, User
+from utils.qr_codes import ticket_qr_payload, verify_ticket_payload
+
+
+def seed(app, tickets):
+    """Create one event with the given number of tickets and return their (id, event, attendee) triples."""
+    with app.app_context():
+        event = Event(title="Door benchmark")
+        user = User(username="bench", password="x", email="bench@example.com", role="attendee")
+        db.session.add_all([event, user])
+        db.session.flush()
+        db.session.execute(
+            db.insert(Ticket),
+            [{"attendee_id": user.id, "event_id": event.id, "status": "valid"} for _ in range(tickets)]
+        )
+        db.session.commit()
+        rows = db.session.query(Ticket.id, Ticket.event_id, Ticket.attendee_id).all()
+        db.session.remove()
+    return [tuple(row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--scans", type=int, default=50000)
+    args = parser.parse_args()
+
+    with temp_database() as path:
+        app = make_app(path)
+        key = app.config["QR_SIGNING_KEY"]
+        tickets = seed(app, args.tickets)
+
+        rng = random.Random(0)
+        sample = [rng.choice(tickets) for _ in range(args.scans)]
+        # Forged codes: a guessed ticket ID paired with another ticket's signature.
+        forged = [
+            ticket_qr_payload(*row, key).replace(f"{row[0]}.", f"{row[0] + 1}.", 1)
+            for row in sample
+        ]
+        signed = [ticket_qr_payload(*row, key) for row in sample]
+
+        rows = []
+        for label, codes in (("signature check, valid", signed), ("signature check, forged", forged)):
+            with timer() as elapsed:
+                for code in codes:
+                    try:
+                        verify_ticket_payload(code, key)
+                    except ValueError:
+                        pass
+            rows.append({"method": label, "scans": len(codes), "scans/s": f"{len(codes) / elapsed['seconds']:.0f}"})
+
+        with app.app_context():
+            with timer() as elapsed:
+                for ticket_id, _, _ in sample:
+                    crud_ticket.get_ticket_by_id(ticket_id + 1)
+                    db.session.expunge_all()
+            rows.append({"method": "DB lookup by ticket ID", "scans": len(sample), "scans/s": f"{len(sample) / elapsed['seconds']:.0f}"})
+            db.session.remove()
+            db.engine.dispose()
+
+    report(f"QR validation: {args.scans} scans against {args.tickets} tickets", rows)
+
+
+if __name__ == "__main__":
+    main()
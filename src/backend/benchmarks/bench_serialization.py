@@ -0,0 +1,84 @@
+"""Microbenchmark for serializing list endpoints to JSON.
+
+For events, tickets and users it compares loading ORM instances and building
+each row's .data dict, then encoding with Flask's default JSON provider,
+against selecting the row encoder's columns and encoding with the app's
+JSONProvider. Both paths include the query, as the list routes do.
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_serialization --rows 20000
+"""
+import argparse
+from datetime import datetime, timedelta
+from flask.json.provider import DefaultJSONProvider
+from benchmarks.common import make_app, report, temp_database, timer
+from db import db
+from db.models import Event, Ticket, User
+from db.serialization import EVENT, TICKET, USER, JSONProvider
+
+
+def seed(app, rows):
+    """Insert the given number of users, events and tickets."""
+    start = datetime(2025, 1, 1, 18)
+    with app.app_context():
+        db.session.execute(db.insert(User), [
+            {"username": f"user{i}", "password": "x", "email": f"user{i}@example.com",
+             "role": "student", "first_name": "First", "last_name": "Last", "program": "SOEN"}
+            for i in range(rows)
+        ])
+        db.session.execute(db.insert(Event), [
+            {"title": f"Event {i}", "description": "A benchmark event", "location": "Hall H",
+             "start_date": start + timedelta(hours=i), "end_date": start + timedelta(hours=i + 2),
+             "category": "talk", "capacity": 100, "price": 10.0, "status": "active"}
+            for i in range(rows)
+        ])
+        db.session.execute(db.insert(Ticket), [
+            {"attendee_id": i + 1, "event_id": i + 1, "qr_code": f"QR{i}", "status": "valid"}
+            for i in range(rows)
+        ])
+        db.session.commit()
+
+
+def measure(app, provider, serialize, repeat):
+    """Return rows/s for producing the JSON body of one list response."""
+    with app.app_context():
+        count = len(serialize())
+        with timer() as elapsed:
+            for _ in range(repeat):
+                provider.dumps(serialize())
+                db.session.expunge_all()
+    return count * repeat / elapsed["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with temp_database() as path:
+        app = make_app(path)
+        seed(app, args.rows)
+        default_provider = DefaultJSONProvider(app)
+        fast_provider = JSONProvider(app)
+
+        rows = []
+        for name, model, encoder in (("events", Event, EVENT), ("tickets", Ticket, TICKET), ("users", User, USER)):
+            orm = measure(app, default_provider, lambda: [obj.data for obj in db.session.query(model).all()], args.repeat)
+            encoded = measure(app, fast_provider, lambda: encoder.encode_all(db.session.query(*encoder.columns).all()), args.repeat)
+            rows.append({
+                "model": name,
+                ".data rows/s": f"{orm:.0f}",
+                "encoder rows/s": f"{encoded:.0f}",
+                "speedup": f"{encoded / orm:.1f}x",
+            })
+
+        with app.app_context():
+            db.engine.dispose()
+
+    report(f"Serialization: {args.rows} rows per list", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time-to-first-byte and peak memory of buffered vs streamed list responses.
+
+Serves GET /events from tables of growing size, once as the regular
+buffered JSON response and once with ?stream=json, and reports how long the
+first chunk takes and the peak Python heap allocation (tracemalloc) while
+the whole body is consumed.
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_streaming --sizes 10000 50000 200000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from benchmarks.common import make_app, report, temp_database
+from db import db
+from db.models import Event
+from db.serialization import JSONProvider
+from routes import events_routes
+
+
+def seed(app, rows):
+    start = datetime(2025, 1, 1, 18)
+    with app.app_context():
+        db.session.execute(db.insert(Event), [
+            {"title": f"Event {i}", "description": "A benchmark event", "location": "Hall H",
+             "start_date": start + timedelta(hours=i), "category": "talk", "price": 10.0, "status": "active"}
+            for i in range(rows)
+        ])
+        db.session.commit()
+
+
+def measure(client, url):
+    """Return (seconds to first chunk, total seconds, peak MiB) for one request."""
+    tracemalloc.start()
+    begin = time.perf_counter()
+    response = client.get(url, buffered=False)
+    chunks = iter(response.response)
+    next(chunks)
+    first = time.perf_counter() - begin
+    for _ in chunks:
+        pass
+    total = time.perf_counter() - begin
+    response.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        with temp_database() as path:
+            app = make_app(path)
+            app.json = JSONProvider(app)
+            events_routes.register_routes(app)
+            seed(app, size)
+            client = app.test_client()
+            for mode, url in (("buffered", "/events"), ("stream=json", "/events?stream=json")):
+                first, total, peak = measure(client, url)
+                rows.append({
+                    "rows": size,
+                    "mode": mode,
+                    "first byte (ms)": f"{first * 1000:.1f}",
+                    "total (s)": f"{total:.2f}",
+                    "peak (MiB)": f"{peak:.1f}",
+                })
+            with app.app_context():
+                db.engine.dispose()
+
+    report("GET /events: buffered vs streamed", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Contention benchmark for capacity-enforced ticket issuance.
+
+Many threads buy tickets for the same event at once, the way a popular
+ticket drop hits POST /tickets. The benchmark reports purchase throughput
+and checks that the number of issued tickets never exceeds the capacity.
+
+Usage (from src/backend):
+
+    python -m benchmarks.bench_ticket_issuance --buyers 2000 --capacity 500 --threads 1 4 16
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import make_app, report, temp_database, timer
+from db import db
+from db.crud import crud_ticket
+from db.models import Event, Ticket
+
+
+def run(threads, buyers, capacity):
+    """Run one contention round and return its measurements."""
+    with temp_database() as path:
+        app = make_app(path)
+        with app.app_context():
+            event = Event(title="Ticket drop", capacity=capacity)
+            db.session.add(event)
+            db.session.commit()
+            event_id = event.id
+            db.session.remove()
+
+        def buy(attendee_id):
+            with app.app_context():
+                try:
+                    crud_ticket.create_ticket({"attendee_id": attendee_id, "event_id": event_id})
+                    return True
+                except crud_ticket.SoldOutError:
+                    return False
+                finally:
+                    db.session.remove()
+
+        with timer() as elapsed:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                results = list(pool.map(buy, range(buyers)))
+
+        with app.app_context():
+            issued = db.session.query(Ticket).filter_by(event_id=event_id).count()
+            db.engine.dispose()
+
+    if issued > capacity or issued != sum(results):
+        raise AssertionError(f"Oversold: {issued} tickets issued for {capacity} seats")
+
+    return {
+        "threads": threads,
+        "buyers": buyers,
+        "issued": issued,
+        "sold_out": buyers - issued,
+        "seconds": f"{elapsed['seconds']:.2f}",
+        "purchases/s": f"{buyers / elapsed['seconds']:.0f}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=1000)
+    parser.add_argument("--capacity", type=int, default=250)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    rows = [run(threads, args.buyers, args.capacity) for threads in args.threads]
+    report(f"Ticket issuance: {args.buyers} buyers for {args.capacity} seats", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Benchmarks are run from the src/backend directory, e.g.:
+
+    python -m benchmarks.bench_ticket_issuance
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from flask import Flask
+from config import Config
+from db import db
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": 30}}
+    SQLITE_PRAGMAS = {**Config.SQLITE_PRAGMAS, "busy_timeout": 30000}
+
+
+def make_app(db_path, config=BenchConfig, **overrides):
+    """Build a bare Flask app bound to a file-backed SQLite database.
+
+    Parameters: db_path (str): Path of the SQLite file to use.
+    config (type): The config class to load.
+    overrides: Extra config values to set on the app.
+
+    Returns: Flask: The app, with all tables created.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config.update(overrides)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@contextmanager
+def temp_database():
+    """Yield the path of a throwaway SQLite file that is removed afterwards."""
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "bench.db")
+
+
+@contextmanager
+def timer():
+    """Measure wall-clock time; the yielded dict holds "seconds" once the block exits."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def report(title, rows):
+    """Print benchmark results as an aligned table.
+
+    Parameters: title (str): Heading printed above the table.
+    rows (list): A list of dictionaries sharing the same keys.
+    """
+    print(f"\n{title}")
+    if not rows:
+        return
+    headers = list(rows[0])
+    widths = [max(len(str(h)), *(len(str(r[h])) for r in rows)) for h in headers]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)).rstrip())
+    for row in rows:
+        print("  ".join(str(row[h]).ljust(w) for h, w in zip(headers, widths)).rstrip())
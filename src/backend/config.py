@@ -2,6 +2,171 @@ import os
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
+def database_uri(default=f"sqlite:///{os.path.join(BASE_DIR, 'app.db')}"):
+    """Return the database URI from the DATABASE_URL environment variable, or the default SQLite file.
+
+    Hosting providers often hand out postgres:// URLs, which SQLAlchemy only accepts as postgresql://.
+    """
+    uri = os.environ.get("DATABASE_URL", default)
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+def engine_options(uri, pool_size, max_overflow, pool_timeout=30, pool_recycle=1800):
+    """Build SQLALCHEMY_ENGINE_OPTIONS with an explicit connection pool size for a database URI.
+
+    In-memory SQLite keeps its single shared connection and gets no pool options. Server
+    databases also check connections before use and replace them after pool_recycle
+    seconds, so connections closed by the server or a proxy are not handed out.
+
+    Parameters: uri (str): The database URI.
+    pool_size (int): Connections kept open in the pool.
+    max_overflow (int): Extra connections opened under load and closed when returned.
+    pool_timeout (int): Seconds to wait for a free connection before failing.
+    pool_recycle (int): Maximum age in seconds of a server database connection.
+
+    Returns: dict: The engine options.
+    """
+    if uri.startswith("sqlite") and (uri in ("sqlite://", "sqlite:///") or ":memory:" in uri):
+        return {}
+    options = {"pool_size": pool_size, "max_overflow": max_overflow, "pool_timeout": pool_timeout}
+    if not uri.startswith("sqlite"):
+        options.update(pool_pre_ping=True, pool_recycle=pool_recycle)
+    return options
+
 class Config:
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(BASE_DIR, 'app.db')}"
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = database_uri()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=10)
+    # PRAGMAs run on every new SQLite connection (ignored for other databases), in
+    # order: busy_timeout (ms) makes writers wait for a lock instead of failing, WAL
+    # lets readers run alongside a writer, synchronous=NORMAL only syncs at WAL
+    # checkpoints, cache_size is in KiB when negative and mmap_size in bytes.
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "mmap_size": 64 * 1024 * 1024,
+    }
+    # Keep per-status event/ticket counts in the analytics_counters table so
+    # /analytics/summary reads a handful of rows instead of grouping whole tables.
+    ANALYTICS_SUMMARY_TABLE = False
+    # Keep per-event registered/checked-in counts in the event_attendance table so
+    # /events/<id>/attendance can be polled without counting tickets each time.
+    ATTENDANCE_COUNTERS = False
+    # Rendered ticket QR codes kept in memory (LRU) and, when QR_CACHE_DIR is set,
+    # on disk so they survive restarts. New tickets are rendered in the background.
+    QR_CACHE_SIZE = 1024
+    QR_CACHE_DIR = None
+    QR_PRERENDER = True
+    # How long browsers may reuse a ticket QR image before revalidating it.
+    QR_CACHE_MAX_AGE = 86400
+    # Key for the HMAC that signs ticket QR payloads. Set QR_SIGNING_KEY in the
+    # environment for any real deployment; rotating it invalidates issued codes.
+    # The development key is public, so the prod profile has no fallback.
+    QR_SIGNING_KEY = os.environ.get("QR_SIGNING_KEY", "dev-qr-signing-key")
+    # Still accept bare ticket IDs (typed in by hand or from codes printed
+    # before payloads were signed) at /tickets/validate.
+    QR_ACCEPT_UNSIGNED = True
+    # Per-process LRU cache for get_user_by_id/get_event_by_id, invalidated by the
+    # CRUD update/delete functions. ENTITY_CACHE_TTL (seconds) bounds how long an
+    # entry changed by another process can be served. Set the size to 0 to disable.
+    ENTITY_CACHE_SIZE = 2048
+    ENTITY_CACHE_TTL = 30
+    # "memory" keeps the cache in one process. Use "changelog" when running several
+    # worker processes: invalidations are written to the cache_invalidations table and
+    # every worker polls it at most every ENTITY_CACHE_POLL_INTERVAL seconds (0 polls
+    # before every cached lookup).
+    ENTITY_CACHE_BACKEND = "memory"
+    ENTITY_CACHE_POLL_INTERVAL = 1.0
+    # CRUD writes that fail because the database is locked (SQLITE_BUSY) or, on
+    # PostgreSQL, on a serialization failure are rolled back and retried up to
+    # DB_WRITE_RETRIES times, sleeping a random time below an exponentially growing
+    # bound (DB_RETRY_BASE_DELAY doubled per retry, capped at DB_RETRY_MAX_DELAY).
+    DB_WRITE_RETRIES = 5
+    DB_RETRY_BASE_DELAY = 0.01
+    DB_RETRY_MAX_DELAY = 0.5
+    # Hand ticket inserts and updates to one writer thread that commits them in
+    # groups of up to WRITE_QUEUE_BATCH_SIZE, waiting at most WRITE_QUEUE_MAX_WAIT_MS
+    # for a group to fill, so a burst of purchases shares commits. Callers wait up
+    # to WRITE_QUEUE_TIMEOUT seconds for their group. Off by default: it only helps
+    # under high write concurrency (see the benchmark figures in the README).
+    WRITE_QUEUE = False
+    WRITE_QUEUE_BATCH_SIZE = 64
+    WRITE_QUEUE_MAX_WAIT_MS = 5
+    WRITE_QUEUE_TIMEOUT = 30
+    # Time every request and SQL statement and serve the totals at /metrics.
+    METRICS_ENABLED = True
+    # Statements slower than SLOW_QUERY_MS are logged as warnings with their
+    # parameters, the CRUD function that ran them and (SLOW_QUERY_EXPLAIN) their
+    # query plan. Each distinct statement is logged at most once per
+    # SLOW_QUERY_LOG_INTERVAL seconds, and at most SLOW_QUERY_LOG_LIMIT entries are
+    # written per interval; the rest are only counted. None disables the log.
+    SLOW_QUERY_MS = 200
+    SLOW_QUERY_EXPLAIN = True
+    SLOW_QUERY_LOG_INTERVAL = 60
+    SLOW_QUERY_LOG_LIMIT = 20
+    # Request profiling (utils/profiling.py): a request whose PROFILE_HEADER header
+    # equals PROFILE_TOKEN, and a PROFILE_SAMPLE_RATE fraction of all requests, is run
+    # under cProfile (and tracemalloc when PROFILE_TRACEMALLOC is set). Profiles are
+    # written to PROFILE_DIR, keeping the newest PROFILE_KEEP. Off unless a token is
+    # set or the sample rate is above zero.
+    PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN")
+    PROFILE_HEADER = "X-Profile"
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_TRACEMALLOC = True
+    PROFILE_TOP_ALLOCATIONS = 25
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+    PROFILE_KEEP = 100
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    PROFILE_TOKEN = None
+    PROFILE_SAMPLE_RATE = 0
+
+class ProductionConfig(Config):
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        Config.SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.environ.get("DB_POOL_SIZE", 10)),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 20))
+    )
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 256 * 1024 * 1024,
+    }
+    # Several worker processes share the database in production.
+    ENTITY_CACHE_BACKEND = "changelog"
+    # Anyone could sign payloads with the public development key, and bare ticket
+    # IDs are sequential and easy to guess: require a key (create_app refuses to
+    # start without one) and only accept signed codes.
+    QR_SIGNING_KEY = os.environ.get("QR_SIGNING_KEY")
+    QR_ACCEPT_UNSIGNED = False
+
+PROFILES = {
+    "dev": DevelopmentConfig,
+    "test": TestingConfig,
+    "prod": ProductionConfig,
+}
+
+def get_config(name=None):
+    """Return the config class of a named profile.
+
+    Parameters: name (str): "dev", "test" or "prod"; defaults to the APP_PROFILE environment variable, then "dev".
+
+    Returns: type: The config class, to pass to app.config.from_object.
+
+    Raises: ValueError: If the profile name is unknown.
+    """
+    name = name or os.environ.get("APP_PROFILE", "dev")
+    if name not in PROFILES:
+        raise ValueError(f"Unknown config profile '{name}', expected one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
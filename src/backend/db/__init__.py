@@ -1,3 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
+from db.utils import install_sqlite_pragmas
 
-db = SQLAlchemy()
+class Database(SQLAlchemy):
+    """The Flask-SQLAlchemy extension, applying the app's SQLITE_PRAGMAS to each engine it creates."""
+
+    def init_app(self, app):
+        super().init_app(app)
+        with app.app_context():
+            for engine in self.engines.values():
+                install_sqlite_pragmas(engine, app.config.get("SQLITE_PRAGMAS"))
+
+db = Database()
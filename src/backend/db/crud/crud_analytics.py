@@ -0,0 +1,211 @@
+from flask import current_app, has_app_context
+from sqlalchemy import event as sa_event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from db.models import AnalyticsCounter, Event, Ticket, User
+from db import db
+from db.crud import crud_transactions
+
+# INSERT constructs supporting ON CONFLICT DO UPDATE, by dialect name.
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+# Materialized metrics kept in the analytics_counters table, mapped to the column they group by.
+SUMMARY_METRICS = {
+    "events": Event.status,
+    "tickets": Ticket.status,
+}
+
+def _summary_table_enabled():
+    """
+    Check whether the materialized analytics_counters table is switched on for the current app.
+
+    Returns: bool: True if ANALYTICS_SUMMARY_TABLE is enabled in the app config.
+    """
+    return has_app_context() and current_app.config.get("ANALYTICS_SUMMARY_TABLE", False)
+
+def _normalize_key(value):
+    """
+    Normalize a status/role value into a counter key, matching the case-insensitive
+    comparisons done by the admin dashboard.
+
+    Parameters: value (str or None): The raw column value.
+
+    Returns: str: The lower-cased value, or an empty string when the value is missing.
+    """
+    return value.lower() if value else ""
+
+def _grouped_counts(column):
+    """
+    Count rows per distinct value of a column with a single GROUP BY query.
+
+    Parameters: column (Column): The model column to group on.
+
+    Returns: dict: A mapping of normalized column value to row count.
+    """
+    key = func.lower(column)
+    rows = db.session.query(key, func.count()).group_by(key).all()
+    counts = {}
+    for value, count in rows:
+        normalized = _normalize_key(value)
+        counts[normalized] = counts.get(normalized, 0) + count
+    return counts
+
+def _section(counts, label):
+    """
+    Shape grouped counts into the summary payload for one table.
+
+    Parameters: counts (dict): Normalized value to row count.
+    label (str): The name of the breakdown field (e.g. "by_status").
+
+    Returns: dict: The total row count and the non-zero breakdown of rows with a non-empty value.
+    """
+    return {
+        "total": sum(counts.values()),
+        label: {key: count for key, count in counts.items() if key and count}
+    }
+
+def _read_counters():
+    """
+    Read the materialized event and ticket counters.
+
+    The table is built at startup (see refresh_summary_table) and kept up to date by
+    the CRUD writes; reading it never writes.
+
+    Returns: dict: A mapping of metric name to its normalized value counts.
+    """
+    counters = {metric: {} for metric in SUMMARY_METRICS}
+    for row in db.session.query(AnalyticsCounter).all():
+        counters.setdefault(row.metric, {})[row.key] = row.count
+    return counters
+
+def get_summary():
+    """
+    Compute the admin dashboard statistics with aggregate SQL queries.
+
+    Event and ticket counts come from the analytics_counters table when
+    ANALYTICS_SUMMARY_TABLE is enabled, and from grouped COUNT(*) queries otherwise.
+
+    Parameters: None
+
+    Returns: dict: Totals and per-status/per-role breakdowns for events, users and tickets,
+    plus total ticket sales.
+    """
+    try:
+        if _summary_table_enabled():
+            counters = _read_counters()
+        else:
+            counters = {metric: _grouped_counts(column) for metric, column in SUMMARY_METRICS.items()}
+
+        sales = (
+            db.session.query(func.coalesce(func.sum(Event.price), 0))
+            .select_from(Ticket)
+            .join(Event, Ticket.event_id == Event.id)
+            .scalar()
+        )
+
+        return {
+            "events": _section(counters["events"], "by_status"),
+            "users": _section(_grouped_counts(User.role), "by_role"),
+            "tickets": _section(counters["tickets"], "by_status"),
+            "sales": float(sales)
+        }
+    except Exception as e:
+        raise RuntimeError(f"Failed to compute analytics summary: {e}")
+
+def refresh_summary_table():
+    """
+    Rebuild the analytics_counters table from scratch using grouped COUNT(*) queries.
+
+    app.prepare_database runs it at startup when ANALYTICS_SUMMARY_TABLE is enabled;
+    afterwards the counters are kept up to date incrementally as events and tickets change.
+
+    Parameters: None
+
+    Returns: None
+    """
+    def work():
+        db.session.query(AnalyticsCounter).delete()
+        for metric, column in SUMMARY_METRICS.items():
+            for key, count in _grouped_counts(column).items():
+                db.session.add(AnalyticsCounter(metric=metric, key=key, count=count))
+
+    try:
+        crud_transactions.run_in_transaction("refresh_summary_table", work)
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Failed to refresh analytics summary: {e}")
+
+def _bump_counter(connection, metric, value, delta):
+    """
+    Add delta to a single counter row inside the flush that changed the underlying data.
+
+    A single INSERT ... ON CONFLICT DO UPDATE creates or updates the row, so two writers
+    creating the same counter at once cannot collide on its primary key.
+
+    Parameters: connection (Connection): The connection of the ongoing flush.
+    metric (str): The counter metric name.
+    value (str or None): The raw status value being counted.
+    delta (int): The amount to add (negative to subtract).
+    """
+    table = AnalyticsCounter.__table__
+    insert = UPSERT_INSERTS[connection.dialect.name]
+    connection.execute(
+        insert(table)
+        .values(metric=metric, key=_normalize_key(value), count=delta)
+        .on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.key],
+            set_={"count": table.c.count + delta}
+        )
+    )
+
+def record_status_change(connection, metric, old, new, count=1):
+    """
+    Apply a status change made with a bulk UPDATE statement to the analytics counters.
+
+    Mapper listeners only see changes flushed through the ORM, so CRUD functions that
+    change statuses with a single UPDATE statement report them here instead.
+
+    Parameters: connection (Connection): The connection the UPDATE was executed on.
+    metric (str): The counter metric name (e.g. "tickets").
+    old (str): The status the rows had before the update.
+    new (str): The status the rows have after the update.
+    count (int): The number of rows that changed.
+    """
+    if _summary_table_enabled() and count:
+        _bump_counter(connection, metric, old, -count)
+        _bump_counter(connection, metric, new, count)
+
+def _register_counter_listeners(model, metric):
+    """
+    Attach mapper listeners that keep one metric of the analytics_counters table in sync with a model.
+
+    Parameters: model (db.Model): The model whose status column is counted.
+    metric (str): The counter metric name.
+    """
+
+    @sa_event.listens_for(model, "after_insert")
+    def _after_insert(mapper, connection, target):
+        if _summary_table_enabled():
+            _bump_counter(connection, metric, target.status, 1)
+
+    @sa_event.listens_for(model, "after_delete")
+    def _after_delete(mapper, connection, target):
+        if _summary_table_enabled():
+            _bump_counter(connection, metric, target.status, -1)
+
+    @sa_event.listens_for(model, "after_update")
+    def _after_update(mapper, connection, target):
+        if not _summary_table_enabled():
+            return
+        history = inspect(target).attrs.status.history
+        if not history.has_changes():
+            return
+        for old in history.deleted:
+            _bump_counter(connection, metric, old, -1)
+        for new in history.added:
+            _bump_counter(connection, metric, new, 1)
+
+for _metric, _column in SUMMARY_METRICS.items():
+    _register_counter_listeners(_column.class_, _metric)
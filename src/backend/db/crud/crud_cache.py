@@ -0,0 +1,266 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from flask import current_app, has_app_context
+from sqlalchemy import delete, func, insert, select
+from db.models import CacheInvalidation
+from db import db
+from db.crud import crud_transactions
+
+class EntityCache:
+    """
+    Bounded LRU cache with a per-entry time-to-live, shared by the threads of one app.
+
+    Values are the dictionaries returned by CRUD getters; callers get a shallow copy so
+    they cannot change the cached entry.
+    """
+
+    def __init__(self, max_entries, ttl, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for a key, calling loader() and caching its result on a miss.
+
+        None results (missing rows) are not cached. A value loaded while any key was
+        invalidated is returned but not stored, so a read racing with a write cannot put
+        the old row back into the cache.
+
+        Parameters: key (hashable): The entity key, e.g. its primary key.
+        loader (callable): Reads the value from the database.
+
+        Returns: The cached or freshly loaded value.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(value)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self.invalidations
+
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            if self.invalidations == generation:
+                self._entries[key] = (dict(value), now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, key):
+        """Drop a key from the cache; call after the write that changed it has committed."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """Return the hit, miss, eviction, expiration and invalidation counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries)
+            }
+
+class MemoryBackend:
+    """
+    Cache backend keeping one EntityCache per entity kind in this process only.
+
+    Suitable for a single worker process. With several workers an update handled by one
+    worker only evicts that worker's entry; the others serve the old value until its TTL.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def cache(self, name):
+        """Return the EntityCache of one entity kind, creating it on first use."""
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = EntityCache(self.max_entries, self.ttl)
+            return self._caches[name]
+
+    def get_or_load(self, name, key, loader):
+        return self.cache(name).get_or_load(key, loader)
+
+    def invalidate(self, name, key):
+        self.cache(name).invalidate(key)
+
+    def stats(self):
+        with self._lock:
+            caches = dict(self._caches)
+        return {name: cache.stats() for name, cache in caches.items()}
+
+class ChangeLogBackend(MemoryBackend):
+    """
+    Cache backend for several worker processes sharing one database.
+
+    Entries are still kept in each process, but every invalidation is also appended to
+    the cache_invalidations table. Before serving a lookup, each process reads the rows
+    added since it last looked (at most once per poll interval) and evicts those keys,
+    so an update handled by any worker reaches all of them within the poll interval.
+    """
+
+    def __init__(self, max_entries, ttl, poll_interval=1.0, retention=3600, clock=time.monotonic):
+        super().__init__(max_entries, ttl)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.clock = clock
+        self.polls = 0
+        self.remote_invalidations = 0
+        self._last_poll = clock()
+        self._last_seen = db.session.execute(
+            select(func.coalesce(func.max(CacheInvalidation.id), 0))
+        ).scalar()
+
+    def _poll(self):
+        """Evict the keys invalidated by any process since the last poll."""
+        with self._lock:
+            if self.clock() - self._last_poll < self.poll_interval:
+                return
+            self._last_poll = self.clock()
+            last_seen = self._last_seen
+
+        rows = db.session.execute(
+            select(CacheInvalidation.id, CacheInvalidation.kind, CacheInvalidation.key)
+            .where(CacheInvalidation.id > last_seen)
+            .order_by(CacheInvalidation.id)
+        ).all()
+        for row in rows:
+            self.cache(row.kind).invalidate(_normalize_key(row.key))
+
+        with self._lock:
+            self.polls += 1
+            self.remote_invalidations += len(rows)
+            if rows:
+                self._last_seen = max(self._last_seen, rows[-1].id)
+
+    def get_or_load(self, name, key, loader):
+        self._poll()
+        return super().get_or_load(name, key, loader)
+
+    def invalidate(self, name, key):
+        super().invalidate(name, key)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        def work():
+            db.session.execute(insert(CacheInvalidation).values(kind=name, key=str(key), created_at=now))
+            db.session.execute(
+                delete(CacheInvalidation)
+                .where(CacheInvalidation.created_at < now - timedelta(seconds=self.retention))
+            )
+
+        try:
+            crud_transactions.run_in_transaction("log_cache_invalidation", work)
+        except Exception as e:
+            # The write itself has already committed; other workers fall back to the TTL.
+            current_app.logger.warning("Failed to log cache invalidation of %s %s: %s", name, key, e)
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats["change_log"] = {"polls": self.polls, "remote_invalidations": self.remote_invalidations}
+        return stats
+
+# Values accepted by the ENTITY_CACHE_BACKEND setting. A callable taking the app
+# config can be set instead to plug in another backend.
+BACKENDS = {
+    "memory": lambda config: MemoryBackend(config["ENTITY_CACHE_SIZE"], config.get("ENTITY_CACHE_TTL", 30)),
+    "changelog": lambda config: ChangeLogBackend(
+        config["ENTITY_CACHE_SIZE"],
+        config.get("ENTITY_CACHE_TTL", 30),
+        config.get("ENTITY_CACHE_POLL_INTERVAL", 1.0)
+    ),
+}
+
+def _normalize_key(key):
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return key
+
+def _backend():
+    """
+    Return the current app's cache backend, creating it on first use.
+
+    Returns: The backend, or None outside an app context or when ENTITY_CACHE_SIZE is 0.
+    """
+    if not has_app_context():
+        return None
+    extensions = current_app.extensions
+    if "entity_cache" not in extensions:
+        config = current_app.config
+        factory = None
+        if config.get("ENTITY_CACHE_SIZE", 0) > 0:
+            factory = config.get("ENTITY_CACHE_BACKEND", "memory")
+            factory = BACKENDS[factory] if isinstance(factory, str) else factory
+        extensions["entity_cache"] = factory(config) if factory else None
+    return extensions["entity_cache"]
+
+def read_through(name, key, loader):
+    """
+    Serve a single-entity lookup from the cache, falling back to loader() on a miss.
+
+    Parameters: name (str): The entity kind.
+    key (hashable): The entity's primary key.
+    loader (callable): Reads the entity from the database.
+
+    Returns: The entity dictionary, or None if it does not exist.
+    """
+    backend = _backend()
+    if backend is None:
+        return loader()
+    return backend.get_or_load(name, _normalize_key(key), loader)
+
+def invalidate(name, key):
+    """
+    Forget a cached entity after the write that updated or deleted it has committed.
+
+    Parameters: name (str): The entity kind.
+    key (hashable): The entity's primary key.
+    """
+    backend = _backend()
+    if backend is not None:
+        backend.invalidate(name, _normalize_key(key))
+
+def get_stats():
+    """
+    Report the counters of the current app's entity caches.
+
+    Returns: dict: A mapping of entity kind to its cache statistics.
+    """
+    backend = _backend()
+    return backend.stats() if backend is not None else {}
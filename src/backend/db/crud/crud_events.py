@@ -1,6 +1,8 @@
 from db.models import Event
 from db import db
-from ..utils import parse_iso_datetime
+from db.crud import crud_cache, crud_table_versions, crud_transactions
+from db.serialization import EVENT
+from ..utils import parse_iso_datetime, paginate_keyset
 
 def _normalize_event_dates(data):
     """Normalize event date fields by converting ISO-formatted date strings into datetime objects for the keys "start_date" and "end_date".
@@ -21,23 +23,58 @@ def get_all_events():
     
     Returns: A list of dictionaries, each representing an event object."""
     try:
-        events = db.session.query(Event).all()
-        return [event.data for event in events]
+        rows = db.session.query(*EVENT.columns).all()
+        return EVENT.encode_all(rows)
     except Exception as e:
         raise RuntimeError(f"Failed to fetch events: {e}")
 
+def get_events_page(limit, after=None):
+    """Retrieve one page of events ordered by id using a keyset cursor.
+
+    Parameters: limit (int): The maximum number of events to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: dict: The page's events under "items" and the cursor for the following page under "next_cursor" (None on the last page).
+    """
+    try:
+        rows, next_cursor = paginate_keyset(db.session.query(*EVENT.columns), [Event.id], limit, after)
+        return {"items": EVENT.encode_all(rows), "next_cursor": next_cursor}
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch events: {e}")
+
+def iter_events(batch_size=1000):
+    """Yield every event ordered by id, reading rows from the database in batches.
+
+    Parameters: batch_size (int): The number of rows fetched from the cursor at a time.
+
+    Returns: generator: Event dictionaries, as returned by get_all_events.
+    """
+    try:
+        rows = db.session.query(*EVENT.columns).order_by(Event.id).yield_per(batch_size)
+        for row in rows:
+            yield EVENT(row)
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch events: {e}")
 
 def get_event_by_id(event_id):
     """Retrieve a single event by its unique identifier.
+
+    Lookups are served from the entity cache when ENTITY_CACHE_SIZE is set; update_event
+    and delete_event invalidate the cached entry.
     
     Parameters: event_id (int): The id of the event to retrieve.
     
     Returns: A dictionary or None depending on whether the event was found."""
-    try:
+    def load():
         event = db.session.get(Event, event_id)
         if not event:
             return None
         return event.data
+
+    try:
+        return crud_cache.read_through("events", event_id, load)
     except ValueError:
         raise 
     except Exception as e:
@@ -49,12 +86,15 @@ def create_event(data):
     Parameters: data (dict): A dictionary containing the event data.
     
     Returns: The data of the newly created event."""
-    try:
-        data = _normalize_event_dates(data)
+    def work():
         event = Event(**data)
         db.session.add(event)
-        db.session.commit()
-        return event.data
+        crud_table_versions.bump_version(Event.__tablename__)
+        return event
+
+    try:
+        data = _normalize_event_dates(data)
+        return crud_transactions.run_in_transaction("create_event", work).data
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to create event: {e}")
@@ -65,14 +105,20 @@ def delete_event(event_id):
     Parameters: event_id (int) the id of the event to remove from the database.
     
     Returns: True or False depending on whether the event was deleted."""
-    try:
+    def work():
         event = db.session.get(Event, event_id)
         if not event:
             return False
 
         db.session.delete(event)
-        db.session.commit()
+        crud_table_versions.bump_version(Event.__tablename__)
         return True
+
+    try:
+        deleted = crud_transactions.run_in_transaction("delete_event", work)
+        if deleted:
+            crud_cache.invalidate("events", event_id)
+        return deleted
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to delete event {event_id}: {e}")
@@ -85,18 +131,24 @@ def update_event(event_id, data):
     data (dict): The new data to insert into the event.
     
     Returns: The newly updated event data."""
-    try:
+    def work():
         event = db.session.get(Event, event_id)
         if not event:
             return None
 
-        data = _normalize_event_dates(data)
-
         for key, value in data.items():
             if hasattr(event, key):
                 setattr(event, key, value)
 
-        db.session.commit()
+        crud_table_versions.bump_version(Event.__tablename__)
+        return event
+
+    try:
+        data = _normalize_event_dates(data)
+        event = crud_transactions.run_in_transaction("update_event", work)
+        if not event:
+            return None
+        crud_cache.invalidate("events", event_id)
         return event.data
     except ValueError:
         raise
@@ -1,5 +1,8 @@
 from db.models import Organization
 from db import db
+from db.crud import crud_cache, crud_table_versions, crud_transactions
+from db.serialization import ORGANIZATION
+from db.utils import paginate_keyset
 
 def get_all_organizations():
     """
@@ -10,8 +13,25 @@ def get_all_organizations():
     Returns: list: A list of dictionaries, each representing an organization.
     """
     try:
-        organizations = db.session.query(Organization).all()
-        return [org.data for org in organizations]
+        rows = db.session.query(*ORGANIZATION.columns).all()
+        return ORGANIZATION.encode_all(rows)
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch organizations: {e}")
+
+def get_organizations_page(limit, after=None):
+    """
+    Retrieve one page of organizations ordered by id using a keyset cursor.
+
+    Parameters: limit (int): The maximum number of organizations to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: dict: The page's organizations under "items" and the cursor for the following page under "next_cursor" (None on the last page).
+    """
+    try:
+        rows, next_cursor = paginate_keyset(db.session.query(*ORGANIZATION.columns), [Organization.id], limit, after)
+        return {"items": ORGANIZATION.encode_all(rows), "next_cursor": next_cursor}
+    except ValueError:
+        raise
     except Exception as e:
         raise RuntimeError(f"Failed to fetch organizations: {e}")
 
@@ -19,13 +39,19 @@ def get_organization(org_id):
     """
     Fetch a single organization by its ID.
 
+    Lookups are served from the entity cache when ENTITY_CACHE_SIZE is set; update_organization
+    and delete_organization invalidate the cached entry.
+
     Parameters: org_id (int): The ID of the organization to retrieve.
 
     Returns: dict or None: Serialized organization data if found; otherwise None.
     """
-    try:
+    def load():
         org = db.session.get(Organization, org_id)
         return org.data if org else None
+
+    try:
+        return crud_cache.read_through("organizations", org_id, load)
     except ValueError:
         raise
     except Exception as e:
@@ -39,11 +65,14 @@ def create_organization(data):
 
     Returns: int: The ID of the newly created organization.
     """
-    try:
+    def work():
         new_org = Organization(**data)
         db.session.add(new_org)
-        db.session.commit()
-        return new_org.id
+        crud_table_versions.bump_version(Organization.__tablename__)
+        return new_org
+
+    try:
+        return crud_transactions.run_in_transaction("create_organization", work).id
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to create organization: {e}")
@@ -57,14 +86,21 @@ def update_organization(org_id, data):
 
     Returns: dict or None: The updated serialized organization data if the record exists; otherwise None.
     """
-    try:
+    def work():
         org = db.session.get(Organization, org_id)
         if not org:
             return None
         for key, value in data.items():
             if hasattr(org, key):
                 setattr(org, key, value)
-        db.session.commit()
+        crud_table_versions.bump_version(Organization.__tablename__)
+        return org
+
+    try:
+        org = crud_transactions.run_in_transaction("update_organization", work)
+        if not org:
+            return None
+        crud_cache.invalidate("organizations", org_id)
         return org.data
     except ValueError:
         raise
@@ -80,13 +116,19 @@ def delete_organization(org_id):
 
     Returns: bool: True if deletion was successful; False if the organization does not exist.
     """
-    try:
+    def work():
         org = db.session.get(Organization, org_id)
         if not org:
             return False
         db.session.delete(org)
-        db.session.commit()
+        crud_table_versions.bump_version(Organization.__tablename__)
         return True
+
+    try:
+        deleted = crud_transactions.run_in_transaction("delete_organization", work)
+        if deleted:
+            crud_cache.invalidate("organizations", org_id)
+        return deleted
     except ValueError:
         raise
     except Exception as e:
@@ -1,5 +1,7 @@
 from db.models import OrganizationMember
 from db import db
+from db.crud import crud_transactions
+from db.utils import paginate_keyset
 
 def get_all_organization_members():
     """
@@ -15,6 +17,28 @@ def get_all_organization_members():
     except Exception as e:
         raise RuntimeError(f"Failed to fetch organization members: {e}")
 
+def get_organization_members_page(limit, after=None):
+    """
+    Retrieve one page of organization members ordered by (organization_id, user_id) using a keyset cursor.
+
+    Parameters: limit (int): The maximum number of organization members to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: dict: The page's organization members under "items" and the cursor for the following page under "next_cursor" (None on the last page).
+    """
+    try:
+        members, next_cursor = paginate_keyset(
+            db.session.query(OrganizationMember),
+            [OrganizationMember.organization_id, OrganizationMember.user_id],
+            limit,
+            after
+        )
+        return {"items": [member.data for member in members], "next_cursor": next_cursor}
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch organization members: {e}")
+
 def get_organization_member(organization_id, user_id):
     """
     Fetch a specific organization member using the given organization ID and user ID.
@@ -44,10 +68,13 @@ def create_organization_member(data):
 
     Returns: dict: A dictionary containing the newly created member's organization_id and user_id.
     """
-    try:
+    def work():
         new_member = OrganizationMember(**data)
         db.session.add(new_member)
-        db.session.commit()
+        return new_member
+
+    try:
+        new_member = crud_transactions.run_in_transaction("create_organization_member", work)
         return {"organization_id": new_member.organization_id, "user_id": new_member.user_id}
     except Exception as e:
         db.session.rollback()
@@ -62,15 +89,17 @@ def delete_organization_member(organization_id, user_id):
 
     Returns: bool: True if the member was successfully deleted; False if the member does not exist.
     """
-    try:
+    def work():
         member = db.session.query(OrganizationMember).filter_by(
             organization_id=organization_id, user_id=user_id
         ).first()
         if not member:
             return False
         db.session.delete(member)
-        db.session.commit()
         return True
+
+    try:
+        return crud_transactions.run_in_transaction("delete_organization_member", work)
     except ValueError:
         raise
     except Exception as e:
@@ -87,7 +116,7 @@ def update_organization_member(organization_id, user_id, data):
 
     Returns: dict or None: The updated serialized member data if the member exists; otherwise None.
     """
-    try:
+    def work():
         member = db.session.query(OrganizationMember).filter_by(
             organization_id=organization_id, user_id=user_id
         ).first()
@@ -96,8 +125,11 @@ def update_organization_member(organization_id, user_id, data):
         for key, value in data.items():
             if hasattr(member, key):
                 setattr(member, key, value)
-        db.session.commit()
-        return member.data
+        return member
+
+    try:
+        member = crud_transactions.run_in_transaction("update_organization_member", work)
+        return member.data if member else None
     except ValueError:
         raise
     except Exception as e:
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from db.models import TableVersion
+from db import db
+
+def _try_bump(name, now):
+    result = db.session.execute(
+        update(TableVersion)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def bump_version(name):
+    """
+    Increment the version of a table in the current transaction.
+
+    CRUD functions call this before committing a write, so the new version becomes
+    visible together with the change it describes and is discarded on rollback.
+
+    Parameters: name (str): The table name (e.g. "events").
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if _try_bump(name, now):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(TableVersion).values(name=name, version=1, updated_at=now))
+    except IntegrityError:
+        # Another writer created the row first.
+        _try_bump(name, now)
+
+def get_version(name):
+    """
+    Read the current version of a table with a single primary key lookup.
+
+    Parameters: name (str): The table name.
+
+    Returns: tuple: The version (0 if the table has never been written to through the
+    CRUD layer) and the naive UTC time of the last change (or None).
+    """
+    try:
+        row = db.session.execute(
+            select(TableVersion.version, TableVersion.updated_at).where(TableVersion.name == name)
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+    except Exception as e:
+        raise RuntimeError(f"Failed to read the version of {name}: {e}")
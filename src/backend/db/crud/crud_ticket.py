@@ -1,5 +1,12 @@
-from db.models import Ticket, Event
+from datetime import timezone
+from flask import current_app, has_app_context
+from db.models import Ticket, Event, EventAttendance, EventInventory, CheckinManifestChange, User
 from db import db
+from db.crud import crud_analytics, crud_transactions, crud_write_queue
+from db.serialization import TICKET, iso_datetime
+from db.utils import paginate_keyset
+from sqlalchemy import event as sa_event, func, insert, inspect, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 def get_all_tickets():
     """
@@ -10,8 +17,40 @@ def get_all_tickets():
     Returns: list: A list of dictionaries, each representing a ticket.
     """
     try:
-        tickets = db.session.query(Ticket).all()
-        return [ticket.data for ticket in tickets]
+        rows = db.session.query(*TICKET.columns).all()
+        return TICKET.encode_all(rows)
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch tickets: {e}")
+
+def get_tickets_page(limit, after=None):
+    """
+    Retrieve one page of tickets ordered by id using a keyset cursor.
+
+    Parameters: limit (int): The maximum number of tickets to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: dict: The page's tickets under "items" and the cursor for the following page under "next_cursor" (None on the last page).
+    """
+    try:
+        rows, next_cursor = paginate_keyset(db.session.query(*TICKET.columns), [Ticket.id], limit, after)
+        return {"items": TICKET.encode_all(rows), "next_cursor": next_cursor}
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch tickets: {e}")
+
+def iter_tickets(batch_size=1000):
+    """
+    Yield every ticket ordered by id, reading rows from the database in batches.
+
+    Parameters: batch_size (int): The number of rows fetched from the cursor at a time.
+
+    Returns: generator: Ticket dictionaries, as returned by get_all_tickets.
+    """
+    try:
+        rows = db.session.query(*TICKET.columns).order_by(Ticket.id).yield_per(batch_size)
+        for row in rows:
+            yield TICKET(row)
     except Exception as e:
         raise RuntimeError(f"Failed to fetch tickets: {e}")
 
@@ -38,7 +77,7 @@ def get_tickets_and_events_for_user(student_id):
                 "ticket_status": ticket.status,
                 "event_id": event.id,
                 "event_title": event.title,
-                "event_date": event.start_date.isoformat() if event.start_date else None,
+                "event_date": iso_datetime(event.start_date),
                 "event_location": event.location
             })
 
@@ -49,6 +88,65 @@ def get_tickets_and_events_for_user(student_id):
         db.session.rollback()
         return []
 
+def _to_naive_utc(value):
+    """
+    Convert a datetime to the naive UTC form event dates are stored in.
+
+    Parameters: value (datetime): A naive or timezone-aware datetime.
+
+    Returns: datetime: The same instant without timezone information.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def get_calendar_events_for_user(user_id, start=None, end=None):
+    """
+    Retrieve the events a user holds tickets for, optionally limited to a date window.
+
+    Ticket and event columns are fetched together with a single joined, column-projected query.
+    An event is inside the window if it ends at or after `start` and begins before `end`.
+
+    Parameters: user_id (int): The ID of the attendee whose calendar should be fetched.
+    start (datetime): Optional inclusive lower bound of the window.
+    end (datetime): Optional exclusive upper bound of the window.
+
+    Returns: list: A list of dictionaries with ticket and event fields, ordered by event start date.
+    """
+    try:
+        query = (
+            db.session.query(
+                Ticket.id.label("ticket_id"),
+                Ticket.status.label("ticket_status"),
+                Event.id.label("event_id"),
+                Event.title,
+                Event.start_date,
+                Event.end_date,
+                Event.location
+            )
+            .join(Event, Ticket.event_id == Event.id)
+            .filter(Ticket.attendee_id == user_id)
+        )
+        if start is not None:
+            query = query.filter(func.coalesce(Event.end_date, Event.start_date) >= _to_naive_utc(start))
+        if end is not None:
+            query = query.filter(Event.start_date < _to_naive_utc(end))
+
+        return [
+            {
+                "ticket_id": row.ticket_id,
+                "ticket_status": row.ticket_status,
+                "event_id": row.event_id,
+                "title": row.title,
+                "start_date": iso_datetime(row.start_date),
+                "end_date": iso_datetime(row.end_date),
+                "location": row.location
+            }
+            for row in query.order_by(Event.start_date, Ticket.id)
+        ]
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch calendar events for user {user_id}: {e}")
+
 def get_ticket_by_id(ticket_id):
     """
     Retrieve a single ticket by its ID.
@@ -97,19 +195,422 @@ def get_tickets_by_event(event_id):
     except Exception as e:
         raise RuntimeError(f"Failed to fetch tickets for event {event_id}: {e}")
 
+def _participants_query(event_id, status=None):
+    """
+    Build the column-projected Ticket JOIN User query behind the participant list of an event.
+
+    Parameters: event_id (int): The ID of the event.
+    status (str): Optional ticket status to filter on.
+
+    Returns: Query: A query yielding (id, username, status) rows.
+    """
+    query = (
+        db.session.query(Ticket.id, User.username, Ticket.status)
+        .join(User, Ticket.attendee_id == User.id)
+        .filter(Ticket.event_id == event_id)
+    )
+    if status:
+        query = query.filter(Ticket.status == status)
+    return query
+
+def _participant(row):
+    """
+    Convert a participant row into its dictionary form.
+
+    Parameters: row (Row): An (id, username, status) row.
+
+    Returns: dict: The ticket ID, attendee username and ticket status.
+    """
+    return {"ticket_id": row.id, "username": row.username, "status": row.status}
+
+def get_event_participants(event_id, status=None):
+    """
+    Retrieve the participants of an event with a single joined query.
+
+    Only the columns needed for the participant list are selected, and rows are
+    streamed from the cursor in batches instead of being loaded as ORM objects.
+
+    Parameters: event_id (int): The ID of the event whose participants should be fetched.
+    status (str): Optional ticket status to filter on (e.g. "checked-in").
+
+    Returns: list: A list of dictionaries with ticket_id, username and status, ordered by ticket ID.
+    """
+    try:
+        rows = _participants_query(event_id, status).order_by(Ticket.id).yield_per(1000)
+        return [_participant(row) for row in rows]
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch participants for event {event_id}: {e}")
+
+def get_event_participants_page(event_id, limit, after=None, status=None):
+    """
+    Retrieve one page of an event's participants using a keyset cursor on the ticket ID.
+
+    Parameters: event_id (int): The ID of the event whose participants should be fetched.
+    limit (int): The maximum number of participants to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+    status (str): Optional ticket status to filter on.
+
+    Returns: dict: The page's participants under "items" and the cursor for the following page under "next_cursor".
+    """
+    try:
+        rows, next_cursor = paginate_keyset(_participants_query(event_id, status), [Ticket.id], limit, after)
+        return {"items": [_participant(row) for row in rows], "next_cursor": next_cursor}
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch participants for event {event_id}: {e}")
+
+def _manifest_version(event_id):
+    """
+    Return the current check-in manifest version of an event (0 before any change is logged).
+    """
+    return db.session.query(
+        func.coalesce(func.max(CheckinManifestChange.id), 0)
+    ).filter(CheckinManifestChange.event_id == event_id).scalar()
+
+def get_checkin_manifest(event_id):
+    """
+    Build a snapshot of the tickets that can be admitted to an event.
+
+    The version is read before the tickets, so applying the changes made after it
+    (see get_checkin_manifest_changes) always brings a snapshot up to date, even
+    if tickets changed while it was being built.
+
+    Parameters: event_id (int): The ID of the event.
+
+    Returns: dict: The manifest "version" and the admissible "tickets" as
+    (ticket_id, username) pairs sorted by ticket ID.
+    """
+    try:
+        version = _manifest_version(event_id)
+        rows = (
+            db.session.query(Ticket.id, User.username)
+            .outerjoin(User, Ticket.attendee_id == User.id)
+            .filter(Ticket.event_id == event_id, Ticket.status == "valid")
+            .order_by(Ticket.id)
+            .all()
+        )
+        return {"version": version, "tickets": [(row.id, row.username) for row in rows]}
+    except Exception as e:
+        raise RuntimeError(f"Failed to build check-in manifest for event {event_id}: {e}")
+
+def get_checkin_manifest_changes(event_id, since):
+    """
+    Retrieve the changes to an event's check-in manifest after a given version.
+
+    Several changes to the same ticket collapse into its latest one, so a ticket is
+    reported at most once, either as added or as removed.
+
+    Parameters: event_id (int): The ID of the event.
+    since (int): The manifest version the caller already has.
+
+    Returns: dict: The current "version", the "added" tickets as (ticket_id, username)
+    pairs and the sorted "removed" ticket IDs.
+    """
+    try:
+        version = _manifest_version(event_id)
+        if since > version:
+            raise ValueError(f"Unknown manifest version {since}")
+
+        changes = (
+            db.session.query(CheckinManifestChange.ticket_id, CheckinManifestChange.admitted)
+            .filter(
+                CheckinManifestChange.event_id == event_id,
+                CheckinManifestChange.id > since,
+                CheckinManifestChange.id <= version
+            )
+            .order_by(CheckinManifestChange.id)
+            .all()
+        )
+        latest = dict(changes)
+        added_ids = sorted(ticket_id for ticket_id, admitted in latest.items() if admitted)
+        removed = sorted(ticket_id for ticket_id, admitted in latest.items() if not admitted)
+
+        names = {}
+        if added_ids:
+            names = dict(
+                db.session.query(Ticket.id, User.username)
+                .outerjoin(User, Ticket.attendee_id == User.id)
+                .filter(Ticket.id.in_(added_ids))
+                .all()
+            )
+        return {
+            "version": version,
+            "added": [(ticket_id, names.get(ticket_id)) for ticket_id in added_ids],
+            "removed": removed
+        }
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch check-in manifest changes for event {event_id}: {e}")
+
+def _attendance_counters_enabled():
+    """
+    Check whether cached per-event attendance counters are switched on for the current app.
+
+    Returns: bool: True if ATTENDANCE_COUNTERS is enabled in the app config.
+    """
+    return has_app_context() and current_app.config.get("ATTENDANCE_COUNTERS", False)
+
+def _count_attendance(event_id):
+    """
+    Count an event's registered and checked-in tickets with one GROUP BY status query.
+
+    Parameters: event_id (int): The ID of the event.
+
+    Returns: dict: The registered and checked_in ticket counts.
+    """
+    rows = (
+        db.session.query(Ticket.status, func.count())
+        .filter(Ticket.event_id == event_id)
+        .group_by(Ticket.status)
+        .all()
+    )
+    counts = dict(rows)
+    return {
+        "registered": sum(counts.values()),
+        "checked_in": counts.get("checked-in", 0)
+    }
+
+def get_event_attendance(event_id):
+    """
+    Retrieve the attendance counts of an event.
+
+    When ATTENDANCE_COUNTERS is enabled the counts are read from the event_attendance
+    table, which is seeded from a GROUP BY query the first time an event is requested
+    and then kept up to date as tickets are created, checked in and deleted.
+
+    Parameters: event_id (int): The ID of the event whose attendance is requested.
+
+    Returns: dict: The registered and checked_in ticket counts.
+    """
+    try:
+        if not _attendance_counters_enabled():
+            return _count_attendance(event_id)
+
+        def work():
+            cached = db.session.get(EventAttendance, event_id)
+            if cached:
+                return {"registered": cached.registered, "checked_in": cached.checked_in}
+
+            counts = _count_attendance(event_id)
+            db.session.add(EventAttendance(event_id=event_id, **counts))
+            return counts
+
+        return crud_transactions.run_in_transaction("get_event_attendance", work)
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Failed to fetch attendance for event {event_id}: {e}")
+
+def _bump_attendance(connection, event_id, registered, checked_in):
+    """
+    Adjust the cached attendance row of an event inside the flush that changed its tickets.
+
+    Events without a cached row are left alone; their row is seeded on the next read.
+
+    Parameters: connection (Connection): The connection of the ongoing flush.
+    event_id (int): The ID of the event.
+    registered (int): The change in registered tickets.
+    checked_in (int): The change in checked-in tickets.
+    """
+    table = EventAttendance.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.event_id == event_id)
+        .values(
+            registered=table.c.registered + registered,
+            checked_in=table.c.checked_in + checked_in
+        )
+    )
+
+@sa_event.listens_for(Ticket, "after_insert")
+def _ticket_inserted(mapper, connection, target):
+    if _attendance_counters_enabled():
+        _bump_attendance(connection, target.event_id, 1, int(target.status == "checked-in"))
+
+@sa_event.listens_for(Ticket, "after_delete")
+def _ticket_deleted(mapper, connection, target):
+    if _attendance_counters_enabled():
+        _bump_attendance(connection, target.event_id, -1, -int(target.status == "checked-in"))
+
+@sa_event.listens_for(Ticket, "after_update")
+def _ticket_updated(mapper, connection, target):
+    if not _attendance_counters_enabled():
+        return
+    state = inspect(target)
+    status, event_id = state.attrs.status.history, state.attrs.event_id.history
+    if not status.has_changes() and not event_id.has_changes():
+        return
+    old_status = status.deleted[0] if status.deleted else target.status
+    old_event_id = event_id.deleted[0] if event_id.deleted else target.event_id
+    _bump_attendance(connection, old_event_id, -1, -int(old_status == "checked-in"))
+    _bump_attendance(connection, target.event_id, 1, int(target.status == "checked-in"))
+
+@sa_event.listens_for(Ticket, "after_delete")
+def _ticket_seat_released(mapper, connection, target):
+    table = EventInventory.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.event_id == target.event_id)
+        .values(sold=table.c.sold - 1)
+    )
+
+@sa_event.listens_for(Ticket, "after_update")
+def _ticket_seat_moved(mapper, connection, target):
+    # Only the old event's seat is released here; update_ticket reserves the seat on
+    # the new event against its capacity before the ticket is moved.
+    history = inspect(target).attrs.event_id.history
+    if not history.deleted:
+        return
+    table = EventInventory.__table__
+    for old_event_id in history.deleted:
+        connection.execute(
+            table.update()
+            .where(table.c.event_id == old_event_id)
+            .values(sold=table.c.sold - 1)
+        )
+
+def _log_manifest_changes(connection, event_id, ticket_ids, admitted):
+    """
+    Record tickets entering or leaving an event's check-in manifest.
+
+    Parameters: connection (Connection): The connection of the ongoing flush or statement.
+    event_id (int or None): The event whose manifest changed.
+    ticket_ids (list): The IDs of the tickets that changed.
+    admitted (bool): True if the tickets can now be admitted, False if they no longer can.
+    """
+    if event_id is None or not ticket_ids:
+        return
+    connection.execute(
+        CheckinManifestChange.__table__.insert(),
+        [{"event_id": event_id, "ticket_id": ticket_id, "admitted": admitted} for ticket_id in ticket_ids]
+    )
+
+@sa_event.listens_for(Ticket, "after_insert")
+def _ticket_admitted(mapper, connection, target):
+    if target.status == "valid":
+        _log_manifest_changes(connection, target.event_id, [target.id], True)
+
+@sa_event.listens_for(Ticket, "after_delete")
+def _ticket_revoked(mapper, connection, target):
+    if target.status == "valid":
+        _log_manifest_changes(connection, target.event_id, [target.id], False)
+
+@sa_event.listens_for(Ticket, "after_update")
+def _ticket_admission_changed(mapper, connection, target):
+    state = inspect(target)
+    status, event_id = state.attrs.status.history, state.attrs.event_id.history
+    if not status.has_changes() and not event_id.has_changes():
+        return
+    old_status = status.deleted[0] if status.deleted else target.status
+    old_event_id = event_id.deleted[0] if event_id.deleted else target.event_id
+    was_admitted = (old_event_id, old_status == "valid")
+    is_admitted = (target.event_id, target.status == "valid")
+    if was_admitted == is_admitted:
+        return
+    if was_admitted[1]:
+        _log_manifest_changes(connection, old_event_id, [target.id], False)
+    if is_admitted[1]:
+        _log_manifest_changes(connection, target.event_id, [target.id], True)
+
+@sa_event.listens_for(Event, "after_delete")
+def _event_deleted(mapper, connection, target):
+    for table in (EventAttendance.__table__, EventInventory.__table__, CheckinManifestChange.__table__):
+        connection.execute(table.delete().where(table.c.event_id == target.id))
+
+class SoldOutError(Exception):
+    """Raised when a ticket is requested for an event that has no seats left."""
+
+def _try_reserve_seat(event_id):
+    """
+    Take one seat from an event's inventory row if the event is below capacity.
+
+    Returns: bool: True if a seat was taken; False if the event is full or has no inventory row yet.
+    """
+    capacity = select(Event.capacity).where(Event.id == event_id).scalar_subquery()
+    result = db.session.execute(
+        update(EventInventory)
+        .where(
+            EventInventory.event_id == event_id,
+            or_(capacity.is_(None), EventInventory.sold < capacity)
+        )
+        .values(sold=EventInventory.sold + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def _reserve_seat(event_id):
+    """
+    Atomically reserve a seat for a new ticket in the current transaction.
+
+    The seat is taken with a conditional UPDATE on the event's inventory row, so the
+    capacity check and the decrement cannot interleave with another buyer's. The row is
+    seeded from the number of existing tickets the first time an event sells a ticket.
+    Events without a capacity are unlimited but are still counted.
+
+    Parameters: event_id (int): The ID of the event to reserve a seat for.
+
+    Raises: SoldOutError: If the event has reached its capacity.
+    """
+    if _try_reserve_seat(event_id):
+        return
+
+    exists = db.session.execute(
+        select(EventInventory.event_id).where(EventInventory.event_id == event_id)
+    ).first()
+    if not exists:
+        try:
+            with db.session.begin_nested():
+                sold = select(event_id, func.count()).where(Ticket.event_id == event_id)
+                db.session.execute(
+                    insert(EventInventory).from_select(["event_id", "sold"], sold)
+                )
+        except IntegrityError:
+            pass  # Another buyer seeded the row first.
+        if _try_reserve_seat(event_id):
+            return
+
+    raise SoldOutError(f"Event {event_id} is sold out")
+
+def _add_ticket(data):
+    """
+    Reserve a seat and add a new ticket to the session, without committing.
+
+    Returns: Ticket: The pending ticket.
+    """
+    new_ticket = Ticket(**data)
+    if new_ticket.event_id is not None:
+        _reserve_seat(new_ticket.event_id)
+    db.session.add(new_ticket)
+    return new_ticket
+
 def create_ticket(data):
     """
     Create a new ticket using the provided field data.
 
+    A seat is reserved against the event's capacity in the same transaction as the
+    insert, so concurrent buyers can never oversell an event. When WRITE_QUEUE is
+    enabled the insert is handed to the write queue and committed together with the
+    other tickets queued at the same time.
+
     Parameters: data (dict): A dictionary containing the fields required to create a Ticket.
 
     Returns: int: The ID of the newly created ticket.
+
+    Raises: SoldOutError: If the event has no seats left.
     """
-    try:
-        new_ticket = Ticket(**data)
-        db.session.add(new_ticket)
-        db.session.commit()
+    def queued():
+        new_ticket = _add_ticket(data)
+        db.session.flush()
         return new_ticket.id
+
+    try:
+        if crud_write_queue.get_queue() is not None:
+            return crud_write_queue.run(queued)
+        return crud_transactions.run_in_transaction("create_ticket", lambda: _add_ticket(data)).id
+    except SoldOutError:
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to create ticket: {e}")
@@ -118,26 +619,237 @@ def update_ticket(ticket_id, data):
     """
     Update an existing ticket with new values.
 
+    Goes through the write queue when WRITE_QUEUE is enabled, like create_ticket.
+    Moving a ticket to another event reserves a seat on that event in the same
+    transaction, so it cannot oversell the event either.
+
     Parameters: ticket_id (int): The ID of the ticket to update.
     data (dict): A dictionary of fields to update on the ticket.
 
     Returns: dict or None: The updated serialized ticket data if the ticket exists; otherwise None.
+
+    Raises: SoldOutError: If the ticket is moved to an event that has no seats left.
     """
-    try:
+    def work():
         ticket = db.session.get(Ticket, ticket_id)
         if not ticket:
             return None
+        new_event_id = data.get("event_id", ticket.event_id)
+        if new_event_id is not None and new_event_id != ticket.event_id:
+            _reserve_seat(new_event_id)
         for key, value in data.items():
             if hasattr(ticket, key):
                 setattr(ticket, key, value)
-        db.session.commit()
+        db.session.flush()
         return ticket.data
+
+    try:
+        if crud_write_queue.get_queue() is not None:
+            return crud_write_queue.run(work)
+        return crud_transactions.run_in_transaction("update_ticket", work)
+    except SoldOutError:
+        db.session.rollback()
+        raise
     except ValueError:
         raise
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to update ticket {ticket_id}: {e}")
 
+def _scan_mismatch(ticket, event_id, attendee_id):
+    """
+    Tell why a ticket does not match the event and attendee a scanned code expects.
+
+    Parameters: ticket: A row or ticket with event_id and attendee_id.
+    event_id (int or None): The expected event, if any.
+    attendee_id (int or None): The expected attendee, if any.
+
+    Returns: str or None: The reason, or None when the ticket matches.
+    """
+    if event_id is not None and ticket.event_id != event_id:
+        return "Ticket is for a different event"
+    if attendee_id is not None and ticket.attendee_id != attendee_id:
+        return "Ticket code was issued to another attendee"
+    return None
+
+def check_in_ticket(ticket_id, event_id=None, attendee_id=None):
+    """
+    Check a ticket in with a single conditional UPDATE.
+
+    The status only changes if the ticket is still 'valid', so two scanners validating
+    the same ticket at the same time cannot both succeed. When the scanned code names
+    an event or an attendee, the ticket must still match them in the same UPDATE, so
+    a code for another event, or one issued before the ticket was transferred, is
+    refused. The updated ticket and the attendee's username are returned by the same
+    statement. Only when no row was updated is the ticket read again to report why.
+
+    Parameters: ticket_id (int): The ID of the ticket to check in.
+    event_id (int or None): The event the ticket must be for, if known.
+    attendee_id (int or None): The attendee the ticket must belong to, from a signed code.
+
+    Returns: dict: A "result" of "checked-in", "duplicate", "invalid" or "not-found".
+    On success it also holds the updated "ticket" data and the "attendee_name";
+    for "duplicate" and "invalid" it holds the ticket's current "status", and invalid
+    tickets that do not match the code also hold an "error".
+    """
+    def work():
+        attendee_name = (
+            select(User.username)
+            .where(User.id == Ticket.attendee_id)
+            .scalar_subquery()
+        )
+        conditions = [Ticket.id == ticket_id, Ticket.status == "valid"]
+        if event_id is not None:
+            conditions.append(Ticket.event_id == event_id)
+        if attendee_id is not None:
+            conditions.append(Ticket.attendee_id == attendee_id)
+        row = db.session.execute(
+            update(Ticket)
+            .where(*conditions)
+            .values(status="checked-in")
+            .returning(
+                Ticket.id, Ticket.attendee_id, Ticket.event_id, Ticket.qr_code,
+                Ticket.status, attendee_name.label("attendee_name")
+            )
+        ).first()
+
+        if row is None:
+            current = db.session.execute(
+                select(Ticket.status, Ticket.event_id, Ticket.attendee_id).where(Ticket.id == ticket_id)
+            ).first()
+            if current is None:
+                return {"result": "not-found"}
+            mismatch = _scan_mismatch(current, event_id, attendee_id)
+            if mismatch:
+                return {"result": "invalid", "status": current.status, "error": mismatch}
+            if current.status == "checked-in":
+                return {"result": "duplicate", "status": current.status}
+            return {"result": "invalid", "status": current.status}
+
+        connection = db.session.connection()
+        crud_analytics.record_status_change(connection, "tickets", "valid", "checked-in")
+        _log_manifest_changes(connection, row.event_id, [row.id], False)
+        if _attendance_counters_enabled():
+            _bump_attendance(connection, row.event_id, 0, 1)
+
+        return {
+            "result": "checked-in",
+            "ticket": {
+                "id": row.id,
+                "attendee_id": row.attendee_id,
+                "event_id": row.event_id,
+                "qr_code": row.qr_code,
+                "status": row.status
+            },
+            "attendee_name": row.attendee_name
+        }
+
+    try:
+        return crud_transactions.run_in_transaction("check_in_ticket", work)
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Failed to check in ticket {ticket_id}: {e}")
+
+CHECK_IN_CHUNK_SIZE = 500
+
+def check_in_tickets(ticket_ids, expected=None):
+    """
+    Check a batch of tickets in within one transaction using set-based statements.
+
+    Ticket IDs are processed in the order given: the first occurrence of an ID is
+    checked in and any later occurrence in the same batch is reported as a duplicate.
+    A scan whose ticket is for another event than its code expects, or no longer
+    belongs to the attendee its signed code was issued to, is reported as invalid and
+    does not check the ticket in. Tickets are read with one SELECT and updated with one
+    conditional UPDATE per chunk of CHECK_IN_CHUNK_SIZE IDs, so the cost does not grow
+    with one round trip per ticket; the UPDATE only matches tickets whose event and
+    attendee are still the ones that were checked.
+
+    Parameters: ticket_ids (list): Ticket IDs (int) in scan order.
+    expected (list or None): For each scan, a tuple of the event ID and attendee ID
+    its code expects; either may be None when the code does not say.
+
+    Returns: list: One dictionary per input ID, in input order, with the "ticket_id" and a
+    "result" of "checked-in", "duplicate", "invalid" or "not-found". Checked-in entries
+    also hold the "attendee_name"; duplicate and invalid entries hold the current "status",
+    and invalid scans that do not match their ticket also hold an "error".
+    """
+    if expected is None:
+        expected = [(None, None)] * len(ticket_ids)
+
+    def work():
+        unique_ids = list(dict.fromkeys(ticket_ids))
+        found = {}
+        for start in range(0, len(unique_ids), CHECK_IN_CHUNK_SIZE):
+            chunk = unique_ids[start:start + CHECK_IN_CHUNK_SIZE]
+            rows = (
+                db.session.query(Ticket.id, Ticket.event_id, Ticket.attendee_id, Ticket.status, User.username)
+                .outerjoin(User, Ticket.attendee_id == User.id)
+                .filter(Ticket.id.in_(chunk))
+                .all()
+            )
+            found.update({row.id: row for row in rows})
+
+        mismatches = []
+        for ticket_id, (event_id, attendee_id) in zip(ticket_ids, expected):
+            row = found.get(ticket_id)
+            mismatches.append(_scan_mismatch(row, event_id, attendee_id) if row is not None else None)
+        eligible = list(dict.fromkeys(
+            ticket_id for ticket_id, mismatch in zip(ticket_ids, mismatches)
+            if ticket_id in found and mismatch is None
+        ))
+
+        checked_in = set()
+        for start in range(0, len(eligible), CHECK_IN_CHUNK_SIZE):
+            chunk = [found[ticket_id] for ticket_id in eligible[start:start + CHECK_IN_CHUNK_SIZE]]
+            updated = db.session.execute(
+                update(Ticket)
+                .where(
+                    tuple_(Ticket.id, Ticket.event_id, Ticket.attendee_id).in_(
+                        [(row.id, row.event_id, row.attendee_id) for row in chunk]
+                    ),
+                    Ticket.status == "valid"
+                )
+                .values(status="checked-in")
+                .returning(Ticket.id)
+            ).scalars().all()
+            checked_in.update(updated)
+
+        connection = db.session.connection()
+        crud_analytics.record_status_change(connection, "tickets", "valid", "checked-in", len(checked_in))
+        per_event = {}
+        for ticket_id in sorted(checked_in):
+            per_event.setdefault(found[ticket_id].event_id, []).append(ticket_id)
+        for event_id, event_ticket_ids in per_event.items():
+            _log_manifest_changes(connection, event_id, event_ticket_ids, False)
+            if _attendance_counters_enabled():
+                _bump_attendance(connection, event_id, 0, len(event_ticket_ids))
+
+        results = []
+        reported = set()
+        for ticket_id, mismatch in zip(ticket_ids, mismatches):
+            row = found.get(ticket_id)
+            if row is None:
+                results.append({"ticket_id": ticket_id, "result": "not-found"})
+            elif mismatch:
+                results.append({"ticket_id": ticket_id, "result": "invalid", "status": row.status, "error": mismatch})
+            elif ticket_id in checked_in and ticket_id not in reported:
+                results.append({"ticket_id": ticket_id, "result": "checked-in", "attendee_name": row.username})
+                reported.add(ticket_id)
+            elif ticket_id in checked_in or row.status in ("valid", "checked-in"):
+                # Scanned earlier in this batch, checked in before the upload, or
+                # checked in by another scanner between the SELECT and the UPDATE.
+                results.append({"ticket_id": ticket_id, "result": "duplicate", "status": "checked-in"})
+            else:
+                results.append({"ticket_id": ticket_id, "result": "invalid", "status": row.status})
+        return results
+
+    try:
+        return crud_transactions.run_in_transaction("check_in_tickets", work)
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Failed to check in tickets: {e}")
+
 def delete_ticket(ticket_id):
     """
     Delete a ticket from the database.
@@ -146,13 +858,15 @@ def delete_ticket(ticket_id):
 
     Returns: bool: True if deletion was successful; False if the ticket does not exist.
     """
-    try:
+    def work():
         ticket = db.session.get(Ticket, ticket_id)
         if not ticket:
             return False
         db.session.delete(ticket)
-        db.session.commit()
         return True
+
+    try:
+        return crud_transactions.run_in_transaction("delete_ticket", work)
     except ValueError:
         raise
     except Exception as e:
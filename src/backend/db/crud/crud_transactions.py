@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy.exc import DBAPIError
+from db import db
+
+# Fragments of SQLite error messages meaning another connection holds the lock. In WAL
+# mode a transaction that read before writing fails with "database is locked" straight
+# away when another writer committed first, without waiting for busy_timeout.
+SQLITE_BUSY_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+# SQLSTATEs of PostgreSQL serialization failures and deadlocks, which are safe to retry.
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+class RetryStats:
+    """Counters of the write transactions of one app and the retries they needed."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.retried = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.by_operation = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, retries, exhausted=False):
+        with self._lock:
+            self.transactions += 1
+            if retries:
+                self.retried += 1
+                self.retries += retries
+                self.by_operation[operation] = self.by_operation.get(operation, 0) + retries
+            if exhausted:
+                self.exhausted += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "transactions": self.transactions,
+                "retried": self.retried,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "by_operation": dict(self.by_operation)
+            }
+
+def is_retryable(error):
+    """
+    Tell whether a database error is a lock or serialization failure worth retrying.
+
+    Parameters: error (Exception): The exception raised by a statement or commit.
+
+    Returns: bool: True for SQLITE_BUSY/locked errors and PostgreSQL serialization failures or deadlocks.
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    original = error.orig
+    sqlstate = getattr(original, "sqlstate", None) or getattr(original, "pgcode", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    message = str(original).lower()
+    return any(fragment in message for fragment in SQLITE_BUSY_MESSAGES)
+
+def _settings():
+    config = current_app.config if has_app_context() else {}
+    return (
+        config.get("DB_WRITE_RETRIES", 5),
+        config.get("DB_RETRY_BASE_DELAY", 0.01),
+        config.get("DB_RETRY_MAX_DELAY", 0.5)
+    )
+
+def _stats():
+    if not has_app_context():
+        return None
+    return current_app.extensions.setdefault("write_retries", RetryStats())
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """
+    Return how long to sleep before a retry, using exponential backoff with full jitter.
+
+    Parameters: attempt (int): The number of the retry about to be made, starting at 1.
+    base_delay (float): The upper bound in seconds of the first delay.
+    max_delay (float): The cap in seconds of the upper bound.
+
+    Returns: float: A random delay between 0 and min(max_delay, base_delay * 2 ** (attempt - 1)).
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+def begin_outer_transaction():
+    """
+    Start the session's database transaction now, so that savepoints nest inside it.
+
+    pysqlite only sends BEGIN before an INSERT, UPDATE or DELETE. A SAVEPOINT issued
+    before any of them opens a transaction of its own, which its RELEASE commits, so
+    each outermost begin_nested() would be committed separately.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+
+def run_in_transaction(operation, work, sleep=time.sleep):
+    """
+    Run work() in a transaction and commit it, retrying the whole transaction while the database is busy.
+
+    On a lock or serialization failure (see is_retryable) the session is rolled back and
+    work() is called again after a jittered backoff, at most DB_WRITE_RETRIES times. Any
+    other exception rolls back and is raised at once. work() must therefore build its
+    changes from scratch on each call and only have effects outside the database after
+    this function returns.
+
+    Parameters: operation (str): The name the retries are counted under, e.g. "create_ticket".
+    work (callable): Makes the changes in db.session; it must not commit.
+    sleep (callable): Waits between attempts; replaced in tests.
+
+    Returns: The value returned by work().
+
+    Raises: The last exception once the retries are exhausted, or the first non-retryable one.
+    """
+    max_retries, base_delay, max_delay = _settings()
+    stats = _stats()
+    attempt = 0
+    while True:
+        try:
+            result = work()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if not is_retryable(e) or attempt >= max_retries:
+                if stats is not None:
+                    stats.record(operation, attempt, exhausted=is_retryable(e))
+                raise
+            attempt += 1
+            sleep(backoff_delay(attempt, base_delay, max_delay))
+            continue
+        if stats is not None:
+            stats.record(operation, attempt)
+        return result
+
+def get_stats():
+    """
+    Report the write transaction counters of the current app.
+
+    Returns: dict: The number of transactions, of those that were retried, of retries in
+    total and of transactions that gave up, with the retries per operation.
+    """
+    stats = _stats()
+    return stats.stats() if stats is not None else {}
@@ -1,5 +1,8 @@
 from db.models import User
 from db import db
+from db.crud import crud_cache, crud_transactions
+from db.serialization import USER
+from db.utils import paginate_keyset
 
 def get_all_users():
     """
@@ -10,8 +13,40 @@ def get_all_users():
     Returns: list: A list of dictionaries, each representing a user.
     """
     try:
-        users = db.session.query(User).all()
-        return [user.data for user in users]
+        rows = db.session.query(*USER.columns).all()
+        return USER.encode_all(rows)
+    except Exception as e:
+        raise RuntimeError(f"Failed to retrieve users: {e}")
+
+def get_users_page(limit, after=None):
+    """
+    Retrieve one page of users ordered by id using a keyset cursor.
+
+    Parameters: limit (int): The maximum number of users to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: dict: The page's users under "items" and the cursor for the following page under "next_cursor" (None on the last page).
+    """
+    try:
+        rows, next_cursor = paginate_keyset(db.session.query(*USER.columns), [User.id], limit, after)
+        return {"items": USER.encode_all(rows), "next_cursor": next_cursor}
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to retrieve users: {e}")
+
+def iter_users(batch_size=1000):
+    """
+    Yield every user ordered by id, reading rows from the database in batches.
+
+    Parameters: batch_size (int): The number of rows fetched from the cursor at a time.
+
+    Returns: generator: User dictionaries, as returned by get_all_users.
+    """
+    try:
+        rows = db.session.query(*USER.columns).order_by(User.id).yield_per(batch_size)
+        for row in rows:
+            yield USER(row)
     except Exception as e:
         raise RuntimeError(f"Failed to retrieve users: {e}")
 
@@ -19,13 +54,19 @@ def get_user_by_id(user_id):
     """
     Retrieve a single user by their unique ID.
 
+    Lookups are served from the entity cache when ENTITY_CACHE_SIZE is set; update_user
+    and delete_user invalidate the cached entry.
+
     Parameters: user_id (int): The ID of the user to retrieve.
 
     Returns: dict or None: Serialized user data if the user exists; otherwise None.
     """
-    try:
+    def load():
         user = db.session.get(User, user_id)
         return user.data if user else None
+
+    try:
+        return crud_cache.read_through("users", user_id, load)
     except Exception as e:
         raise RuntimeError(f"Failed to retrieve user {user_id}: {e}")
 
@@ -61,11 +102,13 @@ def create_user(data):
 
     Returns: int: The ID of the newly created user.
     """
-    try:
+    def work():
         new_user = User(**data)
         db.session.add(new_user)
-        db.session.commit()
-        return new_user.id
+        return new_user
+
+    try:
+        return crud_transactions.run_in_transaction("create_user", work).id
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to create user: {e}")
@@ -79,7 +122,7 @@ def update_user(user_id, data):
 
     Returns: dict or None: The updated serialized user data if the user exists; otherwise None.
     """
-    try:
+    def work():
         user = db.session.get(User, user_id)
         if not user:
             return None
@@ -87,8 +130,13 @@ def update_user(user_id, data):
         for key, value in data.items():
             if hasattr(user, key):
                 setattr(user, key, value)
+        return user
 
-        db.session.commit()
+    try:
+        user = crud_transactions.run_in_transaction("update_user", work)
+        if not user:
+            return None
+        crud_cache.invalidate("users", user_id)
         return user.data
     except Exception as e:
         db.session.rollback()
@@ -102,14 +150,19 @@ def delete_user(user_id):
 
     Returns: bool: True if deletion succeeds; False if the user does not exist.
     """
-    try:
+    def work():
         user = db.session.get(User, user_id)
         if not user:
             return False
 
         db.session.delete(user)
-        db.session.commit()
         return True
+
+    try:
+        deleted = crud_transactions.run_in_transaction("delete_user", work)
+        if deleted:
+            crud_cache.invalidate("users", user_id)
+        return deleted
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Failed to delete user {user_id}: {e}")
@@ -0,0 +1,186 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from flask import current_app, has_app_context
+from db import db
+from db.crud import crud_transactions
+
+class WriteQueue:
+    """
+    A single writer thread that applies queued write operations in grouped transactions.
+
+    Callers submit an operation and wait on the returned future. The writer takes up to
+    max_batch operations, waiting at most max_wait seconds after the first one for more
+    to arrive, runs each in its own SAVEPOINT and commits them all at once. A failing
+    operation only rolls back its savepoint and fails its own future; the others still
+    commit. Futures are resolved only after the commit, so a caller never sees an ID
+    that could still be rolled back.
+    """
+
+    def __init__(self, app, max_batch=64, max_wait=0.005):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.operations = 0
+        self.failed = 0
+        self.largest_batch = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation):
+        """
+        Queue a write operation for the writer thread.
+
+        Parameters: operation (callable): Makes its changes in db.session and returns the
+        caller's result. It runs in the writer's app context and must not commit; its
+        result should be computed before the commit (flush to obtain new IDs).
+
+        Returns: Future: Resolved with the operation's result once its group has committed,
+        or with the exception it (or the commit) raised.
+        """
+        future = Future()
+        self._queue.put((future, operation))
+        return future
+
+    def close(self, timeout=None):
+        """Stop the writer thread once the operations already queued have been applied."""
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [(future, operation) for future, operation in batch if future.set_running_or_notify_cancel()]
+            if batch:
+                with self.app.app_context():
+                    try:
+                        self._apply(batch)
+                    finally:
+                        db.session.remove()
+
+    def _apply(self, batch):
+        def work():
+            crud_transactions.begin_outer_transaction()
+            outcomes = []
+            for future, operation in batch:
+                try:
+                    with db.session.begin_nested():
+                        outcomes.append((future, operation(), None))
+                except Exception as e:
+                    if crud_transactions.is_retryable(e):
+                        raise
+                    outcomes.append((future, None, e))
+            return outcomes
+
+        try:
+            outcomes = crud_transactions.run_in_transaction("write_queue_batch", work)
+        except Exception as e:
+            outcomes = [(future, None, e) for future, _ in batch]
+
+        failed = 0
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                failed += 1
+                future.set_exception(error)
+
+        with self._lock:
+            self.batches += 1
+            self.operations += len(batch)
+            self.failed += failed
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        """Return the number of batches and operations applied, failed operations, the largest batch and the queue length."""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "operations": self.operations,
+                "failed": self.failed,
+                "largest_batch": self.largest_batch,
+                "queued": self._queue.qsize()
+            }
+
+_create_lock = threading.Lock()
+
+def get_queue():
+    """
+    Return the current app's write queue, starting its writer thread on first use.
+
+    The queue is closed, after applying the operations still queued, when the
+    interpreter exits.
+
+    Returns: WriteQueue or None: None outside an app context or when WRITE_QUEUE is disabled.
+    """
+    if not has_app_context() or not current_app.config.get("WRITE_QUEUE", False):
+        return None
+    extensions = current_app.extensions
+    with _create_lock:
+        if "write_queue" not in extensions:
+            config = current_app.config
+            write_queue = WriteQueue(
+                current_app._get_current_object(),
+                config.get("WRITE_QUEUE_BATCH_SIZE", 64),
+                config.get("WRITE_QUEUE_MAX_WAIT_MS", 5) / 1000
+            )
+            # The writer is a daemon thread; drain the queue at exit instead of dropping its writes.
+            atexit.register(write_queue.close)
+            extensions["write_queue"] = write_queue
+    return extensions["write_queue"]
+
+def run(operation):
+    """
+    Run a write operation through the write queue and wait for its group to commit.
+
+    Parameters: operation (callable): See WriteQueue.submit.
+
+    Returns: The operation's result.
+
+    Raises: The exception raised by the operation or its group's commit, or TimeoutError
+    after WRITE_QUEUE_TIMEOUT seconds. A timed out operation is cancelled if the writer
+    has not started it yet; otherwise it may still be committed.
+    """
+    future = get_queue().submit(operation)
+    try:
+        return future.result(timeout=current_app.config.get("WRITE_QUEUE_TIMEOUT", 30))
+    except TimeoutError:
+        future.cancel()
+        raise
+
+def get_stats():
+    """
+    Report the counters of the current app's write queue.
+
+    Returns: dict: The queue statistics, or an empty dict when the queue is not in use.
+    """
+    if not has_app_context():
+        return {}
+    write_queue = current_app.extensions.get("write_queue")
+    return write_queue.stats() if write_queue is not None else {}
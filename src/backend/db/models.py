@@ -31,15 +31,15 @@ class Event(db.Model):
     title = db.Column(db.Text, nullable=False)
     description = db.Column(db.Text)
     location = db.Column(db.Text)
-    start_date = db.Column(db.DateTime)
+    start_date = db.Column(db.DateTime, index=True)
     end_date = db.Column(db.DateTime)
     category = db.Column(db.Text)
     capacity = db.Column(db.Integer)
     price = db.Column(db.Float)
     link = db.Column(db.Text)
-    organizer_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    organizer_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
     seating = db.Column(db.Text)
-    status = db.Column(db.Text)
+    status = db.Column(db.Text, index=True)
     rating = db.Column(db.Float)
 
     @property
@@ -67,7 +67,14 @@ class Ticket(db.Model):
     attendee_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
     qr_code = db.Column(db.Text)
-    status = db.Column(db.String(20), default='valid')
+    status = db.Column(db.String(20), default='valid', index=True)
+
+    # The composites also cover lookups on their leading column alone
+    # (filter_by(event_id=...) and filter_by(attendee_id=...)).
+    __table_args__ = (
+        db.Index('ix_tickets_event_id_status', 'event_id', 'status'),
+        db.Index('ix_tickets_attendee_id_event_id', 'attendee_id', 'event_id'),
+    )
 
     @property
     def data(self):
@@ -98,11 +105,99 @@ class Organization(db.Model):
 class OrganizationMember(db.Model):
     __tablename__ = 'organization_members'
     organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, index=True)
 
     @property
     def data(self):
         return {
             "organization_id": self.organization_id,
             "user_id": self.user_id,
-        }
\ No newline at end of file
+        }
+
+class EventAttendance(db.Model):
+    __tablename__ = 'event_attendance'
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), primary_key=True)
+    registered = db.Column(db.Integer, nullable=False, default=0)
+    checked_in = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def data(self):
+        return {
+            "event_id": self.event_id,
+            "registered": self.registered,
+            "checked_in": self.checked_in
+        }
+
+class EventInventory(db.Model):
+    __tablename__ = 'event_inventory'
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), primary_key=True)
+    sold = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def data(self):
+        return {
+            "event_id": self.event_id,
+            "sold": self.sold
+        }
+
+class AnalyticsCounter(db.Model):
+    __tablename__ = 'analytics_counters'
+    metric = db.Column(db.String(40), primary_key=True)
+    key = db.Column(db.String(40), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def data(self):
+        return {
+            "metric": self.metric,
+            "key": self.key,
+            "count": self.count
+        }
+
+class CheckinManifestChange(db.Model):
+    __tablename__ = 'checkin_manifest_changes'
+    # The id doubles as the manifest version: an event's version is the id of its latest change.
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    ticket_id = db.Column(db.Integer, nullable=False)
+    admitted = db.Column(db.Boolean, nullable=False)
+
+    @property
+    def data(self):
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "ticket_id": self.ticket_id,
+            "admitted": self.admitted
+        }
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+    name = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+    @property
+    def data(self):
+        return {
+            "name": self.name,
+            "version": self.version,
+            "updated_at": self.updated_at
+        }
+
+class CacheInvalidation(db.Model):
+    __tablename__ = 'cache_invalidations'
+    # Change log read by the "changelog" entity cache backend; see db/crud/crud_cache.py.
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    key = db.Column(db.String(80), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    @property
+    def data(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "key": self.key,
+            "created_at": self.created_at
+        }
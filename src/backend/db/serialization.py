@@ -0,0 +1,63 @@
+from datetime import date, datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+from db.models import Event, Organization, Ticket, User
+
+def iso_datetime(value):
+    """Format a datetime as an ISO-8601 UTC timestamp.
+
+    Naive datetimes are taken to be in UTC, which is how event dates are stored.
+
+    Parameters: value (datetime or None): The datetime to format.
+
+    Returns: str or None: The timestamp with a trailing "Z" (e.g. "2025-10-10T18:00:00Z").
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() + "Z"
+
+class RowEncoder:
+    """Turns rows of a column-projected query into the dictionaries a model's .data returns.
+
+    Selecting `encoder.columns` instead of the model skips building ORM instances,
+    and each row is then mapped to its field names with a single dict(zip(...)).
+    """
+
+    def __init__(self, model, fields):
+        self.fields = tuple(fields)
+        self.columns = tuple(getattr(model, field) for field in self.fields)
+
+    def __call__(self, row):
+        return dict(zip(self.fields, row))
+
+    def encode_all(self, rows):
+        """Encode a list of result rows."""
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+USER = RowEncoder(User, [
+    "id", "username", "email", "role", "first_name", "last_name", "student_id", "program"
+])
+
+EVENT = RowEncoder(Event, [
+    "id", "title", "description", "location", "start_date", "end_date", "category",
+    "capacity", "price", "link", "organizer_id", "seating", "status", "rating"
+])
+
+TICKET = RowEncoder(Ticket, ["id", "attendee_id", "event_id", "qr_code", "status"])
+
+ORGANIZATION = RowEncoder(Organization, ["id", "title", "description", "status"])
+
+class JSONProvider(DefaultJSONProvider):
+    """The app's JSON provider: ISO-8601 UTC dates and no key sorting."""
+
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return iso_datetime(o)
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
@@ -1,4 +1,8 @@
+import base64
+import json
+import struct
 from datetime import datetime
+from sqlalchemy import and_, event, inspect, or_
 
 def parse_iso_datetime(value):
     """Converts a default JavaScript date time object to a Python readable format.
@@ -13,3 +17,133 @@ def parse_iso_datetime(value):
         return datetime.fromisoformat(value.replace('Z', '+00:00'))
     except (ValueError, TypeError):
         return None
+
+def encode_cursor(values):
+    """Encodes the key values of the last row on a page into an opaque cursor token.
+
+    Parameters: values (list): The ordered key column values of the last row returned.
+
+    Returns: str: A URL-safe token that can be passed back as the "after" parameter.
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token, size):
+    """Decodes a cursor token produced by encode_cursor.
+
+    Parameters: token (str): The cursor token sent by the client.
+    size (int): The number of key columns the cursor must contain.
+
+    Returns: list: The key column values encoded in the token.
+
+    Raises: ValueError: If the token is malformed or does not match the expected key size.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in values)):
+        raise ValueError("Invalid cursor")
+    return values
+
+def pack_ids(ids):
+    """Pack integer IDs into a base64 string of little-endian unsigned 32-bit integers.
+
+    Parameters: ids (list): The IDs to pack, in the order they should be read back.
+
+    Returns: str: The standard base64 encoding of the packed array.
+    """
+    return base64.b64encode(struct.pack(f"<{len(ids)}I", *ids)).decode()
+
+def unpack_ids(packed):
+    """Reverse pack_ids.
+
+    Parameters: packed (str): A string produced by pack_ids.
+
+    Returns: list: The unpacked IDs.
+    """
+    raw = base64.b64decode(packed)
+    return list(struct.unpack(f"<{len(raw) // 4}I", raw))
+
+def paginate_keyset(query, key_columns, limit, after=None):
+    """Fetches one page of a query ordered by its key columns, starting after a cursor.
+
+    The page is read with a range condition on the key columns instead of an OFFSET,
+    so every page costs a single index range scan regardless of how deep it is.
+
+    Parameters: query (Query): The base query to paginate.
+    key_columns (list): The unique, indexed columns that define the page order (e.g. the primary key).
+    limit (int): The maximum number of rows to return.
+    after (str): The cursor returned with the previous page, or None for the first page.
+
+    Returns: tuple: The rows of the page and the cursor for the next page (None on the last page).
+
+    Raises: ValueError: If the cursor is invalid.
+    """
+    if after is not None:
+        values = decode_cursor(after, len(key_columns))
+        clauses = []
+        for i, column in enumerate(key_columns):
+            equal = [c == v for c, v in zip(key_columns[:i], values[:i])]
+            clauses.append(and_(*equal, column > values[i]))
+        query = query.filter(or_(*clauses))
+
+    rows = query.order_by(*key_columns).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in key_columns])
+    return rows, next_cursor
+
+def create_missing_indexes(engine, metadata):
+    """Creates any index declared on the models that is missing from an existing database.
+
+    db.create_all() only creates indexes together with new tables, so databases created
+    before an index was added to the models would otherwise never receive it.
+
+    Parameters: engine (Engine): The engine connected to the database to upgrade.
+    metadata (MetaData): The metadata holding the model tables.
+
+    Returns: list: The names of the indexes that were created.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Runs PRAGMA statements on every new connection the engine opens to a SQLite database.
+
+    PRAGMAs such as journal_mode, synchronous and busy_timeout are per connection (or, for
+    WAL, only take effect once set), so they are applied from the pool's connect hook.
+
+    Parameters: engine (Engine): The engine to configure; engines for other databases are left unchanged.
+    pragmas (dict): PRAGMA names mapped to their values, run in order.
+
+    Returns: bool: True if a hook was installed.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return False
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return True
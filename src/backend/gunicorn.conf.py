@@ -0,0 +1,30 @@
+"""gunicorn settings for serving wsgi:app.
+
+The app is imported once in the master process (preload_app), which also creates any
+missing tables and indexes, and is then forked into WEB_CONCURRENCY worker processes,
+each serving GUNICORN_THREADS requests at a time. Every worker drops the database
+connections it inherited from the master (see app.after_fork).
+"""
+import multiprocessing
+import os
+from app import after_fork
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8000")
+
+# One worker per core by default. Each is a separate Python process, so they run
+# requests in parallel; the threads overlap the time spent waiting on the database.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+# Restart workers now and then so a slow leak cannot grow without bound.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+
+def post_fork(server, worker):
+    after_fork(worker.app.wsgi())
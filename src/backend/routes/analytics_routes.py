@@ -0,0 +1,32 @@
+from flask import jsonify
+from db.crud import crud_analytics
+
+def register_routes(app):
+    """Register all analytics-related Flask routes.
+
+    This function defines the read-only endpoints used by the admin dashboard.
+    All aggregation is done in SQL by the CRUD layer so the dashboard no longer
+    needs to download entire tables.
+
+    Parameters: app (Flask): The Flask application instance onto which routes will be registered.
+    """
+
+    @app.route('/analytics/summary', methods=['GET'])
+    def get_analytics_summary():
+        """Retrieve aggregate platform statistics for the admin dashboard.
+
+        Returns: tuple:
+                - JSON object containing:
+                    * events (dict): total and by_status counts.
+                    * users (dict): total and by_role counts.
+                    * tickets (dict): total and by_status counts.
+                    * sales (float): Sum of event prices over all issued tickets.
+                - HTTP status:
+                    * 200: Successfully computed the summary.
+                    * 500: Internal server error.
+        """
+        try:
+            summary = crud_analytics.get_summary()
+            return jsonify(summary), 200
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
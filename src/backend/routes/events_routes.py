@@ -1,28 +1,58 @@
 from flask import request, jsonify
-from db.crud import crud_events, crud_ticket, crud_users
+from db.crud import crud_events, crud_ticket
+from db.utils import pack_ids, parse_iso_datetime
+from utils.http_cache import versioned_collection
+from utils.streaming import parse_stream_format, stream_response
+from utils.validators import parse_page_args
 
 def register_routes(app):
     """Register all event-related Flask routes for the application.
 
     This function attaches multiple endpoints to the provided Flask app instance.
     The routes support event retrieval, creation, updating, deletion, participant
-    listing, attendance statistics, and fetching events associated with a specific
-    student user.
+    listing, attendance statistics, offline check-in manifests, and fetching events
+    associated with a specific student user.
 
     Parameters: app (Flask): The Flask application instance where routes will be registered.
     """
 
     @app.route('/events', methods=['GET'])
+    @versioned_collection('events')
     def get_events():
         """Retrieve all events stored in the system.
 
-        Returns: tuple: A JSON list of events and a status code.
+        Responses carry an ETag and Last-Modified derived from the events table
+        version; a matching If-None-Match or If-Modified-Since gets a 304.
+
+        Query parameters (optional):
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+            stream (str): 'json' or 'ndjson'; streams the full list as it is read
+                (also selected by Accept: application/x-ndjson).
+
+        Returns: tuple: A JSON list of events (or a page object with "items" and
+                "next_cursor" when a limit is given) and a status code.
                 - 200: Successfully retrieved all events.
+                - 304: The client's cached copy is still current.
+                - 400: Invalid limit or cursor.
                 - 500: An error occurred while fetching events.
         """
         try:
+            limit, after = parse_page_args(request.args)
+            stream_format = parse_stream_format(request)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            if stream_format is not None:
+                return stream_response(crud_events.iter_events(), stream_format)
+            if limit is not None:
+                page = crud_events.get_events_page(limit, after)
+                return jsonify(page), 200
             events = crud_events.get_all_events()
             return jsonify(events), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except RuntimeError as e:
             return jsonify({'error': str(e)}), 500
 
@@ -65,14 +95,8 @@ def register_routes(app):
             if not event:
                 return jsonify({'error': 'Event not found'}), 404
 
-            tickets = crud_ticket.get_tickets_by_event(event_id)
-            registered = len(tickets)
-            checked_in = len([t for t in tickets if t.get('status') == 'checked-in'])
-
-            return jsonify({
-                'registered': registered,
-                'checked_in': checked_in
-            }), 200
+            attendance = crud_ticket.get_event_attendance(event_id)
+            return jsonify(attendance), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -82,34 +106,115 @@ def register_routes(app):
 
         Parameters: event_id (int): The ID of the event to fetch participants for.
 
+        Query parameters (optional):
+            status (str): Only return participants whose ticket has this status.
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+
         Returns: tuple:
-                - A list of participant dictionaries containing:
+                - A list of participant dictionaries (or a page object with "items"
+                  and "next_cursor" when a limit is given) containing:
                     * name (str): Username of the attendee.
                     * ticketId (str): Ticket identifier.
                     * status (str): Ticket status.
                 - HTTP status:
                     * 200: Successfully retrieved participant list.
+                    * 400: Invalid limit or cursor.
                     * 404: Event does not exist.
                     * 500: An unexpected error occurred.
         """
+        try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        status = request.args.get('status')
+
+        def to_participant(p):
+            return {
+                'name': p['username'],
+                'ticketId': str(p['ticket_id']),
+                'status': p['status']
+            }
+
         try:
             event = crud_events.get_event_by_id(event_id)
             if not event:
                 return jsonify({'error': 'Event not found'}), 404
 
-            tickets = crud_ticket.get_tickets_by_event(event_id)
-            participants = []
+            if limit is not None:
+                page = crud_ticket.get_event_participants_page(event_id, limit, after, status)
+                page['items'] = [to_participant(p) for p in page['items']]
+                return jsonify(page), 200
+
+            participants = crud_ticket.get_event_participants(event_id, status)
+            return jsonify([to_participant(p) for p in participants]), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
-            for t in tickets:
-                user = crud_users.get_user_by_id(t.get('attendee_id'))
-                if user:
-                    participants.append({
-                        'name': user['username'],
-                        'ticketId': str(t.get('id')),
-                        'status': t.get('status')
-                    })
+    @app.route('/events/<int:event_id>/checkin-manifest', methods=['GET'])
+    def get_checkin_manifest(event_id):
+        """Retrieve the tickets that can be admitted to an event, for offline door scanners.
 
-            return jsonify(participants), 200
+        Ticket IDs are sent sorted and packed as base64 little-endian uint32 values
+        ("encoding": "base64-u32le"), so a scanner can binary-search them locally.
+        names[i] is the attendee of the i-th ticket. Scanners keep the returned
+        version and later ask only for what changed since then.
+
+        Parameters: event_id (int): The ID of the event.
+
+        Query parameters (optional):
+            since (int): A version the scanner already has; returns only the changes after it.
+
+        Returns: tuple:
+                - JSON object containing:
+                    * eventId (int), version (int), encoding (str).
+                    * Without since: count (int), ticketIds (str), names (list).
+                    * With since: since (int), added (str), addedNames (list), removed (str).
+                - HTTP status:
+                    * 200: Manifest or changes returned.
+                    * 400: Invalid or unknown since version.
+                    * 404: Event does not exist.
+                    * 500: An unexpected error occurred.
+        """
+        since = request.args.get('since')
+        if since is not None:
+            try:
+                since = int(since)
+                if since < 0:
+                    raise ValueError
+            except ValueError:
+                return jsonify({'error': 'Invalid since version'}), 400
+
+        try:
+            event = crud_events.get_event_by_id(event_id)
+            if not event:
+                return jsonify({'error': 'Event not found'}), 404
+
+            if since is None:
+                manifest = crud_ticket.get_checkin_manifest(event_id)
+                return jsonify({
+                    'eventId': event_id,
+                    'version': manifest['version'],
+                    'encoding': 'base64-u32le',
+                    'count': len(manifest['tickets']),
+                    'ticketIds': pack_ids([ticket_id for ticket_id, _ in manifest['tickets']]),
+                    'names': [name for _, name in manifest['tickets']]
+                }), 200
+
+            changes = crud_ticket.get_checkin_manifest_changes(event_id, since)
+            return jsonify({
+                'eventId': event_id,
+                'version': changes['version'],
+                'since': since,
+                'encoding': 'base64-u32le',
+                'added': pack_ids([ticket_id for ticket_id, _ in changes['added']]),
+                'addedNames': [name for _, name in changes['added']],
+                'removed': pack_ids(changes['removed'])
+            }), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -193,6 +298,10 @@ def register_routes(app):
 
         Parameters: user_id (str): The ID of the user whose events should be returned.
 
+        Query parameters (optional):
+            start (str): ISO date; only return events ending on or after it.
+            end (str): ISO date; only return events starting before it.
+
         Returns: tuple:
                 - A list of event dictionaries formatted for display in a calendar UI, including:
                     * id (str): Event ID.
@@ -205,35 +314,30 @@ def register_routes(app):
                     * ticketId (str): Ticket ID.
                 - HTTP status:
                     * 200: Successfully retrieved user events.
+                    * 400: Invalid start or end date.
                     * 500: An error occurred while fetching event data.
         """
+        window = {}
+        for field in ('start', 'end'):
+            value = request.args.get(field)
+            if value:
+                window[field] = parse_iso_datetime(value)
+                if window[field] is None:
+                    return jsonify({'error': f"Invalid {field} date"}), 400
+
         try:
-            tickets = crud_ticket.get_tickets_by_user(user_id)
-            if not tickets:
-                return jsonify([]), 200
-            
-            events_data = []
-
-            for ticket in tickets:
-                event_id = ticket.get('event_id')
-                event = crud_events.get_event_by_id(event_id)
-                if event:
-                    start_date = event.get('start_date')
-                    end_date = event.get('end_date')
-
-                    start_iso = start_date.isoformat() if start_date else None
-                    end_iso = end_date.isoformat() if end_date else None
-
-                    events_data.append({
-                        "id": str(event.get('id')),
-                        "title": event.get('title'),
-                        "start": start_iso,
-                        "end": end_iso,
-                        "allDay": False,
-                        "location": event.get('location'),
-                        "claimStatus": ticket.get('status', 'Claimed'),
-                        "ticketId": str(ticket.get('id'))
-                    })
+            rows = crud_ticket.get_calendar_events_for_user(user_id, **window)
+
+            events_data = [{
+                "id": str(row['event_id']),
+                "title": row['title'],
+                "start": row['start_date'],
+                "end": row['end_date'],
+                "allDay": False,
+                "location": row['location'],
+                "claimStatus": row['ticket_status'] or 'Claimed',
+                "ticketId": str(row['ticket_id'])
+            } for row in rows]
 
             return jsonify(events_data), 200
 
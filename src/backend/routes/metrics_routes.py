@@ -0,0 +1,86 @@
+from flask import Response
+from db.crud import crud_cache, crud_transactions, crud_write_queue
+from utils.instrumentation import format_metric
+
+def _cache_lines(app):
+    entity_stats = crud_cache.get_stats()
+    change_log = entity_stats.pop("change_log", None)
+    lines = []
+    for counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        lines += format_metric(
+            f"entity_cache_{counter}_total", "counter", f"Entity cache {counter}, by entity kind.",
+            [([("kind", kind)], stats[counter]) for kind, stats in sorted(entity_stats.items())]
+        )
+    lines += format_metric(
+        "entity_cache_entries", "gauge", "Entries held in the entity cache, by entity kind.",
+        [([("kind", kind)], stats["size"]) for kind, stats in sorted(entity_stats.items())]
+    )
+    if change_log:
+        lines += format_metric(
+            "entity_cache_remote_invalidations_total", "counter",
+            "Cache invalidations read from the change log written by other workers.",
+            [([], change_log["remote_invalidations"])]
+        )
+
+    qr_cache = app.extensions.get("qr_cache")
+    if qr_cache is not None:
+        qr_stats = qr_cache.stats()
+        for counter in ("hits", "misses", "evictions"):
+            lines += format_metric(f"qr_cache_{counter}_total", "counter", f"Ticket QR image cache {counter}.", [([], qr_stats[counter])])
+    return lines
+
+def _write_lines():
+    lines = []
+    retries = crud_transactions.get_stats()
+    if retries:
+        lines += format_metric("db_write_transactions_total", "counter", "CRUD write transactions committed or abandoned.", [([], retries["transactions"])])
+        lines += format_metric("db_write_retried_transactions_total", "counter", "Write transactions that needed at least one retry.", [([], retries["retried"])])
+        lines += format_metric("db_write_exhausted_transactions_total", "counter", "Write transactions still locked after the last retry.", [([], retries["exhausted"])])
+        lines += format_metric(
+            "db_write_retries_total", "counter", "Retries of write transactions after a lock or serialization failure, by operation.",
+            [([("operation", operation)], count) for operation, count in sorted(retries["by_operation"].items())]
+        )
+
+    write_queue = crud_write_queue.get_stats()
+    if write_queue:
+        lines += format_metric("write_queue_batches_total", "counter", "Groups committed by the write queue.", [([], write_queue["batches"])])
+        lines += format_metric("write_queue_operations_total", "counter", "Operations applied by the write queue.", [([], write_queue["operations"])])
+        lines += format_metric("write_queue_failed_operations_total", "counter", "Write queue operations that failed.", [([], write_queue["failed"])])
+        lines += format_metric("write_queue_depth", "gauge", "Operations waiting in the write queue.", [([], write_queue["queued"])])
+    return lines
+
+def _slow_query_lines(app):
+    slow_log = app.extensions.get("slow_queries")
+    if slow_log is None:
+        return []
+    stats = slow_log.stats()
+    return (
+        format_metric("slow_queries_total", "counter", "SQL statements slower than SLOW_QUERY_MS.", [([], stats["slow"])])
+        + format_metric("slow_queries_suppressed_total", "counter", "Slow statements not logged because of the rate limit.", [([], stats["suppressed"])])
+    )
+
+def register_routes(app):
+    """Register the Prometheus metrics endpoint.
+
+    The metrics are kept per worker process, so with several workers each scrape
+    reports the worker that served it. Expose the endpoint to the monitoring network
+    only; it is not meant for clients.
+
+    Parameters: app (Flask): The Flask application instance onto which routes will be registered.
+    """
+
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        """Report request, SQL, cache and write metrics in Prometheus text format.
+
+        Returns: Response:
+                - The metrics as text/plain (exposition format 0.0.4).
+                - HTTP status:
+                    * 200: Metrics rendered.
+        """
+        metrics = app.extensions.get("metrics")
+        lines = metrics.render() if metrics is not None else []
+        lines += _cache_lines(app)
+        lines += _write_lines()
+        lines += _slow_query_lines(app)
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
@@ -1,5 +1,6 @@
 from flask import request, jsonify
 from db.crud import crud_organization_member
+from utils.validators import parse_page_args
 
 def register_routes(app):
     """Register all organization-member-related Flask routes.
@@ -16,15 +17,30 @@ def register_routes(app):
     def get_organization_members():
         """Retrieve all organization members.
 
+        Query parameters (optional):
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+
         Returns: tuple:
-                - A JSON list of organization member entries.
+                - A JSON list of organization member entries, or a page object with "items" and "next_cursor" when a limit is given.
                 - HTTP status:
                     * 200: Successfully retrieved all organization members.
+                    * 400: Invalid limit or cursor.
                     * 500: An internal error occurred.
         """
         try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            if limit is not None:
+                page = crud_organization_member.get_organization_members_page(limit, after)
+                return jsonify(page), 200
             members = crud_organization_member.get_all_organization_members()
             return jsonify(members), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -1,5 +1,7 @@
 from flask import request, jsonify
 from db.crud import crud_organization
+from utils.http_cache import versioned_collection
+from utils.validators import parse_page_args
 
 def register_routes(app):
     """Register all organization-related Flask routes.
@@ -12,18 +14,38 @@ def register_routes(app):
     """
 
     @app.route('/organizations', methods=['GET'])
+    @versioned_collection('organizations')
     def get_organizations():
         """Retrieve all organizations.
 
+        Responses carry an ETag and Last-Modified derived from the organizations
+        table version; a matching If-None-Match or If-Modified-Since gets a 304.
+
+        Query parameters (optional):
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+
         Returns: tuple:
-                - JSON list of organization objects.
+                - JSON list of organization objects, or a page object with "items" and "next_cursor" when a limit is given.
                 - HTTP status:
                     * 200: Successfully retrieved all organizations.
+                    * 304: The client's cached copy is still current.
+                    * 400: Invalid limit or cursor.
                     * 500: An internal server error occurred.
         """
         try:
+            limit, after = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            if limit is not None:
+                page = crud_organization.get_organizations_page(limit, after)
+                return jsonify(page), 200
             orgs = crud_organization.get_all_organizations()
             return jsonify(orgs), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
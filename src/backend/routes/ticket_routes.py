@@ -1,8 +1,14 @@
 from flask import request, jsonify, send_file
-from db.crud import crud_ticket, crud_users
-import qrcode  
+from db.crud import crud_ticket
+from db.utils import parse_iso_datetime
+from utils.qr_codes import QRCodeCache, ticket_qr_payload, verify_ticket_payload
+from utils.streaming import parse_stream_format, stream_response
+from utils.validators import parse_page_args
 import io
 
+# Upper bound on the scans a door device can upload in one batch request.
+MAX_BATCH_SCANS = 5000
+
 def register_routes(app):
     """Register all ticket-related Flask routes.
 
@@ -14,20 +20,70 @@ def register_routes(app):
 
     Parameters: app (Flask): The Flask application instance onto which routes will be registered.
     """
+    qr_cache = QRCodeCache(app.config.get('QR_CACHE_SIZE', 1024), app.config.get('QR_CACHE_DIR'))
+    app.extensions['qr_cache'] = qr_cache
+
+    def signed_payload(ticket_id, event_id, attendee_id):
+        return ticket_qr_payload(ticket_id, event_id, attendee_id, app.config['QR_SIGNING_KEY'])
+
+    def resolve_scan(code, event_id=None):
+        """Turn a scanned code into a ticket ID, rejecting bad codes without a database lookup.
+
+        Parameters: code (str or int): A signed QR payload, or a bare ticket ID.
+        event_id (int or None): The event being scanned for, if the scanner sent one.
+
+        Returns: tuple: The ticket ID (or None), the event ID and attendee ID the ticket
+        must still have when it is checked in (either may be None), and an error message (or None).
+        """
+        if isinstance(code, str) and '.' in code:
+            try:
+                claims = verify_ticket_payload(code, app.config['QR_SIGNING_KEY'])
+            except ValueError as e:
+                return None, (None, None), str(e)
+            if event_id is not None and claims['event_id'] != event_id:
+                return None, (None, None), 'Ticket is for a different event'
+            return claims['ticket_id'], (claims['event_id'], claims['attendee_id']), None
+
+        if not app.config.get('QR_ACCEPT_UNSIGNED', True):
+            return None, (None, None), 'Unsigned ticket codes are not accepted'
+        try:
+            return int(code), (event_id, None), None
+        except (TypeError, ValueError):
+            return None, (None, None), 'Invalid Ticket ID format'
 
     @app.route('/tickets', methods=['GET'])
     def get_tickets():
         """Retrieve all tickets.
 
+        Query parameters (optional):
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+            stream (str): 'json' or 'ndjson'; streams the full list as it is read
+                (also selected by Accept: application/x-ndjson).
+
         Returns: tuple:
-                - JSON list of ticket objects.
+                - JSON list of ticket objects, or a page object with "items" and "next_cursor" when a limit is given.
                 - HTTP status:
                     * 200: Successfully retrieved all tickets.
+                    * 400: Invalid limit or cursor.
                     * 500: Internal server error.
         """
         try:
+            limit, after = parse_page_args(request.args)
+            stream_format = parse_stream_format(request)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            if stream_format is not None:
+                return stream_response(crud_ticket.iter_tickets(), stream_format)
+            if limit is not None:
+                page = crud_ticket.get_tickets_page(limit, after)
+                return jsonify(page), 200
             tickets = crud_ticket.get_all_tickets()
             return jsonify(tickets), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -77,23 +133,43 @@ def register_routes(app):
 
     @app.route('/tickets/<int:ticket_id>/qr', methods=['GET'])
     def get_ticket_qr(ticket_id):
-        """Generate and return a QR code associated with a ticket ID.
+        """Return the QR code image associated with a ticket ID.
+
+        Images are served from the QR cache and carry an ETag derived from the
+        encoded payload, so a client revalidating with If-None-Match gets a 304
+        without the image being rendered or read again.
 
-        Parameters: ticket_id (int): The ID encoded into the generated QR code.
+        The code encodes a signed payload carrying the ticket, event and attendee IDs.
+
+        Parameters: ticket_id (int): The ID of the ticket.
 
         Returns:
             - PNG image file containing the ticket QR code.
             - HTTP status:
                 * 200: QR code successfully generated.
+                * 304: The client's cached copy is still current.
+                * 404: Ticket not found.
                 * 500: Error generating QR code.
         """
         try:
-            qr_data = str(ticket_id)
-            img = qrcode.make(qr_data)
-            buf = io.BytesIO()
-            img.save(buf, "PNG")
-            buf.seek(0)
-            return send_file(buf, mimetype='image/png')
+            ticket = crud_ticket.get_ticket_by_id(ticket_id)
+            if not ticket:
+                return jsonify({'error': 'Ticket not found'}), 404
+
+            payload = signed_payload(ticket['id'], ticket['event_id'], ticket['attendee_id'])
+            max_age = app.config.get('QR_CACHE_MAX_AGE', 86400)
+
+            etag = qr_cache.etag(payload)
+            if request.if_none_match.contains(etag):
+                response = app.response_class(status=304)
+            else:
+                etag, png = qr_cache.get(payload)
+                response = send_file(io.BytesIO(png), mimetype='image/png', etag=False)
+
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.max_age = max_age
+            return response
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -109,6 +185,7 @@ def register_routes(app):
                 - HTTP status:
                     * 201: Ticket successfully created.
                     * 400: Missing or invalid request data.
+                    * 409: The event is sold out.
                     * 500: Internal creation error.
         """
         try:
@@ -117,32 +194,51 @@ def register_routes(app):
                 return jsonify({'error': 'Missing data'}), 400
 
             ticket = crud_ticket.create_ticket(data)
-            return jsonify({'message': 'Ticket created', 'ticket': ticket}), 201
+        except crud_ticket.SoldOutError as e:
+            return jsonify({'error': str(e)}), 409
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+        if app.config.get('QR_PRERENDER', True):
+            # Best effort: the ticket exists, so a failure here must not change the response.
+            try:
+                stored = crud_ticket.get_ticket_by_id(ticket)
+                qr_cache.prerender(signed_payload(stored['id'], stored['event_id'], stored['attendee_id']))
+            except Exception as e:
+                app.logger.warning("Failed to prerender QR code for ticket %s: %s", ticket, e)
+        return jsonify({'message': 'Ticket created', 'ticket': ticket}), 201
+
     @app.route('/tickets/validate', methods=['POST'])
     def validate_ticket():
         """Validate and check in a ticket.
 
         Expected JSON:
             {
-                "ticketId": "<ticket ID as string>"
+                "ticketId": "<scanned QR payload, or ticket ID as string>",
+                "eventId": <event being checked in, optional>
             }
 
         Validation rules:
+            - A signed QR payload must carry a valid signature and, when eventId
+              is given, be for that event. These checks run before any database
+              access, so forged or misdirected codes never reach the database.
+            - Bare ticket IDs are only accepted while QR_ACCEPT_UNSIGNED is enabled.
             - Ticket must exist.
+            - Ticket must be for eventId, and still belong to the attendee a
+              signed code was issued to (a code from before a transfer is refused).
             - Ticket must have status 'valid'.
             - Ticket must not already be checked in.
 
         On success, the ticket status is updated to 'checked-in'
-        and attendee information is returned.
+        and attendee information is returned. The check and the update
+        happen in one conditional UPDATE, so concurrent scans of the same
+        ticket only succeed once.
 
         Returns: tuple:
                 - JSON indicating validation result, attendee name, and updated ticket.
                 - HTTP status:
                     * 200: Ticket successfully validated.
-                    * 400: Missing or invalid ticket ID, or invalid ticket status.
+                    * 400: Missing or invalid ticket ID, bad signature, wrong event, or invalid ticket status.
                     * 404: Ticket not found.
                     * 500: Internal validation error.
         """
@@ -154,33 +250,130 @@ def register_routes(app):
                 return jsonify({'error': 'Ticket ID required'}), 400
 
             try:
-                ticket_id = int(ticket_id_str)
-            except ValueError:
-                return jsonify({'error': 'Invalid Ticket ID format'}), 400
+                event_id = int(data['eventId']) if data.get('eventId') is not None else None
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid Event ID format'}), 400
 
-            ticket = crud_ticket.get_ticket_by_id(ticket_id)
-            if not ticket:
+            ticket_id, (expected_event_id, expected_attendee_id), error = resolve_scan(ticket_id_str, event_id)
+            if error == 'Invalid Ticket ID format':
+                return jsonify({'error': error}), 400
+            if error:
+                return jsonify({'valid': False, 'error': error}), 400
+
+            outcome = crud_ticket.check_in_ticket(ticket_id, expected_event_id, expected_attendee_id)
+
+            if outcome['result'] == 'not-found':
                 return jsonify({'valid': False, 'error': 'Ticket not found'}), 404
 
-            if ticket.get('status') == 'checked-in':
+            if outcome['result'] == 'duplicate':
                 return jsonify({'valid': False, 'error': 'Ticket already checked in'}), 400
 
-            if ticket.get('status') != 'valid':
-                return jsonify({'valid': False, 'error': f"Invalid ticket status: {ticket.get('status')}"}), 400
-
-            updated_ticket = crud_ticket.update_ticket(ticket_id, {'status': 'checked-in'})
+            if outcome['result'] == 'invalid':
+                error = outcome.get('error') or f"Invalid ticket status: {outcome['status']}"
+                return jsonify({'valid': False, 'error': error}), 400
 
-            user = crud_users.get_user_by_id(ticket.get('attendee_id'))
             return jsonify({
                 'valid': True,
                 'message': 'Ticket Checked In Successfully!',
-                'attendeeName': user['username'] if user else 'Unknown',
-                'ticket': updated_ticket
+                'attendeeName': outcome['attendee_name'] or 'Unknown',
+                'ticket': outcome['ticket']
             }), 200
         
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/tickets/validate/batch', methods=['POST'])
+    def validate_tickets_batch():
+        """Check in a batch of offline scans in one transaction.
+
+        Expected JSON:
+            {
+                "eventId": <event being checked in, optional>,
+                "scans": [
+                    {"ticketId": "<scanned QR payload or ticket ID>", "scannedAt": "<ISO timestamp, optional>"},
+                    ...
+                ]
+            }
+
+        Scans are applied in scannedAt order, so when the same ticket was scanned more
+        than once only the earliest scan checks it in. Codes with a bad signature or
+        for another event are reported as 'invalid' without touching the database;
+        tickets that turn out to be for another event, or were transferred after their
+        signed code was issued, are reported as 'invalid' too.
+
+        Returns: tuple:
+                - JSON containing one result per scan, in request order, and a count per result:
+                    * ticketId: The scanned ticket ID.
+                    * scannedAt: The scan timestamp sent by the device.
+                    * result: 'checked-in', 'duplicate', 'invalid' or 'not-found'.
+                    * attendeeName: Present for 'checked-in' results.
+                    * status/error: Present for 'duplicate' and 'invalid' results.
+                - HTTP status:
+                    * 200: Batch processed.
+                    * 400: Missing or oversized scan list, or invalid event ID.
+                    * 500: Internal validation error.
+        """
+        try:
+            data = request.get_json(silent=True)
+            scans = data.get('scans') if isinstance(data, dict) else None
+
+            if not isinstance(scans, list) or not scans:
+                return jsonify({'error': 'Scans required'}), 400
+
+            if len(scans) > MAX_BATCH_SCANS:
+                return jsonify({'error': f"At most {MAX_BATCH_SCANS} scans per batch"}), 400
+
+            try:
+                event_id = int(data['eventId']) if data.get('eventId') is not None else None
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid Event ID format'}), 400
+
+            results = [None] * len(scans)
+            pending = []
+            for index, scan in enumerate(scans):
+                scan = scan if isinstance(scan, dict) else {}
+                scanned_at = scan.get('scannedAt')
+                ticket_id, expected, error = resolve_scan(scan.get('ticketId'), event_id)
+                if error:
+                    results[index] = {
+                        'ticketId': scan.get('ticketId'),
+                        'scannedAt': scanned_at,
+                        'result': 'invalid',
+                        'error': error
+                    }
+                    continue
+                scanned = parse_iso_datetime(scanned_at) if isinstance(scanned_at, str) else None
+                pending.append((scanned is None, scanned.timestamp() if scanned else 0, index, ticket_id, expected))
+
+            pending.sort()
+            outcomes = crud_ticket.check_in_tickets(
+                [ticket_id for *_, ticket_id, _ in pending],
+                [expected for *_, expected in pending]
+            )
+
+            for (_, _, index, ticket_id, _), outcome in zip(pending, outcomes):
+                result = {
+                    'ticketId': ticket_id,
+                    'scannedAt': scans[index].get('scannedAt'),
+                    'result': outcome['result']
+                }
+                if outcome['result'] == 'checked-in':
+                    result['attendeeName'] = outcome['attendee_name'] or 'Unknown'
+                elif 'status' in outcome:
+                    result['status'] = outcome['status']
+                if 'error' in outcome:
+                    result['error'] = outcome['error']
+                results[index] = result
+
+            counts = {}
+            for result in results:
+                counts[result['result']] = counts.get(result['result'], 0) + 1
+
+            return jsonify({'results': results, 'counts': counts}), 200
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/tickets/<int:ticket_id>', methods=['PUT'])
     def update_ticket(ticket_id):
         """Update an existing ticket.
@@ -193,20 +386,29 @@ def register_routes(app):
                 - JSON message with updated ticket data.
                 - HTTP status:
                     * 200: Ticket updated successfully.
-                    * 400: Missing request body.
+                    * 400: Missing request body, or an event_id that is not a number.
                     * 404: Ticket not found.
+                    * 409: The ticket was moved to a sold-out event.
                     * 500: Internal update error.
         """
         try:
             data = request.get_json()
             if not data:
                 return jsonify({'error': 'Missing data'}), 400
-            
+
+            if data.get('event_id') is not None:
+                try:
+                    data['event_id'] = int(data['event_id'])
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'Invalid Event ID format'}), 400
+
             updated_ticket = crud_ticket.update_ticket(ticket_id, data)
             if not updated_ticket:
                 return jsonify({'error': 'Ticket not found'}), 404
 
             return jsonify({'message': 'Ticket updated', 'ticket': updated_ticket}), 200
+        except crud_ticket.SoldOutError as e:
+            return jsonify({'error': str(e)}), 409
         except ValueError:
             return jsonify({'error': 'Ticket not found'}), 404
         except Exception as e:
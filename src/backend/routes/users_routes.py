@@ -1,5 +1,7 @@
 from flask import request, jsonify
 from db.crud import crud_users
+from utils.streaming import parse_stream_format, stream_response
+from utils.validators import parse_page_args
 
 def register_routes(app):
     """Register all user-related Flask routes.
@@ -15,15 +17,35 @@ def register_routes(app):
     def get_users():
         """Retrieve all users.
 
+        Query parameters (optional):
+            limit (int): Page size; switches the response to keyset pagination.
+            after (str): The next_cursor value from the previous page.
+            stream (str): 'json' or 'ndjson'; streams the full list as it is read
+                (also selected by Accept: application/x-ndjson).
+
         Returns: tuple:
-                - JSON list of user objects.
+                - JSON list of user objects, or a page object with "items" and "next_cursor" when a limit is given.
                 - HTTP status:
                     * 200: Successfully retrieved users.
+                    * 400: Invalid limit or cursor.
                     * 500: Internal server error.
         """
         try:
+            limit, after = parse_page_args(request.args)
+            stream_format = parse_stream_format(request)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            if stream_format is not None:
+                return stream_response(crud_users.iter_users(), stream_format)
+            if limit is not None:
+                page = crud_users.get_users_page(limit, after)
+                return jsonify(page), 200
             users = crud_users.get_all_users()
             return jsonify(users), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
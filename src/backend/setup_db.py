@@ -1,11 +1,13 @@
 from flask import Flask
-from config import Config
+from config import get_config
 from db import db
-from db.models import Organization
+from db.crud import crud_table_versions
+from db.models import Organization, TableVersion
+from sqlalchemy import select
 import json
 
 app = Flask(__name__)
-app.config.from_object(Config)
+app.config.from_object(get_config())
 db.init_app(app)
 
 with app.app_context():
@@ -19,6 +21,8 @@ with app.app_context():
     Behavior:
         - drop_all(): Removes all tables and data from the database.
         - create_all(): Recreates all tables based on current model definitions.
+        - Carries the table versions over the reset and bumps them, so the
+          ETags clients cached before it do not match the new data.
         - Prints a confirmation message upon success.
 
     Usage:
@@ -29,8 +33,20 @@ with app.app_context():
         This operation is destructive and irreversible. All existing data
         will be permanently deleted. Do not use in production environments.
     """
+    try:
+        versions = dict(db.session.execute(select(TableVersion.name, TableVersion.version)).all())
+    except Exception:
+        # A database from before table versions existed, or no database yet.
+        versions = {}
+    db.session.remove()
+
     db.drop_all()
     db.create_all()
+    for name, version in versions.items():
+        db.session.add(TableVersion(name=name, version=version))
+        db.session.flush()
+        crud_table_versions.bump_version(name)
+    db.session.commit()
     print("Database reset successfully.")
     
     # Load and seed organizations from JSON
@@ -40,6 +56,7 @@ with app.app_context():
             for org_data in organizations_data:
                 org = Organization(title=org_data['title'], description=org_data.get('description', ''), status="approved")
                 db.session.add(org)
+            crud_table_versions.bump_version(Organization.__tablename__)
             db.session.commit()
             print(f"✅ Seeded {len(organizations_data)} organizations (all pre-approved).")
     except FileNotFoundError:
@@ -1,22 +1,19 @@
 import pytest
-from flask import Flask
+from contextlib import contextmanager
 from db import db
 from db.models import User
-from config import Config
+from app import create_app
+from config import TestingConfig
+from utils.instrumentation import QueryCounter
 
-class TestConfig(Config):
-    TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+class TestConfig(TestingConfig):
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
 
 @pytest.fixture(scope="function")
 def app():
-    """Creates a new Flask app and database for each test."""
-    app = Flask(__name__)
-    app.config.from_object(TestConfig)
-
-    db.init_app(app)
+    """Creates a new Flask app and database for each test; tests register the routes they exercise."""
+    app = create_app(TestConfig, bare=True)
 
     with app.app_context():
         db.create_all()
@@ -36,3 +33,23 @@ def session(app):
     """Provides direct access to the database session."""
     with app.app_context():
         yield db.session
+
+
+@pytest.fixture(scope="function")
+def query_budget(app):
+    """
+    Provides a context manager failing the test when a block runs more SQL statements than allowed.
+
+    Usage:
+        with query_budget(3):
+            client.get("/events/1/participants")
+
+    The failure message lists the repeated statements, which usually point at an N+1 loop.
+    """
+    @contextmanager
+    def budget(limit):
+        with QueryCounter(db.engine) as queries:
+            yield queries
+        queries.assert_at_most(limit)
+
+    return budget
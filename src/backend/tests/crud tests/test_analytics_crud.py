@@ -0,0 +1,131 @@
+import pytest
+from db.crud import crud_analytics, crud_events, crud_ticket, crud_users
+from db.models import AnalyticsCounter
+from db import db
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture creating a small mix of users, events and tickets.
+
+    Returns:
+        tuple: (student_id, published_event_id, draft_event_id)
+    """
+    student_id = crud_users.create_user({
+        "username": "student",
+        "password": "pw",
+        "email": "student@example.com",
+        "role": "Student"
+    })
+    crud_users.create_user({
+        "username": "organizer",
+        "password": "pw",
+        "email": "organizer@example.com",
+        "role": "organizer"
+    })
+    published = crud_events.create_event({"title": "Published", "status": "published", "price": 10.0})
+    draft = crud_events.create_event({"title": "Draft", "status": "draft", "price": 5.0})
+    return student_id, published["id"], draft["id"]
+
+
+def test_get_summary(session, sample_data):
+    """
+    Test computing the summary with grouped COUNT(*) queries.
+
+    Steps:
+        1. Create users, events and tickets.
+        2. Check one ticket in.
+        3. Compute the summary.
+
+    Ensures:
+        - Counts are grouped case-insensitively by status and role.
+        - Sales sum the event price of every ticket.
+    """
+    student_id, published_id, draft_id = sample_data
+    ticket_id = crud_ticket.create_ticket({"attendee_id": student_id, "event_id": published_id})
+    crud_ticket.create_ticket({"attendee_id": student_id, "event_id": draft_id})
+    crud_ticket.update_ticket(ticket_id, {"status": "checked-in"})
+
+    summary = crud_analytics.get_summary()
+
+    assert summary["events"] == {"total": 2, "by_status": {"published": 1, "draft": 1}}
+    assert summary["users"]["by_role"] == {"student": 1, "organizer": 1}
+    assert summary["tickets"] == {"total": 2, "by_status": {"valid": 1, "checked-in": 1}}
+    assert summary["sales"] == 15.0
+
+
+def test_get_summary_empty(session):
+    """
+    Test the summary on an empty database.
+
+    Ensures:
+        - Totals are zero and sales is 0.0 rather than None.
+    """
+    summary = crud_analytics.get_summary()
+    assert summary["events"]["total"] == 0
+    assert summary["tickets"]["by_status"] == {}
+    assert summary["sales"] == 0.0
+
+
+def test_summary_table_incremental(app, session, sample_data):
+    """
+    Test that the materialized counters follow ticket and event changes.
+
+    Steps:
+        1. Enable the summary table and build it.
+        2. Create, check in and delete tickets; publish the draft event.
+        3. Compare the materialized summary with the live one.
+
+    Ensures:
+        - Inserts, status updates and deletes adjust the counters without a rebuild.
+    """
+    student_id, published_id, draft_id = sample_data
+    app.config["ANALYTICS_SUMMARY_TABLE"] = True
+    crud_analytics.refresh_summary_table()
+
+    first = crud_ticket.create_ticket({"attendee_id": student_id, "event_id": published_id})
+    second = crud_ticket.create_ticket({"attendee_id": student_id, "event_id": published_id})
+    crud_ticket.update_ticket(first, {"status": "checked-in"})
+    crud_ticket.delete_ticket(second)
+    crud_events.update_event(draft_id, {"status": "published"})
+
+    materialized = crud_analytics.get_summary()
+    assert materialized["tickets"] == {"total": 1, "by_status": {"checked-in": 1}}
+    assert materialized["events"]["by_status"] == {"published": 2}
+
+    app.config["ANALYTICS_SUMMARY_TABLE"] = False
+    assert crud_analytics.get_summary() == materialized
+
+
+def test_summary_table_built_at_startup(app, session, sample_data):
+    """
+    Test that the counters table is built at startup and never by a read.
+
+    Steps:
+        1. Enable the summary table on a populated database and read the summary.
+        2. Run the startup preparation and read it again.
+
+    Ensures:
+        - Reading the summary does not write to the counters table.
+        - prepare_database counts the existing rows.
+    """
+    from app import prepare_database
+
+    app.config["ANALYTICS_SUMMARY_TABLE"] = True
+    assert crud_analytics.get_summary()["events"]["total"] == 0
+    assert db.session.query(AnalyticsCounter).count() == 0
+
+    prepare_database(app)
+
+    assert crud_analytics.get_summary()["events"]["total"] == 2
+    assert db.session.query(AnalyticsCounter).count() > 0
+
+
+def test_get_summary_error(session):
+    """
+    Test that database failures surface as RuntimeError.
+    """
+    db.drop_all()
+
+    with pytest.raises(RuntimeError):
+        crud_analytics.get_summary()
@@ -0,0 +1,222 @@
+import pytest
+from sqlalchemy import event as sa_event
+from db.crud import crud_cache, crud_events, crud_users
+from db import db
+
+
+@pytest.fixture
+def statements(app):
+    """
+    Fixture recording every SQL statement sent to the database during a test.
+
+    Returns:
+        list: The statements, in execution order.
+    """
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    sa_event.listen(db.engine, "before_cursor_execute", record)
+    yield executed
+    sa_event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_entity_cache_lru_and_ttl():
+    """
+    Test eviction of the least recently used entry and expiry after the TTL.
+
+    Ensures:
+        - The cache never holds more than max_entries.
+        - An expired entry is reloaded and counted as an expiration.
+    """
+    now = [0.0]
+    cache = crud_cache.EntityCache(max_entries=2, ttl=10, clock=lambda: now[0])
+
+    cache.get_or_load(1, lambda: {"id": 1})
+    cache.get_or_load(2, lambda: {"id": 2})
+    cache.get_or_load(1, lambda: pytest.fail("entry 1 should be cached"))
+    cache.get_or_load(3, lambda: {"id": 3})
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert cache.get_or_load(2, lambda: {"id": 2, "reloaded": True})["reloaded"]
+
+    now[0] = 11.0
+    assert cache.get_or_load(2, lambda: {"id": 2, "fresh": True})["fresh"]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entity_cache_ignores_load_racing_an_invalidation():
+    """
+    Test that a value read while a write invalidated the cache is not stored.
+
+    Ensures:
+        - A concurrent update cannot leave the old row in the cache.
+        - Missing entities are not cached.
+    """
+    cache = crud_cache.EntityCache(max_entries=10, ttl=10)
+
+    def stale_load():
+        cache.invalidate(1)
+        return {"id": 1, "title": "old"}
+
+    assert cache.get_or_load(1, stale_load)["title"] == "old"
+    assert cache.get_or_load(1, lambda: {"id": 1, "title": "new"})["title"] == "new"
+
+    assert cache.get_or_load(2, lambda: None) is None
+    assert cache.stats()["size"] == 1
+
+
+def test_get_event_by_id_cached(session, statements):
+    """
+    Test repeated event lookups are served from the cache until the event changes.
+
+    Steps:
+        1. Create an event and look it up three times.
+        2. Update it and look it up again, then delete it.
+
+    Ensures:
+        - Only the first lookup queries SQLite.
+        - Mutating a returned dictionary does not change the cached entry.
+        - update_event and delete_event invalidate the entry.
+    """
+    event_id = crud_events.create_event({"title": "Hot event"})["id"]
+
+    first = crud_events.get_event_by_id(event_id)
+    statements.clear()
+    first["title"] = "Mutated by caller"
+    assert crud_events.get_event_by_id(event_id)["title"] == "Hot event"
+    assert crud_events.get_event_by_id(event_id)["title"] == "Hot event"
+    assert statements == []
+
+    crud_events.update_event(event_id, {"title": "Renamed"})
+    assert crud_events.get_event_by_id(event_id)["title"] == "Renamed"
+
+    crud_events.delete_event(event_id)
+    assert crud_events.get_event_by_id(event_id) is None
+
+    stats = crud_cache.get_stats()["events"]
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 2
+
+
+def test_get_user_by_id_cached(session, statements):
+    """
+    Test user lookups are cached and invalidated by update_user and delete_user.
+    """
+    user_id = crud_users.create_user({
+        "username": "cached",
+        "password": "pw",
+        "email": "cached@example.com",
+        "role": "student"
+    })
+
+    crud_users.get_user_by_id(user_id)
+    statements.clear()
+    assert crud_users.get_user_by_id(str(user_id))["username"] == "cached"
+    assert statements == []
+
+    crud_users.update_user(user_id, {"program": "SOEN"})
+    assert crud_users.get_user_by_id(user_id)["program"] == "SOEN"
+
+    crud_users.delete_user(user_id)
+    assert crud_users.get_user_by_id(user_id) is None
+
+
+def test_entity_cache_disabled(app, session, statements):
+    """
+    Test that ENTITY_CACHE_SIZE = 0 sends every lookup to the database.
+    """
+    app.config["ENTITY_CACHE_SIZE"] = 0
+    event_id = crud_events.create_event({"title": "Uncached"})["id"]
+
+    statements.clear()
+    crud_events.get_event_by_id(event_id)
+    crud_events.get_event_by_id(event_id)
+    assert len(statements) == 2
+    assert crud_cache.get_stats() == {}
+
+
+def _worker_app(db_path, **config):
+    """
+    Build a second, independent app on a shared SQLite file, standing in for one worker process.
+    """
+    from flask import Flask
+    from tests.conftest import TestConfig
+
+    worker = Flask(__name__)
+    worker.config.from_object(TestConfig)
+    worker.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    worker.config.update(config)
+    db.init_app(worker)
+    return worker
+
+
+def test_changelog_backend_invalidates_other_workers(tmp_path):
+    """
+    Test that an update handled by one worker evicts the entry cached by another.
+
+    Steps:
+        1. Start two apps on the same database file with the changelog backend.
+        2. Cache an event and an organization in worker A.
+        3. Update both through worker B, then read them again in worker A.
+
+    Ensures:
+        - Worker A serves the new values after polling the change log.
+        - Worker A's repeat lookups are cache hits until then.
+    """
+    from db.crud import crud_organization
+
+    settings = {"ENTITY_CACHE_BACKEND": "changelog", "ENTITY_CACHE_POLL_INTERVAL": 0}
+    worker_a = _worker_app(tmp_path / "shared.db", **settings)
+    worker_b = _worker_app(tmp_path / "shared.db", **settings)
+
+    with worker_a.app_context():
+        db.create_all()
+        event_id = crud_events.create_event({"title": "Before"})["id"]
+        org_id = crud_organization.create_organization({"title": "Org before"})
+        assert crud_events.get_event_by_id(event_id)["title"] == "Before"
+        assert crud_events.get_event_by_id(event_id)["title"] == "Before"
+        assert crud_organization.get_organization(org_id)["title"] == "Org before"
+        assert crud_cache.get_stats()["events"]["hits"] == 1
+
+    with worker_b.app_context():
+        crud_events.update_event(event_id, {"title": "After"})
+        crud_organization.update_organization(org_id, {"title": "Org after"})
+
+    with worker_a.app_context():
+        assert crud_events.get_event_by_id(event_id)["title"] == "After"
+        assert crud_organization.get_organization(org_id)["title"] == "Org after"
+        assert crud_cache.get_stats()["change_log"]["remote_invalidations"] == 2
+        db.session.remove()
+        db.engine.dispose()
+
+    with worker_b.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_memory_backend_is_per_process(tmp_path):
+    """
+    Test the limitation the changelog backend exists for: with the memory backend,
+    another worker keeps serving its cached copy after an update.
+    """
+    worker_a = _worker_app(tmp_path / "shared.db")
+    worker_b = _worker_app(tmp_path / "shared.db")
+
+    with worker_a.app_context():
+        db.create_all()
+        event_id = crud_events.create_event({"title": "Before"})["id"]
+        crud_events.get_event_by_id(event_id)
+
+    with worker_b.app_context():
+        crud_events.update_event(event_id, {"title": "After"})
+        db.session.remove()
+        db.engine.dispose()
+
+    with worker_a.app_context():
+        assert crud_events.get_event_by_id(event_id)["title"] == "Before"
+        db.session.remove()
+        db.engine.dispose()
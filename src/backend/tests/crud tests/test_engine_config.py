@@ -0,0 +1,131 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from db import db
+from config import Config, ProductionConfig, TestingConfig, database_uri, engine_options, get_config
+
+
+def _file_app(db_path, config=Config, **overrides):
+    """
+    Build an app from a config profile, bound to a SQLite file instead of the configured database.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(f"sqlite:///{db_path}", pool_size=3, max_overflow=2)
+    app.config.update(overrides)
+    db.init_app(app)
+    return app
+
+
+def _pragma(name):
+    return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_pragmas_applied_to_new_connections(tmp_path):
+    """
+    Test that the profile's SQLITE_PRAGMAS are run on each connection of a file database.
+
+    Steps:
+        1. Build apps from the default and production profiles on SQLite files.
+        2. Read the PRAGMAs back through the session.
+
+    Ensures:
+        - WAL journaling, synchronous=NORMAL, the busy timeout, cache size and mmap size match the profile.
+    """
+    for config, path in ((Config, tmp_path / "dev.db"), (ProductionConfig, tmp_path / "prod.db")):
+        app = _file_app(path, config)
+        with app.app_context():
+            assert _pragma("journal_mode") == "wal"
+            assert _pragma("synchronous") == 1
+            assert _pragma("busy_timeout") == config.SQLITE_PRAGMAS["busy_timeout"]
+            assert _pragma("cache_size") == config.SQLITE_PRAGMAS["cache_size"]
+            assert _pragma("mmap_size") == config.SQLITE_PRAGMAS["mmap_size"]
+            db.session.remove()
+            db.engine.dispose()
+
+
+def test_sqlite_pragmas_can_be_disabled(tmp_path):
+    """
+    Test that an empty SQLITE_PRAGMAS leaves SQLite's defaults in place.
+
+    Steps:
+        1. Build an app with SQLITE_PRAGMAS set to {}.
+
+    Ensures:
+        - The file keeps the default rollback journal.
+    """
+    app = _file_app(tmp_path / "plain.db", SQLITE_PRAGMAS={})
+    with app.app_context():
+        assert _pragma("journal_mode") == "delete"
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_engine_uses_configured_pool_size(tmp_path):
+    """
+    Test that the pool options of a profile reach the engine.
+
+    Steps:
+        1. Build an app on a SQLite file with pool_size=3.
+
+    Ensures:
+        - The engine's pool keeps three connections.
+    """
+    app = _file_app(tmp_path / "pool.db")
+    with app.app_context():
+        assert db.engine.pool.size() == 3
+        db.engine.dispose()
+
+
+def test_engine_options_per_database():
+    """
+    Test the engine options built for in-memory SQLite, SQLite files and PostgreSQL.
+
+    Ensures:
+        - In-memory SQLite gets no pool options.
+        - A SQLite file gets the pool size, overflow and timeout.
+        - PostgreSQL also gets pre-ping and connection recycling.
+    """
+    assert engine_options("sqlite:///:memory:", 5, 10) == {}
+    assert engine_options("sqlite://", 5, 10) == {}
+    assert engine_options("sqlite:////tmp/app.db", 5, 10) == {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30}
+
+    options = engine_options("postgresql://u:p@db/app", 10, 20, pool_recycle=600)
+    assert options["pool_size"] == 10
+    assert options["max_overflow"] == 20
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 600
+
+
+def test_database_uri_from_environment(monkeypatch):
+    """
+    Test that DATABASE_URL overrides the default database and postgres:// URLs are normalized.
+
+    Ensures:
+        - Without DATABASE_URL the default is returned.
+        - postgres:// is rewritten to postgresql://.
+    """
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert database_uri("sqlite:///default.db") == "sqlite:///default.db"
+
+    monkeypatch.setenv("DATABASE_URL", "postgres://u:p@db/app")
+    assert database_uri() == "postgresql://u:p@db/app"
+
+
+def test_get_config_profiles(monkeypatch):
+    """
+    Test selecting a config profile by name or through APP_PROFILE.
+
+    Ensures:
+        - Names map to their profile classes and APP_PROFILE is used when no name is given.
+        - An unknown profile raises ValueError.
+    """
+    assert get_config("test") is TestingConfig
+    assert get_config("prod") is ProductionConfig
+
+    monkeypatch.setenv("APP_PROFILE", "prod")
+    assert get_config() is ProductionConfig
+
+    with pytest.raises(ValueError):
+        get_config("staging")
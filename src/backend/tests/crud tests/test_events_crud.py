@@ -1,5 +1,5 @@
 import pytest
-from db.crud import crud_events
+from db.crud import crud_events, crud_table_versions
 from db.models import Event
 from db import db
 
@@ -124,6 +124,81 @@ def test_get_all_events(session, sample_event_data):
     assert any(e["location"] == "Underground Club" for e in events)
 
 
+def test_get_events_page(session, sample_event_data):
+    """
+    Test walking through events page by page with a keyset cursor.
+
+    Steps:
+        1. Create three events.
+        2. Fetch pages of two events, following next_cursor.
+        3. Assert every event is returned exactly once, in id order.
+
+    Ensures:
+        - The last page has no next_cursor.
+        - Pages do not overlap.
+    """
+    for title in ["First", "Second", "Third"]:
+        crud_events.create_event({**sample_event_data, "title": title})
+
+    first = crud_events.get_events_page(2)
+    assert [e["title"] for e in first["items"]] == ["First", "Second"]
+    assert first["next_cursor"] is not None
+
+    second = crud_events.get_events_page(2, first["next_cursor"])
+    assert [e["title"] for e in second["items"]] == ["Third"]
+    assert second["next_cursor"] is None
+
+
+def test_get_events_page_invalid_cursor(session):
+    """
+    Test that a malformed cursor is rejected.
+
+    Ensures:
+        - ValueError is raised so routes can answer with 400.
+    """
+    with pytest.raises(ValueError):
+        crud_events.get_events_page(2, "not-a-cursor")
+
+
+def test_iter_events(session, sample_event_data):
+    """
+    Test streaming every event in batches smaller than the table.
+
+    Ensures:
+        - All events are yielded once, in id order, with the same fields as get_all_events.
+    """
+    for title in ["First", "Second", "Third"]:
+        crud_events.create_event({**sample_event_data, "title": title})
+
+    streamed = list(crud_events.iter_events(batch_size=2))
+    assert [e["title"] for e in streamed] == ["First", "Second", "Third"]
+    assert streamed == crud_events.get_all_events()
+
+
+def test_event_writes_bump_table_version(session, sample_event_data):
+    """
+    Test that creating, updating and deleting events bumps the events table version.
+
+    Ensures:
+        - Every successful write increments the version and records when it happened.
+        - A write that fails and is rolled back leaves the version unchanged.
+    """
+    assert crud_table_versions.get_version("events") == (0, None)
+
+    event = crud_events.create_event(sample_event_data)
+    version, updated_at = crud_table_versions.get_version("events")
+    assert version == 1
+    assert updated_at is not None
+
+    crud_events.update_event(event["id"], {"title": "Renamed"})
+    crud_events.delete_event(event["id"])
+    assert crud_table_versions.get_version("events")[0] == 3
+
+    with pytest.raises(RuntimeError):
+        crud_events.create_event({"description": "No title"})
+    assert crud_table_versions.get_version("events")[0] == 3
+
+
 def test_update_event(session, sample_event_data):
     """
     Test updating fields on an existing event.
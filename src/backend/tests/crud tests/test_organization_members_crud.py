@@ -112,6 +112,35 @@ def test_get_all_organization_members(session, setup_user_and_org):
     assert any(m["organization_id"] == org_id for m in members)
 
 
+def test_get_organization_members_page(session, setup_user_and_org):
+    """
+    Test paging through organization members on their composite key.
+
+    Steps:
+        1. Add two users to the same organization.
+        2. Fetch one member per page.
+
+    Ensures:
+        - The composite (organization_id, user_id) cursor resumes after the right row.
+    """
+    user_id, org_id = setup_user_and_org
+    other_id = crud_users.create_user({
+        "username": "othermember",
+        "password": "pass123",
+        "email": "other@example.com",
+        "role": "user"
+    })
+    crud_organization_member.create_organization_member({"organization_id": org_id, "user_id": user_id})
+    crud_organization_member.create_organization_member({"organization_id": org_id, "user_id": other_id})
+
+    first = crud_organization_member.get_organization_members_page(1)
+    second = crud_organization_member.get_organization_members_page(1, first["next_cursor"])
+
+    assert first["items"][0]["user_id"] == user_id
+    assert second["items"][0]["user_id"] == other_id
+    assert second["next_cursor"] is None
+
+
 def test_update_organization_member(session, setup_user_and_org):
     """
     Test updating an existing organization-member relationship.
@@ -94,6 +94,21 @@ def test_get_all_organizations(session, sample_org_data):
     assert any(o["title"] == "Another Org" for o in orgs)
 
 
+def test_get_organizations_page(session, sample_org_data):
+    """
+    Test retrieving organizations one page at a time.
+
+    Ensures:
+        - A page that fits the whole table has no next_cursor.
+    """
+    crud_organization.create_organization(sample_org_data)
+    crud_organization.create_organization({**sample_org_data, "title": "Other Org"})
+
+    page = crud_organization.get_organizations_page(5)
+    assert len(page["items"]) == 2
+    assert page["next_cursor"] is None
+
+
 def test_update_organization(session, sample_org_data):
     """
     Test updating an existing organization.
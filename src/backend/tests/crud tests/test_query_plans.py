@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import text
+from db.crud import crud_ticket
+from db.models import CheckinManifestChange, Event, OrganizationMember, Ticket
+from db.utils import create_missing_indexes
+from db import db
+
+
+def explain(query):
+    """
+    Run EXPLAIN QUERY PLAN on an ORM query.
+
+    Parameters:
+        query (Query): The query to explain.
+
+    Returns:
+        list: The plan detail lines reported by SQLite.
+    """
+    statement = query.statement.compile(
+        dialect=db.engine.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return [row[-1] for row in rows]
+
+
+def assert_no_full_scan(query):
+    """
+    Fail if SQLite would read any table of the query with a full scan.
+    """
+    plan = explain(query)
+    scans = [line for line in plan if line.startswith("SCAN ")]
+    assert not scans, f"Full table scan in query plan: {plan}"
+
+
+HOT_QUERIES = {
+    "tickets_by_event": lambda: db.session.query(Ticket).filter_by(event_id=1),
+    "tickets_by_user": lambda: db.session.query(Ticket).filter_by(attendee_id=1),
+    "tickets_by_event_and_status": lambda: db.session.query(Ticket).filter_by(event_id=1, status="valid"),
+    "tickets_by_status": lambda: db.session.query(Ticket).filter_by(status="checked-in"),
+    "event_participants": lambda: crud_ticket._participants_query(1, "valid"),
+    "events_by_organizer": lambda: db.session.query(Event).filter_by(organizer_id=1),
+    "events_by_status": lambda: db.session.query(Event).filter_by(status="published"),
+    "events_by_start_date": lambda: db.session.query(Event).filter(Event.start_date >= "2025-01-01"),
+    "manifest_changes_by_event": lambda: db.session.query(CheckinManifestChange).filter(
+        CheckinManifestChange.event_id == 1, CheckinManifestChange.id > 10
+    ),
+    "memberships_by_user": lambda: db.session.query(OrganizationMember).filter_by(user_id=1),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(session, name):
+    """
+    Test that hot lookup queries are served by an index.
+
+    Ensures:
+        - None of the queries listed in HOT_QUERIES falls back to a full table scan
+          if an index is removed from db/models.py.
+    """
+    assert_no_full_scan(HOT_QUERIES[name]())
+
+
+def test_create_missing_indexes(session):
+    """
+    Test upgrading a database that was created before an index existed.
+
+    Steps:
+        1. Drop one of the ticket indexes, as in an old app.db.
+        2. Run create_missing_indexes.
+
+    Ensures:
+        - Only the missing index is created, and running it again is a no-op.
+    """
+    db.session.execute(text("DROP INDEX ix_tickets_event_id_status"))
+    db.session.commit()
+
+    assert create_missing_indexes(db.engine, db.metadata) == ["ix_tickets_event_id_status"]
+    assert create_missing_indexes(db.engine, db.metadata) == []
@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from flask import json
+from db.crud import crud_events
+from db.models import Event, Organization, Ticket, User
+from db.serialization import EVENT, ORGANIZATION, TICKET, USER, iso_datetime
+from db import db
+
+
+ENCODERS = {
+    "user": (USER, lambda: User(username="u", password="pw", email="u@example.com", role="student", program="SOEN")),
+    "event": (EVENT, lambda: Event(title="E", start_date=datetime(2025, 10, 10, 18), price=5.0)),
+    "ticket": (TICKET, lambda: Ticket(attendee_id=1, event_id=1, qr_code="QR")),
+    "organization": (ORGANIZATION, lambda: Organization(title="O", status="active")),
+}
+
+
+@pytest.mark.parametrize("name", sorted(ENCODERS))
+def test_row_encoder_matches_model_data(session, name):
+    """
+    Test that each row encoder produces exactly what the model's .data returns.
+
+    Ensures:
+        - Adding a field to a model's .data without updating its encoder is caught.
+    """
+    encoder, factory = ENCODERS[name]
+    instance = factory()
+    db.session.add(instance)
+    db.session.commit()
+
+    row = db.session.query(*encoder.columns).one()
+    assert encoder(row) == instance.data
+    assert encoder.encode_all([row]) == [instance.data]
+
+
+def test_iso_datetime():
+    """
+    Test that naive datetimes are formatted as UTC and aware ones are converted to UTC.
+    """
+    assert iso_datetime(None) is None
+    assert iso_datetime(datetime(2025, 10, 10, 18)) == "2025-10-10T18:00:00Z"
+    eastern = timezone(timedelta(hours=-4))
+    assert iso_datetime(datetime(2025, 10, 10, 14, tzinfo=eastern)) == "2025-10-10T18:00:00Z"
+
+
+def test_json_provider_formats_dates(app, session):
+    """
+    Test that the app's JSON provider writes event dates as ISO-8601.
+    """
+    crud_events.create_event({"title": "Dated", "start_date": "2025-10-10T18:00:00Z"})
+
+    payload = json.loads(app.json.dumps(crud_events.get_all_events()))
+    assert payload[0]["start_date"] == "2025-10-10T18:00:00Z"
+    assert payload[0]["end_date"] is None
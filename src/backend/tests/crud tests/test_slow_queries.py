@@ -0,0 +1,120 @@
+import logging
+import pytest
+from db import db
+from db.crud import crud_events, crud_ticket
+from utils import slow_queries
+
+
+def _slow_entries(caplog):
+    return [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+
+
+def test_slow_query_logged_with_caller_and_plan(app, caplog):
+    """
+    Test that a statement over the threshold is logged with its caller, parameters and plan.
+
+    Steps:
+        1. Enable the slow query log with a 0 ms threshold.
+        2. Call crud_ticket.get_tickets_by_event.
+
+    Ensures:
+        - The entry names the CRUD function and shows the statement and its parameters.
+        - The EXPLAIN QUERY PLAN output shows the index used for the lookup.
+    """
+    app.config["SLOW_QUERY_MS"] = 0
+    slow_queries.init_app(app)
+    caplog.set_level(logging.WARNING)
+
+    crud_ticket.get_tickets_by_event(4242)
+
+    (entry,) = [e for e in _slow_entries(caplog) if "FROM tickets" in e]
+    assert "in crud_ticket.get_tickets_by_event" in entry
+    assert "parameters: (4242,)" in entry
+    assert "plan:" in entry
+    assert "USING INDEX" in entry
+
+
+def test_slow_query_caller_of_nested_work_function(app, caplog):
+    """
+    Test that statements run from a CRUD function's inner work() closure are attributed to the function.
+
+    Ensures:
+        - The INSERT flushed while bumping the table version names create_event and the helper it ran in.
+    """
+    app.config["SLOW_QUERY_MS"] = 0
+    slow_queries.init_app(app)
+    caplog.set_level(logging.WARNING)
+
+    crud_events.create_event({"title": "Slow"})
+
+    inserts = [e for e in _slow_entries(caplog) if "INSERT INTO events" in e]
+    assert inserts and "in crud_events.create_event via crud_table_versions._try_bump\n" in inserts[0]
+
+
+def test_slow_query_log_rate_limited():
+    """
+    Test the rate limit of the slow query log.
+
+    Steps:
+        1. Report the same slow statement three times, then two other statements, with a limit of 2 per interval.
+        2. Move the clock past the interval and report the first statement again.
+
+    Ensures:
+        - A statement is logged once per interval and the total per interval is capped.
+        - The next entry reports how many similar statements were not logged.
+    """
+    now = [0.0]
+    messages = []
+
+    class Logger:
+        def warning(self, message):
+            messages.append(message)
+
+    log = slow_queries.SlowQueryLog(Logger(), threshold=10, explain_plans=False, interval=60, limit=2, clock=lambda: now[0])
+    for _ in range(3):
+        log.observe(None, "sqlite", "SELECT * FROM tickets WHERE id IN (?, ?)", (1, 2), 0.5, False)
+    log.observe(None, "sqlite", "SELECT * FROM events", (), 0.5, False)
+    log.observe(None, "sqlite", "SELECT * FROM users", (), 0.5, False)
+    log.observe(None, "sqlite", "SELECT * FROM users", (), 0.001, False)
+
+    assert len(messages) == 2
+    assert log.stats() == {"slow": 5, "logged": 2, "suppressed": 3}
+
+    now[0] = 61.0
+    log.observe(None, "sqlite", "SELECT * FROM tickets WHERE id IN (?, ?, ?)", (1, 2, 3), 0.5, False)
+    assert len(messages) == 3
+    assert "similar slow queries not logged since the last entry: 2" in messages[-1]
+
+
+def test_slow_query_log_disabled(app):
+    """
+    Test that SLOW_QUERY_MS = None leaves the engine unwatched.
+    """
+    app.config["SLOW_QUERY_MS"] = None
+    slow_queries.init_app(app)
+    assert "slow_queries" not in app.extensions
+    assert db.session.execute(db.text("SELECT 1")).scalar() == 1
+
+
+def test_slow_query_log_after_failed_statements(app, caplog):
+    """
+    Test that failing statements leave no timing state behind and later statements are still logged.
+
+    Ensures:
+        - The connection's info is empty after failed statements.
+        - The next slow statement is logged.
+    """
+    from sqlalchemy.exc import OperationalError
+
+    app.config["SLOW_QUERY_MS"] = 0
+    slow_queries.init_app(app)
+    caplog.set_level(logging.WARNING)
+
+    with db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+        assert connection.info == {}
+        connection.exec_driver_sql("SELECT 42").scalar()
+
+    assert any("SELECT 42" in entry for entry in _slow_entries(caplog))
@@ -1,7 +1,12 @@
 import pytest
-from db.crud import crud_ticket
-from db.models import Ticket, Event
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from flask import Flask
+from db.crud import crud_analytics, crud_ticket
+from db.models import Ticket, Event, EventAttendance, EventInventory, User
 from db import db
+from tests.conftest import TestConfig
 
 @pytest.fixture
 def sample_ticket_data():
@@ -50,6 +55,117 @@ def test_create_ticket_invalid_data(session):
         crud_ticket.create_ticket({"attendee_id": None})
 
 
+def test_create_ticket_enforces_capacity(session):
+    """
+    Test that ticket issuance stops at the event's capacity.
+
+    Steps:
+        1. Create an event with two seats and one ticket issued before the inventory existed.
+        2. Issue tickets until the event is full.
+        3. Delete a ticket and issue again.
+
+    Ensures:
+        - Existing tickets are counted when the inventory row is seeded.
+        - SoldOutError is raised once capacity is reached.
+        - Deleting a ticket releases its seat.
+    """
+    event = Event(title="Small Room", capacity=2)
+    db.session.add(event)
+    db.session.commit()
+    db.session.add(Ticket(attendee_id=1, event_id=event.id))
+    db.session.commit()
+
+    ticket_id = crud_ticket.create_ticket({"attendee_id": 2, "event_id": event.id})
+    with pytest.raises(crud_ticket.SoldOutError):
+        crud_ticket.create_ticket({"attendee_id": 3, "event_id": event.id})
+    assert db.session.get(EventInventory, event.id).sold == 2
+
+    crud_ticket.delete_ticket(ticket_id)
+    crud_ticket.create_ticket({"attendee_id": 3, "event_id": event.id})
+    assert db.session.query(Ticket).filter_by(event_id=event.id).count() == 2
+
+
+def test_update_ticket_cannot_move_into_full_event(session):
+    """
+    Test that moving a ticket to another event respects that event's capacity.
+
+    Steps:
+        1. Create a full event with one seat and an event with free seats.
+        2. Move a ticket from the free event into the full one, then into an unlimited event.
+
+    Ensures:
+        - The move into the full event raises SoldOutError and leaves the ticket and both counts unchanged.
+        - A move into an event with room releases the old seat and takes a new one.
+    """
+    full = Event(title="Full Room", capacity=1)
+    roomy = Event(title="Big Room", capacity=10)
+    unlimited = Event(title="Open Air")
+    db.session.add_all([full, roomy, unlimited])
+    db.session.commit()
+    crud_ticket.create_ticket({"attendee_id": 1, "event_id": full.id})
+    ticket_id = crud_ticket.create_ticket({"attendee_id": 2, "event_id": roomy.id})
+
+    with pytest.raises(crud_ticket.SoldOutError):
+        crud_ticket.update_ticket(ticket_id, {"event_id": full.id})
+    assert db.session.get(Ticket, ticket_id).event_id == roomy.id
+    assert db.session.get(EventInventory, full.id).sold == 1
+    assert db.session.get(EventInventory, roomy.id).sold == 1
+
+    assert crud_ticket.update_ticket(ticket_id, {"event_id": unlimited.id})["event_id"] == unlimited.id
+    assert db.session.get(EventInventory, roomy.id).sold == 0
+    assert db.session.get(EventInventory, unlimited.id).sold == 1
+
+
+def test_create_ticket_concurrent_buyers(tmp_path):
+    """
+    Test that concurrent buyers cannot oversell an event.
+
+    Steps:
+        1. Create a file-backed database with an event of five seats.
+        2. Let sixteen threads buy a ticket at the same time.
+
+    Ensures:
+        - Exactly five purchases succeed and the rest are sold out.
+    """
+    app = Flask(__name__)
+    app.config.from_object(TestConfig)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'drop.db'}"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        event = Event(title="Popular Drop", capacity=5)
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+        db.session.remove()
+
+    barrier = threading.Barrier(16)
+
+    def buy(attendee_id):
+        with app.app_context():
+            barrier.wait()
+            try:
+                crud_ticket.create_ticket({"attendee_id": attendee_id, "event_id": event_id})
+                return "issued"
+            except crud_ticket.SoldOutError:
+                return "sold-out"
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(buy, range(16)))
+
+    with app.app_context():
+        issued = db.session.query(Ticket).filter_by(event_id=event_id).count()
+        db.engine.dispose()
+
+    assert results.count("issued") == 5
+    assert results.count("sold-out") == 11
+    assert issued == 5
+
+
 def test_get_ticket_by_id(session, sample_ticket_data):
     """
     Test retrieving a ticket by its ID.
@@ -115,6 +231,108 @@ def test_get_tickets_by_event(session, sample_ticket_data):
     assert empty_result == []
 
 
+def test_get_event_participants(session):
+    """
+    Test retrieving participants with the joined Ticket/User query.
+
+    Steps:
+        1. Create two users with tickets for the same event, one checked in.
+        2. Fetch all participants, then only checked-in ones.
+
+    Ensures:
+        - Usernames come from the join without per-ticket lookups.
+        - The status filter is applied in SQL.
+    """
+    alice = User(username="alice", password="pw", email="alice@example.com", role="student")
+    bob = User(username="bob", password="pw", email="bob@example.com", role="student")
+    db.session.add_all([alice, bob])
+    db.session.commit()
+
+    first = crud_ticket.create_ticket({"attendee_id": alice.id, "event_id": 1})
+    crud_ticket.create_ticket({"attendee_id": bob.id, "event_id": 1})
+    crud_ticket.create_ticket({"attendee_id": bob.id, "event_id": 2})
+    crud_ticket.update_ticket(first, {"status": "checked-in"})
+
+    participants = crud_ticket.get_event_participants(1)
+    assert [p["username"] for p in participants] == ["alice", "bob"]
+    assert participants[0] == {"ticket_id": first, "username": "alice", "status": "checked-in"}
+
+    checked_in = crud_ticket.get_event_participants(1, status="checked-in")
+    assert [p["username"] for p in checked_in] == ["alice"]
+
+
+def test_get_event_participants_page(session):
+    """
+    Test paging through an event's participants.
+
+    Ensures:
+        - The cursor resumes after the last ticket of the previous page.
+    """
+    users = [User(username=f"user{i}", password="pw", email=f"user{i}@example.com", role="student") for i in range(3)]
+    db.session.add_all(users)
+    db.session.commit()
+    for user in users:
+        crud_ticket.create_ticket({"attendee_id": user.id, "event_id": 1})
+
+    first = crud_ticket.get_event_participants_page(1, 2)
+    second = crud_ticket.get_event_participants_page(1, 2, first["next_cursor"])
+
+    assert [p["username"] for p in first["items"]] == ["user0", "user1"]
+    assert [p["username"] for p in second["items"]] == ["user2"]
+    assert second["next_cursor"] is None
+
+
+def test_get_event_attendance(session, sample_ticket_data):
+    """
+    Test counting registered and checked-in tickets for an event.
+
+    Steps:
+        1. Create two tickets for event 1 and one for event 2.
+        2. Check one event 1 ticket in.
+
+    Ensures:
+        - Counts only include the requested event.
+        - An event without tickets reports zeros.
+    """
+    ticket_id = crud_ticket.create_ticket(sample_ticket_data)
+    crud_ticket.create_ticket(sample_ticket_data)
+    crud_ticket.create_ticket({**sample_ticket_data, "event_id": 2})
+    crud_ticket.update_ticket(ticket_id, {"status": "checked-in"})
+
+    assert crud_ticket.get_event_attendance(1) == {"registered": 2, "checked_in": 1}
+    assert crud_ticket.get_event_attendance(9999) == {"registered": 0, "checked_in": 0}
+
+
+def test_get_event_attendance_cached_counters(app, session, sample_ticket_data):
+    """
+    Test that cached attendance counters follow ticket changes.
+
+    Steps:
+        1. Enable ATTENDANCE_COUNTERS and create a ticket before the first read.
+        2. Read attendance to seed the cached row.
+        3. Create, check in, move and delete tickets.
+
+    Ensures:
+        - The cached row matches a fresh GROUP BY count after every change.
+    """
+    app.config["ATTENDANCE_COUNTERS"] = True
+    first = crud_ticket.create_ticket(sample_ticket_data)
+    assert crud_ticket.get_event_attendance(1) == {"registered": 1, "checked_in": 0}
+    assert crud_ticket.get_event_attendance(2) == {"registered": 0, "checked_in": 0}
+
+    second = crud_ticket.create_ticket(sample_ticket_data)
+    crud_ticket.update_ticket(first, {"status": "checked-in"})
+    assert crud_ticket.get_event_attendance(1) == {"registered": 2, "checked_in": 1}
+
+    crud_ticket.update_ticket(second, {"event_id": 2})
+    crud_ticket.delete_ticket(first)
+    assert crud_ticket.get_event_attendance(1) == {"registered": 0, "checked_in": 0}
+    assert crud_ticket.get_event_attendance(2) == {"registered": 1, "checked_in": 0}
+
+    cached = db.session.get(EventAttendance, 2)
+    assert cached.registered == 1
+
+
 def test_get_tickets_by_user(session, sample_ticket_data):
     """
     Test retrieving tickets by user/attendee ID.
@@ -201,6 +419,27 @@ def test_get_all_tickets(session, sample_ticket_data):
     assert any(t["qr_code"] == "QRCODE999" for t in tickets)
 
 
+def test_get_tickets_page(session, sample_ticket_data):
+    """
+    Test retrieving tickets one page at a time.
+
+    Steps:
+        1. Create three tickets.
+        2. Fetch a page of two, then the page after its cursor.
+
+    Ensures:
+        - Each page respects the limit and pages do not overlap.
+    """
+    ids = [crud_ticket.create_ticket(sample_ticket_data) for _ in range(3)]
+
+    first = crud_ticket.get_tickets_page(2)
+    second = crud_ticket.get_tickets_page(2, first["next_cursor"])
+
+    assert [t["id"] for t in first["items"]] == ids[:2]
+    assert [t["id"] for t in second["items"]] == ids[2:]
+    assert second["next_cursor"] is None
+
+
 def test_update_ticket(session, sample_ticket_data):
     """
     Test updating an existing ticket.
@@ -231,6 +470,171 @@ def test_update_nonexistent_ticket(session):
     assert result is None
 
 
+def test_check_in_ticket(session):
+    """
+    Test checking a ticket in with the conditional update.
+
+    Steps:
+        1. Create a user and a ticket.
+        2. Check the ticket in twice, then try an expired and a missing ticket.
+
+    Ensures:
+        - The first check-in returns the updated ticket and attendee name.
+        - Later attempts are told apart as duplicate, invalid or not-found.
+    """
+    user = User(username="scanme", password="pw", email="scan@example.com", role="student")
+    db.session.add(user)
+    db.session.commit()
+    ticket_id = crud_ticket.create_ticket({"attendee_id": user.id, "event_id": 1})
+    expired_id = crud_ticket.create_ticket({"attendee_id": user.id, "event_id": 1, "status": "expired"})
+
+    outcome = crud_ticket.check_in_ticket(ticket_id)
+    assert outcome["result"] == "checked-in"
+    assert outcome["attendee_name"] == "scanme"
+    assert outcome["ticket"]["status"] == "checked-in"
+    assert db.session.get(Ticket, ticket_id).status == "checked-in"
+
+    assert crud_ticket.check_in_ticket(ticket_id) == {"result": "duplicate", "status": "checked-in"}
+    assert crud_ticket.check_in_ticket(expired_id) == {"result": "invalid", "status": "expired"}
+    assert crud_ticket.check_in_ticket(9999) == {"result": "not-found"}
+
+
+def test_check_in_ticket_updates_counters(app, session, sample_ticket_data):
+    """
+    Test that check-ins made by the bulk UPDATE still reach the cached counters.
+
+    Ensures:
+        - Both the attendance and analytics counters see the new status.
+    """
+    app.config["ATTENDANCE_COUNTERS"] = True
+    app.config["ANALYTICS_SUMMARY_TABLE"] = True
+    ticket_id = crud_ticket.create_ticket(sample_ticket_data)
+    crud_ticket.get_event_attendance(1)
+    crud_analytics.refresh_summary_table()
+
+    crud_ticket.check_in_ticket(ticket_id)
+
+    assert crud_ticket.get_event_attendance(1) == {"registered": 1, "checked_in": 1}
+    assert crud_analytics.get_summary()["tickets"]["by_status"] == {"checked-in": 1}
+
+
+def test_check_in_ticket_concurrent_scanners(tmp_path):
+    """
+    Test that concurrent scanners cannot check the same ticket in twice.
+
+    Steps:
+        1. Create a file-backed database shared by several threads.
+        2. Let eight threads check the same ticket in at once.
+
+    Ensures:
+        - Exactly one scanner succeeds and all others see a duplicate.
+    """
+    app = Flask(__name__)
+    app.config.from_object(TestConfig)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'scan.db'}"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        ticket_id = crud_ticket.create_ticket({"attendee_id": 1, "event_id": 1})
+        db.session.remove()
+
+    barrier = threading.Barrier(8)
+
+    def scan():
+        with app.app_context():
+            barrier.wait()
+            try:
+                return crud_ticket.check_in_ticket(ticket_id)["result"]
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: scan(), range(8)))
+
+    with app.app_context():
+        db.engine.dispose()
+
+    assert results.count("checked-in") == 1
+    assert results.count("duplicate") == 7
+
+
+def test_check_in_tickets_batch(session, sample_ticket_data, monkeypatch):
+    """
+    Test checking a batch of tickets in with set-based statements.
+
+    Steps:
+        1. Create valid, already checked-in and expired tickets.
+        2. Submit them in one batch together with a repeated and a missing ID,
+           using a small chunk size so the batch spans several chunks.
+
+    Ensures:
+        - Every input ID gets a result, in input order.
+        - Only the first scan of a repeated ticket checks it in.
+    """
+    monkeypatch.setattr(crud_ticket, "CHECK_IN_CHUNK_SIZE", 2)
+    first = crud_ticket.create_ticket(sample_ticket_data)
+    second = crud_ticket.create_ticket(sample_ticket_data)
+    done = crud_ticket.create_ticket({**sample_ticket_data, "status": "checked-in"})
+    expired = crud_ticket.create_ticket({**sample_ticket_data, "status": "expired"})
+
+    results = crud_ticket.check_in_tickets([first, done, first, expired, 9999, second])
+
+    assert [r["result"] for r in results] == [
+        "checked-in", "duplicate", "duplicate", "invalid", "not-found", "checked-in"
+    ]
+    assert results[3]["status"] == "expired"
+    assert db.session.get(Ticket, second).status == "checked-in"
+
+
+def test_checkin_manifest_and_changes(session):
+    """
+    Test building an event's check-in manifest and catching up from a version.
+
+    Steps:
+        1. Create tickets for the event and take a manifest.
+        2. Check one in, batch check in another, delete one, move one to
+           another event and issue a new one.
+        3. Fetch the changes since the manifest's version.
+
+    Ensures:
+        - The manifest lists only valid tickets, sorted, with attendee names.
+        - Applying the changes to the manifest gives the current manifest.
+        - Asking for a version newer than the current one is rejected.
+    """
+    alice = User(username="alice", password="pw", email="alice@example.com", role="student")
+    db.session.add(alice)
+    db.session.commit()
+
+    ids = [crud_ticket.create_ticket({"attendee_id": alice.id, "event_id": 1}) for _ in range(5)]
+    crud_ticket.create_ticket({"attendee_id": alice.id, "event_id": 1, "status": "expired"})
+
+    manifest = crud_ticket.get_checkin_manifest(1)
+    assert manifest["tickets"] == [(ticket_id, "alice") for ticket_id in ids]
+    assert manifest["version"] > 0
+
+    crud_ticket.check_in_ticket(ids[0])
+    crud_ticket.check_in_tickets([ids[1]])
+    crud_ticket.delete_ticket(ids[2])
+    crud_ticket.update_ticket(ids[3], {"event_id": 2})
+    new_id = crud_ticket.create_ticket({"attendee_id": alice.id, "event_id": 1})
+
+    changes = crud_ticket.get_checkin_manifest_changes(1, manifest["version"])
+    assert changes["added"] == [(new_id, "alice")]
+    assert changes["removed"] == sorted(ids[:4])
+
+    current = crud_ticket.get_checkin_manifest(1)
+    assert current["version"] == changes["version"]
+    admitted = {ticket_id for ticket_id, _ in manifest["tickets"]}
+    admitted = (admitted - set(changes["removed"])) | {ticket_id for ticket_id, _ in changes["added"]}
+    assert sorted(admitted) == [ticket_id for ticket_id, _ in current["tickets"]]
+
+    assert crud_ticket.get_checkin_manifest_changes(1, current["version"])["removed"] == []
+    with pytest.raises(ValueError):
+        crud_ticket.get_checkin_manifest_changes(1, current["version"] + 1000)
+
+
 def test_delete_ticket(session, sample_ticket_data):
     """
     Test deleting a ticket.
@@ -318,3 +722,34 @@ def test_get_tickets_and_events_for_user_error(session):
 
     assert isinstance(results, list)
     assert results == []
+
+
+def test_get_calendar_events_for_user_window(session):
+    """
+    Test retrieving a user's calendar events inside a date window.
+
+    Steps:
+        1. Create events in October and November with tickets for the same user.
+        2. Fetch the calendar without a window, then for November only.
+
+    Ensures:
+        - Without a window every ticketed event is returned in start-date order.
+        - The window excludes events outside the visible range.
+    """
+    october = Event(title="October", start_date=datetime(2025, 10, 10, 18), end_date=datetime(2025, 10, 10, 20))
+    november = Event(title="November", start_date=datetime(2025, 11, 5, 18), end_date=datetime(2025, 11, 5, 20))
+    db.session.add_all([november, october])
+    db.session.commit()
+    crud_ticket.create_ticket({"attendee_id": 10, "event_id": november.id})
+    crud_ticket.create_ticket({"attendee_id": 10, "event_id": october.id})
+
+    all_events = crud_ticket.get_calendar_events_for_user(10)
+    assert [e["title"] for e in all_events] == ["October", "November"]
+    assert all_events[0]["start_date"] == "2025-10-10T18:00:00Z"
+
+    window = crud_ticket.get_calendar_events_for_user(
+        10,
+        start=datetime(2025, 11, 1, tzinfo=timezone.utc),
+        end=datetime(2025, 12, 1, tzinfo=timezone.utc)
+    )
+    assert [e["title"] for e in window] == ["November"]
@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+import pytest
+from flask import Flask
+from sqlalchemy.exc import IntegrityError, OperationalError
+from db import db
+from db.crud import crud_ticket, crud_transactions
+from db.models import Event, User
+
+
+def _locked_error():
+    return OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+
+
+def test_retries_busy_errors_then_commits(app):
+    """
+    Test that a transaction failing with "database is locked" is rolled back and run again.
+
+    Steps:
+        1. Run a unit of work that raises a locked error twice, then adds a user.
+
+    Ensures:
+        - The user is committed on the third attempt.
+        - Two jittered sleeps happened, each within its backoff bound.
+        - The retries are counted for the operation.
+    """
+    attempts = []
+    delays = []
+
+    def work():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _locked_error()
+        user = User(username="retry", password="pw", email="retry@example.com", role="student")
+        db.session.add(user)
+        return user
+
+    user = crud_transactions.run_in_transaction("create_user", work, sleep=delays.append)
+
+    assert len(attempts) == 3
+    assert db.session.get(User, user.id) is not None
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= app.config["DB_RETRY_BASE_DELAY"]
+    assert 0 <= delays[1] <= 2 * app.config["DB_RETRY_BASE_DELAY"]
+
+    stats = crud_transactions.get_stats()
+    assert stats["retried"] == 1
+    assert stats["retries"] == 2
+    assert stats["by_operation"] == {"create_user": 2}
+
+
+def test_gives_up_after_configured_retries(app):
+    """
+    Test that a transaction still locked after DB_WRITE_RETRIES retries raises the last error.
+
+    Ensures:
+        - work() runs once plus DB_WRITE_RETRIES times.
+        - The transaction is counted as exhausted.
+    """
+    app.config["DB_WRITE_RETRIES"] = 2
+    attempts = []
+
+    def work():
+        attempts.append(1)
+        raise _locked_error()
+
+    with pytest.raises(OperationalError):
+        crud_transactions.run_in_transaction("update_ticket", work, sleep=lambda delay: None)
+
+    assert len(attempts) == 3
+    assert crud_transactions.get_stats()["exhausted"] == 1
+
+
+def test_other_errors_are_not_retried(app):
+    """
+    Test that errors other than lock and serialization failures are raised at once.
+
+    Ensures:
+        - Integrity errors and plain exceptions run work() only once.
+    """
+    for error in (IntegrityError("INSERT", {}, sqlite3.IntegrityError("UNIQUE constraint failed")), ValueError("bad")):
+        attempts = []
+
+        def work():
+            attempts.append(1)
+            raise error
+
+        with pytest.raises(type(error)):
+            crud_transactions.run_in_transaction("create_user", work, sleep=lambda delay: pytest.fail("slept"))
+        assert len(attempts) == 1
+
+
+def test_is_retryable_postgres_serialization_failure():
+    """
+    Test that PostgreSQL serialization failures and deadlocks are retryable by SQLSTATE.
+    """
+    class PgError(Exception):
+        def __init__(self, sqlstate):
+            super().__init__("could not serialize access")
+            self.sqlstate = sqlstate
+
+    assert crud_transactions.is_retryable(OperationalError("UPDATE", {}, PgError("40001")))
+    assert crud_transactions.is_retryable(OperationalError("UPDATE", {}, PgError("40P01")))
+    assert not crud_transactions.is_retryable(OperationalError("UPDATE", {}, PgError("23505")))
+
+
+def test_backoff_delay_is_capped():
+    """
+    Test that the backoff bound doubles per retry and never exceeds the maximum delay.
+    """
+    for _ in range(100):
+        assert 0 <= crud_transactions.backoff_delay(1, 0.01, 0.5) <= 0.01
+        assert 0 <= crud_transactions.backoff_delay(3, 0.01, 0.5) <= 0.04
+        assert 0 <= crud_transactions.backoff_delay(20, 0.01, 0.5) <= 0.5
+
+
+def test_create_ticket_waits_out_a_held_write_lock(tmp_path):
+    """
+    Test that create_ticket succeeds when another connection holds the write lock briefly.
+
+    Steps:
+        1. Open an app on a SQLite file with busy_timeout=0, so a locked write fails at once.
+        2. Take the write lock from a separate connection and release it shortly after.
+        3. Create a ticket while the lock is held.
+
+    Ensures:
+        - The ticket is created instead of failing, after at least one retry.
+    """
+    from tests.conftest import TestConfig
+
+    path = tmp_path / "busy.db"
+    app = Flask(__name__)
+    app.config.from_object(TestConfig)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        SQLITE_PRAGMAS={"busy_timeout": 0, "journal_mode": "WAL"},
+        DB_WRITE_RETRIES=20,
+        DB_RETRY_BASE_DELAY=0.05
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        event = Event(title="Busy")
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+
+        blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        # Long enough that the first attempt always meets the lock, however slow it is to start.
+        timer = threading.Timer(0.2, blocker.execute, ["COMMIT"])
+        timer.start()
+        try:
+            ticket_id = crud_ticket.create_ticket({"attendee_id": 1, "event_id": event_id})
+        finally:
+            timer.join()
+            blocker.close()
+
+        assert crud_ticket.get_ticket_by_id(ticket_id)["event_id"] == event_id
+        assert crud_transactions.get_stats()["by_operation"]["create_ticket"] >= 1
+        db.session.remove()
+        db.engine.dispose()
@@ -96,6 +96,25 @@ def test_get_all_users(session, sample_user_data):
     assert any(u["username"] == "seconduser" for u in users)
 
 
+def test_get_users_page(session, sample_user_data):
+    """
+    Test retrieving users one page at a time.
+
+    Ensures:
+        - A full page returns a cursor and the final page does not.
+    """
+    crud_users.create_user(sample_user_data)
+    crud_users.create_user({**sample_user_data, "username": "second", "email": "second@example.com"})
+
+    first = crud_users.get_users_page(1)
+    assert len(first["items"]) == 1
+    assert first["next_cursor"] is not None
+
+    second = crud_users.get_users_page(1, first["next_cursor"])
+    assert second["items"][0]["username"] == "second"
+    assert second["next_cursor"] is None
+
+
 def test_update_user(session, sample_user_data):
     """
     Test updating an existing user.
@@ -0,0 +1,214 @@
+import pytest
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+from db import db
+from db.crud import crud_ticket, crud_write_queue
+from db.models import Event, Ticket
+
+
+@pytest.fixture
+def queue_app(tmp_path):
+    """
+    Fixture providing an app on a SQLite file with the write queue enabled.
+
+    A generous WRITE_QUEUE_MAX_WAIT_MS lets concurrent submissions land in one group.
+    """
+    from tests.conftest import TestConfig
+
+    app = Flask(__name__)
+    app.config.from_object(TestConfig)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'queue.db'}",
+        WRITE_QUEUE=True,
+        WRITE_QUEUE_BATCH_SIZE=50,
+        WRITE_QUEUE_MAX_WAIT_MS=50
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        if "write_queue" in app.extensions:
+            app.extensions["write_queue"].close()
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _create_event(app, capacity=None):
+    with app.app_context():
+        event = Event(title="Drop", capacity=capacity)
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+
+def _buy(app, event_id, attendee_id):
+    with app.app_context():
+        try:
+            return crud_ticket.create_ticket({"attendee_id": attendee_id, "event_id": event_id})
+        except crud_ticket.SoldOutError:
+            return None
+        finally:
+            db.session.remove()
+
+
+def test_concurrent_ticket_inserts_share_commits(queue_app):
+    """
+    Test that tickets bought at the same time are committed in groups.
+
+    Steps:
+        1. Buy 20 tickets from 20 threads with the write queue enabled.
+
+    Ensures:
+        - Every caller gets a distinct ticket ID that is committed.
+        - Fewer commits (batches) than tickets were needed.
+    """
+    event_id = _create_event(queue_app)
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        ids = list(pool.map(lambda attendee: _buy(queue_app, event_id, attendee), range(20)))
+
+    assert len(set(ids)) == 20
+    with queue_app.app_context():
+        assert db.session.query(Ticket).filter(Ticket.id.in_(ids)).count() == 20
+        stats = crud_write_queue.get_stats()
+        assert stats["operations"] == 20
+        assert stats["batches"] < 20
+        assert stats["largest_batch"] > 1
+
+
+def test_sold_out_ticket_does_not_fail_its_group(queue_app):
+    """
+    Test that one failing operation only fails its own caller.
+
+    Steps:
+        1. Buy 5 tickets concurrently for an event with 3 seats.
+
+    Ensures:
+        - 3 purchases succeed and 2 raise SoldOutError.
+        - Exactly 3 tickets are stored.
+    """
+    event_id = _create_event(queue_app, capacity=3)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        ids = list(pool.map(lambda attendee: _buy(queue_app, event_id, attendee), range(5)))
+
+    assert len([i for i in ids if i is not None]) == 3
+    with queue_app.app_context():
+        assert db.session.query(Ticket).filter_by(event_id=event_id).count() == 3
+        assert crud_write_queue.get_stats()["failed"] == 2
+
+
+def test_update_ticket_through_queue(queue_app):
+    """
+    Test that status updates go through the queue and return the updated data.
+
+    Ensures:
+        - The updated ticket data is returned and stored.
+        - Updating a missing ticket returns None.
+    """
+    event_id = _create_event(queue_app)
+    ticket_id = _buy(queue_app, event_id, 1)
+
+    with queue_app.app_context():
+        updated = crud_ticket.update_ticket(ticket_id, {"status": "cancelled"})
+        assert updated["status"] == "cancelled"
+        assert crud_ticket.update_ticket(999, {"status": "cancelled"}) is None
+        db.session.remove()
+        assert db.session.get(Ticket, ticket_id).status == "cancelled"
+        assert crud_write_queue.get_stats()["operations"] == 3
+
+
+def test_write_queue_disabled_by_default(app):
+    """
+    Test that without WRITE_QUEUE tickets are committed by the calling thread.
+    """
+    assert crud_write_queue.get_queue() is None
+    crud_ticket.create_ticket({"attendee_id": 1, "event_id": 1})
+    assert crud_write_queue.get_stats() == {}
+
+
+def test_retried_batch_does_not_duplicate_writes(queue_app):
+    """
+    Test that a batch retried after a busy error commits each operation once.
+
+    Steps:
+        1. Queue an operation adding a ticket, then one failing with "database is locked" on its first run.
+        2. Wait for both results.
+
+    Ensures:
+        - Both operations land in one batch, which is retried as a whole.
+        - The ticket of the first operation is stored once, since nothing was committed before the retry.
+    """
+    event_id = _create_event(queue_app)
+    attempts = []
+
+    def add_ticket():
+        ticket = Ticket(attendee_id=1, event_id=event_id)
+        db.session.add(ticket)
+        db.session.flush()
+        return ticket.id
+
+    def busy_once():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError("UPDATE events", {}, sqlite3.OperationalError("database is locked"))
+        return "done"
+
+    with queue_app.app_context():
+        write_queue = crud_write_queue.get_queue()
+        first = write_queue.submit(add_ticket)
+        second = write_queue.submit(busy_once)
+        ticket_id = first.result(timeout=5)
+        assert second.result(timeout=5) == "done"
+
+        assert len(attempts) == 2
+        assert write_queue.stats()["batches"] == 1
+        assert db.session.query(Ticket).filter_by(event_id=event_id).count() == 1
+        assert db.session.get(Ticket, ticket_id) is not None
+
+
+def test_timed_out_operation_is_cancelled(queue_app):
+    """
+    Test that an operation whose caller gave up waiting is not applied later.
+
+    Steps:
+        1. Queue an operation that blocks the writer thread.
+        2. Run a ticket insert through the queue with a short WRITE_QUEUE_TIMEOUT, then unblock the writer.
+
+    Ensures:
+        - The caller gets a TimeoutError and the insert is never committed.
+    """
+    event_id = _create_event(queue_app)
+    release = threading.Event()
+    queue_app.config["WRITE_QUEUE_TIMEOUT"] = 0.2
+
+    with queue_app.app_context():
+        write_queue = crud_write_queue.get_queue()
+        blocker = write_queue.submit(release.wait)
+        time.sleep(0.1)  # Let the blocker's batch close before the insert is queued.
+        with pytest.raises(TimeoutError):
+            crud_write_queue.run(lambda: db.session.add(Ticket(attendee_id=1, event_id=event_id)))
+        release.set()
+        blocker.result(timeout=5)
+        write_queue.close(timeout=5)
+
+        assert db.session.query(Ticket).filter_by(event_id=event_id).count() == 0
+        assert write_queue.stats()["operations"] == 1
+
+
+def test_close_applies_queued_operations(queue_app):
+    """
+    Test that closing the queue, as done at interpreter exit, applies what is still queued.
+    """
+    event_id = _create_event(queue_app)
+
+    with queue_app.app_context():
+        write_queue = crud_write_queue.get_queue()
+        futures = [write_queue.submit(lambda: db.session.add(Ticket(attendee_id=1, event_id=event_id))) for _ in range(3)]
+        write_queue.close(timeout=5)
+
+        assert all(future.done() and future.exception() is None for future in futures)
+        assert db.session.query(Ticket).filter_by(event_id=event_id).count() == 3
@@ -0,0 +1,58 @@
+import pytest
+from db import db
+from routes import analytics_routes, events_routes, ticket_routes, users_routes
+
+@pytest.fixture(autouse=True)
+def setup_routes(app):
+    """
+    Automatically registers the analytics routes and the routes used to seed data.
+    """
+    analytics_routes.register_routes(app)
+    events_routes.register_routes(app)
+    ticket_routes.register_routes(app)
+    users_routes.register_routes(app)
+
+
+def test_get_analytics_summary(client):
+    """
+    Test retrieving the admin dashboard summary.
+
+    Steps:
+        1. Create a student, a published event and a ticket.
+        2. GET /analytics/summary.
+
+    Ensures:
+        - The response contains the aggregate counts instead of full tables.
+    """
+    user_id = client.post("/users", json={
+        "username": "s1",
+        "password": "pw",
+        "email": "s1@example.com",
+        "role": "student"
+    }).get_json()["id"]
+    event_id = client.post("/events", json={
+        "title": "Event 1",
+        "status": "published",
+        "price": 12.5
+    }).get_json()["event"]["id"]
+    client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+
+    response = client.get("/analytics/summary")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["events"]["by_status"]["published"] == 1
+    assert body["users"]["by_role"]["student"] == 1
+    assert body["tickets"]["total"] == 1
+    assert body["sales"] == 12.5
+
+
+def test_get_analytics_summary_internal_error(client, app):
+    """
+    Test that internal database failures return 500.
+    """
+    with app.app_context():
+        db.drop_all()
+
+    response = client.get("/analytics/summary")
+    assert response.status_code == 500
+    assert "Failed to compute analytics summary" in response.get_json()["error"]
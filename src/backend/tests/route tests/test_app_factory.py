@@ -0,0 +1,94 @@
+import pytest
+from app import after_fork, create_app
+from tests.conftest import TestConfig
+from db import db
+from db.crud import crud_write_queue
+
+
+def test_create_app_registers_routes_and_hooks():
+    """
+    Test that the factory builds a complete app from a config class.
+
+    Steps:
+        1. Build an app with create_app and create its tables.
+        2. GET /, /events and /metrics.
+
+    Ensures:
+        - The root, the resource routes and the metrics endpoint are served.
+        - The metrics hooks recorded the requests.
+    """
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    assert client.get("/").get_json() == {"message": "Hello, this is root"}
+    assert client.get("/events").status_code == 200
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'http_requests_total{endpoint="get_events",method="GET",status="200"} 1' in metrics
+
+
+def test_create_app_from_profile_name():
+    """
+    Test that create_app accepts a profile name and that a bare app has no routes.
+    """
+    app = create_app("test", bare=True)
+    assert app.config["TESTING"]
+    assert [rule.endpoint for rule in app.url_map.iter_rules()] == ["static"]
+
+
+def test_after_fork_drops_inherited_connections(tmp_path):
+    """
+    Test the reset run in each worker process after the fork.
+
+    Steps:
+        1. Build an app on a file database and use a connection, which returns to the pool.
+        2. Start the app's write queue and call after_fork.
+
+    Ensures:
+        - The pool no longer holds the connection, and the next query opens a new one.
+        - The inherited write queue is discarded.
+    """
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'fork.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        WRITE_QUEUE = True
+
+    app = create_app(FileConfig, bare=True)
+    with app.app_context():
+        db.session.execute(db.text("SELECT 1"))
+        db.session.remove()
+        assert db.engine.pool.checkedin() == 1
+        write_queue = crud_write_queue.get_queue()
+
+    after_fork(app)
+
+    with app.app_context():
+        assert db.engine.pool.checkedin() == 0
+        assert db.session.execute(db.text("SELECT 1")).scalar() == 1
+    assert "write_queue" not in app.extensions
+    write_queue.close()
+
+
+def test_production_requires_qr_signing_key():
+    """
+    Test that the prod profile refuses to start without its own QR signing key.
+
+    Ensures:
+        - create_app raises RuntimeError when QR_SIGNING_KEY is not set.
+        - With a key the app starts, and bare ticket IDs are not accepted.
+    """
+    from config import ProductionConfig
+
+    class NoKeyConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        QR_SIGNING_KEY = None
+
+    class KeyConfig(NoKeyConfig):
+        QR_SIGNING_KEY = "production-key"
+
+    with pytest.raises(RuntimeError, match="QR_SIGNING_KEY"):
+        create_app(NoKeyConfig, bare=True)
+    app = create_app(KeyConfig, bare=True)
+    assert app.config["QR_ACCEPT_UNSIGNED"] is False
@@ -1,3 +1,4 @@
+import json
 import pytest
 from db import db
 from routes import events_routes, ticket_routes, users_routes
@@ -149,6 +150,131 @@ def test_get_all_events(client):
     assert any(e["title"] == "Event 2" for e in events)
 
 
+def test_get_events_paginated(client):
+    """
+    Test keyset pagination on GET /events.
+
+    Steps:
+        1. Create three events.
+        2. GET /events?limit=2, then follow next_cursor.
+
+    Ensures:
+        - Page responses wrap items with a next_cursor.
+        - Following the cursor returns the remaining events.
+    """
+    for title in ["Event 1", "Event 2", "Event 3"]:
+        client.post("/events", json={"title": title})
+
+    first = client.get("/events?limit=2").get_json()
+    assert [e["title"] for e in first["items"]] == ["Event 1", "Event 2"]
+
+    second = client.get(f"/events?limit=2&after={first['next_cursor']}").get_json()
+    assert [e["title"] for e in second["items"]] == ["Event 3"]
+    assert second["next_cursor"] is None
+
+
+def test_get_events_paginated_invalid_args(client):
+    """
+    Test that bad pagination parameters are rejected with 400.
+
+    Ensures:
+        - Non-numeric and non-positive limits are refused.
+        - Malformed cursors are refused.
+    """
+    assert client.get("/events?limit=abc").status_code == 400
+    assert client.get("/events?limit=0").status_code == 400
+    assert client.get("/events?limit=2&after=garbage").status_code == 400
+
+
+def test_get_events_streamed(client, monkeypatch):
+    """
+    Test streaming GET /events as a JSON array and as NDJSON.
+
+    Steps:
+        1. Create three events.
+        2. Request both streamed formats with one row per chunk.
+
+    Ensures:
+        - The body is written in several chunks and matches the regular response.
+        - Unknown formats and streams combined with a limit are rejected.
+    """
+    from utils import streaming
+
+    monkeypatch.setattr(streaming, "STREAM_CHUNK_ROWS", 1)
+    for title in ["Event 1", "Event 2", "Event 3"]:
+        client.post("/events", json={"title": title})
+    expected = client.get("/events").get_json()
+
+    response = client.get("/events?stream=json", buffered=False)
+    chunks = list(response.response)
+    assert len(chunks) > 3
+    assert response.mimetype == "application/json"
+    response.close()
+    assert client.get("/events?stream=json").get_json() == expected
+
+    response = client.get("/events", headers={"Accept": "application/x-ndjson"})
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == expected
+
+    assert client.get("/events?stream=xml").status_code == 400
+    assert client.get("/events?stream=json&limit=2").status_code == 400
+
+
+def test_get_events_streamed_empty_and_error(client, app):
+    """
+    Test streaming an empty table, and that a failing query still returns 500.
+    """
+    assert client.get("/events?stream=json").get_json() == []
+    assert client.get("/events?stream=ndjson").get_data() == b""
+
+    with app.app_context():
+        db.drop_all()
+
+    response = client.get("/events?stream=json")
+    assert response.status_code == 500
+    assert "Failed to fetch events" in response.get_json()["error"]
+
+
+def test_get_events_conditional(client, monkeypatch):
+    """
+    Test ETag and Last-Modified revalidation of GET /events.
+
+    Steps:
+        1. Create an event and GET /events.
+        2. Repeat the request with If-None-Match / If-Modified-Since, with the list query
+           patched to fail if it runs.
+        3. Create another event and revalidate again.
+
+    Ensures:
+        - A matching validator gets a 304 without running the list query.
+        - Different query strings get different ETags.
+        - A write changes the ETag so the next revalidation returns the new list.
+    """
+    from db.crud import crud_events
+
+    client.post("/events", json={"title": "Event 1"})
+    first = client.get("/events")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert "no-cache" in first.headers["Cache-Control"]
+    assert client.get("/events?limit=5").headers["ETag"] != etag
+
+    with monkeypatch.context() as patch:
+        patch.setattr(crud_events, "get_all_events", lambda: pytest.fail("ran the list query"))
+        cached = client.get("/events", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        since = client.get("/events", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+        assert since.status_code == 304
+
+    client.post("/events", json={"title": "Event 2"})
+    refreshed = client.get("/events", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert len(refreshed.get_json()) == 2
+
+
 def test_get_all_events_internal_error(client, app):
     """
     Test that internal database errors when fetching events return a 500 error.
@@ -237,6 +363,20 @@ def test_get_student_events_success(client, student_user_and_events):
     assert str(event_id_2) in event_ids
 
 
+def test_get_student_events_query_budget(client, student_user_and_events, query_budget):
+    """
+    Test that a student's calendar is read with one query, not one per ticket.
+
+    Ensures:
+        - GET /student/<id>/events stays within one SQL statement for two events.
+    """
+    user_id, _, _ = student_user_and_events
+
+    with query_budget(1):
+        resp = client.get(f"/student/{user_id}/events")
+    assert len(resp.get_json()) == 2
+
+
 def test_get_student_events_empty(client):
     """
     Test retrieving student events when the user has no tickets.
@@ -260,6 +400,38 @@ def test_get_student_events_empty(client):
     assert data == []
 
 
+def test_get_student_events_date_window(client):
+    """
+    Test limiting the student calendar feed to the visible date range.
+
+    Steps:
+        1. Create a student with tickets for a September and an October event.
+        2. Request the October window, then an invalid date.
+
+    Ensures:
+        - Only events inside the window are returned.
+        - Unparseable dates are rejected with 400.
+    """
+    user_id = client.post("/users", json={
+        "username": "windowuser",
+        "password": "pw",
+        "email": "window@example.com",
+        "role": "student"
+    }).get_json()["id"]
+    for title, date in [("September", "2025-09-15T10:00:00"), ("October", "2025-10-15T10:00:00")]:
+        event_id = client.post("/events", json={"title": title, "start_date": date}).get_json()["event"]["id"]
+        client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+
+    resp = client.get(f"/student/{user_id}/events?start=2025-10-01T00:00:00Z&end=2025-11-01T00:00:00Z")
+    assert resp.status_code == 200
+    events = resp.get_json()
+    assert [e["title"] for e in events] == ["October"]
+    assert events[0]["start"] == "2025-10-15T10:00:00Z"
+
+    resp = client.get(f"/student/{user_id}/events?start=not-a-date")
+    assert resp.status_code == 400
+
+
 # - UPDATE - 
 def test_update_event_success(client):
     """
@@ -399,6 +571,21 @@ def test_get_event_attendance_success(client):
     assert "checked_in" in body
 
 
+def test_get_event_attendance_counts(client, student_user_and_events):
+    """
+    Test attendance counts after a ticket is checked in.
+
+    Ensures:
+        - registered counts every ticket and checked_in only validated ones.
+    """
+    _, event_id, _ = student_user_and_events
+    ticket_id = client.get(f"/events/{event_id}/participants").get_json()[0]["ticketId"]
+    client.post("/tickets/validate", json={"ticketId": ticket_id})
+
+    body = client.get(f"/events/{event_id}/attendance").get_json()
+    assert body == {"registered": 1, "checked_in": 1}
+
+
 def test_get_event_attendance_not_found(client):
     """
     Test requesting attendance for a nonexistent event returns 404.
@@ -445,6 +632,67 @@ def test_get_event_participants_success(client):
     assert isinstance(response.get_json(), list)
 
 
+def test_get_event_participants_with_tickets(client, student_user_and_events):
+    """
+    Test the participant list content and its optional filters.
+
+    Steps:
+        1. Use the fixture's student with a ticket for the first event.
+        2. GET participants with no filter, a status filter and a page limit.
+
+    Ensures:
+        - Each participant carries the attendee name, ticket ID and status.
+        - Filtering by a status nobody has returns an empty list.
+        - A limit switches the response to a page object.
+    """
+    _, event_id, _ = student_user_and_events
+
+    participants = client.get(f"/events/{event_id}/participants").get_json()
+    assert len(participants) == 1
+    assert participants[0]["name"] == "calendaruser"
+    assert participants[0]["status"] == "valid"
+    assert isinstance(participants[0]["ticketId"], str)
+
+    filtered = client.get(f"/events/{event_id}/participants?status=checked-in").get_json()
+    assert filtered == []
+
+    page = client.get(f"/events/{event_id}/participants?limit=1").get_json()
+    assert page["items"] == participants
+    assert page["next_cursor"] is None
+
+
+def test_get_event_participants_query_budget(client, query_budget):
+    """
+    Test that the participant list runs a fixed number of queries however many attendees there are.
+
+    Steps:
+        1. Create an event with ten attendees holding tickets.
+        2. GET the full participant list and a page of it inside a query budget.
+
+    Ensures:
+        - Each request stays within two SQL statements (event lookup and participant query).
+    """
+    from db.crud import crud_ticket, crud_users
+
+    event_id = client.post("/events", json={"title": "Budget Event"}).get_json()["event"]["id"]
+    for index in range(10):
+        user_id = crud_users.create_user({
+            "username": f"budget{index}",
+            "password": "pw",
+            "email": f"budget{index}@example.com",
+            "role": "student"
+        })
+        crud_ticket.create_ticket({"attendee_id": user_id, "event_id": event_id})
+
+    with query_budget(2):
+        participants = client.get(f"/events/{event_id}/participants").get_json()
+    assert len(participants) == 10
+
+    with query_budget(2):
+        page = client.get(f"/events/{event_id}/participants?limit=5").get_json()
+    assert len(page["items"]) == 5
+
+
 def test_get_event_participants_not_found(client):
     """
     Test requesting participants for nonexistent event returns 404.
@@ -472,3 +720,40 @@ def test_get_event_participants_internal_error(client, app):
     response = client.get(f"/events/{event_id}/participants")
     assert response.status_code == 500
     assert "Failed" in response.get_json()["error"]
+
+
+def test_get_checkin_manifest(client, student_user_and_events):
+    """
+    Test downloading an event's check-in manifest and its changes.
+
+    Steps:
+        1. GET the manifest for the fixture's first event.
+        2. Issue a second ticket and check the first one in.
+        3. GET the changes since the manifest's version.
+
+    Ensures:
+        - Ticket IDs are packed and aligned with the attendee names.
+        - The delta lists the new ticket as added and the checked-in one as removed.
+        - Bad versions are rejected and missing events return 404.
+    """
+    from db.utils import unpack_ids
+
+    user_id, event_id, _ = student_user_and_events
+
+    manifest = client.get(f"/events/{event_id}/checkin-manifest").get_json()
+    assert manifest["count"] == 1
+    assert manifest["names"] == ["calendaruser"]
+    (first,) = unpack_ids(manifest["ticketIds"])
+
+    second = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    client.post("/tickets/validate", json={"ticketId": str(first)})
+
+    delta = client.get(f"/events/{event_id}/checkin-manifest?since={manifest['version']}").get_json()
+    assert delta["version"] > manifest["version"]
+    assert unpack_ids(delta["added"]) == [second]
+    assert delta["addedNames"] == ["calendaruser"]
+    assert unpack_ids(delta["removed"]) == [first]
+
+    assert client.get(f"/events/{event_id}/checkin-manifest?since=abc").status_code == 400
+    assert client.get(f"/events/{event_id}/checkin-manifest?since=999999").status_code == 400
+    assert client.get("/events/9999/checkin-manifest").status_code == 404
@@ -0,0 +1,171 @@
+import pytest
+from db.crud import crud_events
+from routes import events_routes, metrics_routes
+from utils import instrumentation
+
+@pytest.fixture(autouse=True)
+def setup_routes(app):
+    """
+    Automatically instruments the app and registers the metrics and event routes.
+    """
+    instrumentation.init_app(app)
+    events_routes.register_routes(app)
+    metrics_routes.register_routes(app)
+
+
+def _metrics(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    return response.get_data(as_text=True).splitlines()
+
+
+def test_metrics_record_requests_and_sql(client):
+    """
+    Test that requests are counted with their latency, SQL statements, rows and response size.
+
+    Steps:
+        1. Create three events.
+        2. GET /events twice, then GET /metrics.
+
+    Ensures:
+        - The request counter has the endpoint, method and status labels.
+        - Each list request ran SQL and the rows it read are counted.
+        - Latency and response size histograms are exported.
+    """
+    for index in range(3):
+        crud_events.create_event({"title": f"Event {index}"})
+
+    client.get("/events")
+    client.get("/events")
+    lines = _metrics(client)
+
+    assert 'http_requests_total{endpoint="get_events",method="GET",status="200"} 2' in lines
+    assert 'http_request_duration_seconds_count{endpoint="get_events",method="GET"} 2' in lines
+    assert 'http_request_sql_statements_count{endpoint="get_events"} 2' in lines
+    assert 'http_request_duration_seconds_bucket{endpoint="get_events",method="GET",le="+Inf"} 2' in lines
+    rows = next(line for line in lines if line.startswith('http_request_sql_rows_total{endpoint="get_events"}'))
+    assert int(rows.split()[-1]) >= 6
+    assert 'http_response_size_bytes_count{endpoint="get_events"} 2' in lines
+
+
+def test_metrics_unmatched_routes_and_cache_stats(client):
+    """
+    Test that 404s for unknown paths are grouped and entity cache counters are exported.
+
+    Steps:
+        1. GET an unknown path.
+        2. Read an event twice through the cache, then GET /metrics.
+
+    Ensures:
+        - The unknown path is counted under endpoint="unmatched".
+        - The entity cache hit and miss counters are reported per kind.
+    """
+    event_id = crud_events.create_event({"title": "Cached"})["id"]
+    client.get("/nowhere")
+    client.get(f"/events/{event_id}")
+    client.get(f"/events/{event_id}")
+    lines = _metrics(client)
+
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 1' in lines
+    assert 'entity_cache_hits_total{kind="events"} 1' in lines
+    assert 'entity_cache_misses_total{kind="events"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    """
+    Test the Prometheus rendering of a histogram.
+
+    Ensures:
+        - Bucket counts are cumulative, values on a bound fall in that bucket and +Inf holds every observation.
+    """
+    histogram = instrumentation.Histogram((1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert list(histogram.samples("x", [("endpoint", "e")])) == [
+        'x_bucket{endpoint="e",le="1"} 2',
+        'x_bucket{endpoint="e",le="5"} 3',
+        'x_bucket{endpoint="e",le="+Inf"} 4',
+        'x_sum{endpoint="e"} 14.5',
+        'x_count{endpoint="e"} 4',
+    ]
+
+
+def test_query_counter_reports_repeated_statements(app):
+    """
+    Test that exceeding a query budget names the statement repeated by an N+1 loop.
+
+    Steps:
+        1. Create three events.
+        2. Read them one at a time inside a QueryCounter, bypassing the entity cache.
+
+    Ensures:
+        - Three statements are counted and the repeated SELECT is reported with its count.
+        - assert_at_most fails with that report when the budget is lower.
+    """
+    from db import db
+    from db.models import Event
+
+    ids = [crud_events.create_event({"title": f"Event {index}"})["id"] for index in range(3)]
+    db.session.expunge_all()
+
+    with instrumentation.QueryCounter(db.engine) as queries:
+        for event_id in ids:
+            db.session.get(Event, event_id)
+
+    assert queries.count == 3
+    (statement, count), = queries.repeated()
+    assert count == 3
+    assert statement.startswith("SELECT events.id")
+    queries.assert_at_most(3)
+    with pytest.raises(AssertionError, match="Query budget of 1 exceeded: 3 SQL statements\nRepeated statements:\n  3x SELECT"):
+        queries.assert_at_most(1)
+
+
+def test_metrics_streamed_response_recorded_after_body(app, client):
+    """
+    Test that a streamed response is recorded once its body has been written.
+
+    Steps:
+        1. Create three events.
+        2. Stream GET /events as NDJSON, read the body and close the response.
+
+    Ensures:
+        - The request is only counted once the response is closed.
+        - The rows read while streaming the body are counted.
+    """
+    for index in range(3):
+        crud_events.create_event({"title": f"Event {index}"})
+
+    response = client.get("/events?stream=ndjson")
+    assert app.extensions["metrics"].requests == {}
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+    response.close()
+    lines = _metrics(client)
+
+    assert 'http_requests_total{endpoint="get_events",method="GET",status="200"} 1' in lines
+    rows = next(line for line in lines if line.startswith('http_request_sql_rows_total{endpoint="get_events"}'))
+    assert int(rows.split()[-1]) >= 3
+
+
+def test_failed_statements_leave_no_timing_state(app):
+    """
+    Test that statements that fail do not leave timing state on the pooled connection.
+
+    Ensures:
+        - The connection's info holds nothing after failing statements.
+        - A later statement is still timed and counted.
+    """
+    from db import db
+    from sqlalchemy.exc import OperationalError
+
+    with db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+        assert connection.info == {}
+
+        before = instrumentation.sql_tally()["statements"]
+        assert connection.exec_driver_sql("SELECT 1").scalar() == 1
+        assert instrumentation.sql_tally()["statements"] == before + 1
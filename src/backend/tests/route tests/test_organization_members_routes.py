@@ -119,6 +119,26 @@ def test_get_all_org_members(client):
     assert body[0]["user_id"] == user_id
 
 
+def test_get_org_members_paginated(client):
+    """
+    Test keyset pagination on GET /organization_members.
+
+    Ensures:
+        - Members are paged on the composite key.
+    """
+    org_id = create_org("O1")
+    for i in range(3):
+        user_id = create_user(f"u{i}", f"u{i}@test.com")
+        crud_organization_member.create_organization_member({"organization_id": org_id, "user_id": user_id})
+
+    first = client.get("/organization_members?limit=2").get_json()
+    second = client.get(f"/organization_members?limit=2&after={first['next_cursor']}").get_json()
+
+    assert len(first["items"]) == 2
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+
+
 def test_get_all_org_members_internal_error(client, app):
     """
     Test that internal database errors surface as 500.
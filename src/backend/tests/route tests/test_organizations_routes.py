@@ -106,6 +106,39 @@ def test_get_all_organizations(client):
     assert any(o["title"] == "Org 2" for o in orgs)
 
 
+def test_get_organizations_paginated(client):
+    """
+    Test keyset pagination on GET /organizations.
+
+    Ensures:
+        - A full page carries a cursor for the next one.
+    """
+    client.post("/organizations", json={"title": "Org 1", "status": "active"})
+    client.post("/organizations", json={"title": "Org 2", "status": "active"})
+
+    first = client.get("/organizations?limit=1").get_json()
+    assert first["items"][0]["title"] == "Org 1"
+
+    second = client.get(f"/organizations?limit=1&after={first['next_cursor']}").get_json()
+    assert second["items"][0]["title"] == "Org 2"
+
+
+def test_get_organizations_conditional(client):
+    """
+    Test that GET /organizations is revalidated with its ETag until an organization changes.
+    """
+    created = client.post("/organizations", json={"title": "Org A"}).get_json()
+    etag = client.get("/organizations").headers["ETag"]
+
+    assert client.get("/organizations", headers={"If-None-Match": etag}).status_code == 304
+
+    org_id = created["id"]
+    client.put(f"/organizations/{org_id}", json={"title": "Org B"})
+    response = client.get("/organizations", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()[0]["title"] == "Org B"
+
+
 def test_get_all_organizations_internal_error(client, app):
     """
     Test that internal DB failure returns 500 during list fetch.
@@ -0,0 +1,101 @@
+import os
+import pstats
+import tracemalloc
+import pytest
+from db.crud import crud_events
+from routes import events_routes
+from utils import profiling
+
+@pytest.fixture(autouse=True)
+def setup_routes(app, tmp_path):
+    """
+    Automatically enables profiling into a temporary directory and registers the event routes.
+    """
+    app.config.update(PROFILE_TOKEN="secret", PROFILE_DIR=str(tmp_path), PROFILE_KEEP=3)
+    profiling.init_app(app)
+    events_routes.register_routes(app)
+
+
+def _profiles(directory):
+    return sorted(name for name in os.listdir(directory))
+
+
+def test_profile_requested_by_admin_header(client, tmp_path):
+    """
+    Test that a request carrying the admin token is profiled.
+
+    Steps:
+        1. Create an event.
+        2. GET /events with the X-Profile header.
+
+    Ensures:
+        - The response names the profile, named after the endpoint and its duration.
+        - A .prof file and a text report are written; the report shows get_all_events and the allocations.
+        - tracemalloc is stopped again after the request.
+    """
+    crud_events.create_event({"title": "Profiled"})
+
+    response = client.get("/events", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+
+    stem = response.headers["X-Profile-Id"]
+    assert "-get_events-" in stem and stem.endswith("ms")
+    assert _profiles(tmp_path) == [stem + ".prof", stem + ".txt"]
+    report = (tmp_path / (stem + ".txt")).read_text()
+    assert report.startswith("GET /events -> 200 in ")
+    assert "get_all_events" in report
+    assert "allocation increases (tracemalloc)" in report
+    assert not tracemalloc.is_tracing()
+
+
+def test_requests_without_token_not_profiled(client, tmp_path):
+    """
+    Test that requests without the header, or with a wrong token, are served unprofiled.
+    """
+    assert "X-Profile-Id" not in client.get("/events").headers
+    assert "X-Profile-Id" not in client.get("/events", headers={"X-Profile": "guess"}).headers
+    assert _profiles(tmp_path) == []
+
+
+def test_sampled_profiles_rotated(app, client, tmp_path):
+    """
+    Test sampling and the rotation of the profile directory.
+
+    Steps:
+        1. Set the sample rate to 1 and PROFILE_KEEP to 3.
+        2. GET /events five times without the header.
+
+    Ensures:
+        - Every request is profiled, and only the three newest profiles are kept.
+    """
+    app.config["PROFILE_SAMPLE_RATE"] = 1.0
+
+    stems = [client.get("/events").headers["X-Profile-Id"] for _ in range(5)]
+
+    assert _profiles(tmp_path) == sorted(f"{stem}{extension}" for stem in stems[2:] for extension in (".prof", ".txt"))
+
+
+def test_streamed_response_profiled_until_closed(client, tmp_path):
+    """
+    Test that the profile of a streamed response covers the writing of its body.
+
+    Steps:
+        1. Create an event.
+        2. Stream GET /events as NDJSON with the X-Profile header, read the body and close the response.
+
+    Ensures:
+        - Nothing is written before the response is closed.
+        - The profile's files start with the X-Profile-Id header and the profile includes the row serialization.
+    """
+    crud_events.create_event({"title": "Streamed"})
+
+    response = client.get("/events?stream=ndjson", headers={"X-Profile": "secret"})
+    prefix = response.headers["X-Profile-Id"]
+    assert _profiles(tmp_path) == []
+    response.get_data()
+    response.close()
+
+    prof, txt = _profiles(tmp_path)
+    assert prof.startswith(prefix + "-") and prof.endswith("ms.prof")
+    functions = {name for _, _, name in pstats.Stats(str(tmp_path / prof)).stats}
+    assert "_ndjson_chunks" in functions
@@ -1,7 +1,7 @@
 import pytest
 from db import db
 from routes import ticket_routes
-from db.crud import crud_users, crud_events
+from db.crud import crud_users, crud_events, crud_ticket
 
 
 @pytest.fixture(autouse=True)
@@ -67,6 +67,39 @@ def test_create_ticket_success(client, mock_user_and_event):
     assert "ticket" in body
 
 
+def test_create_ticket_prerenders_stored_payload(client, app, mock_user_and_event, monkeypatch):
+    """
+    Test the QR pre-render uses the stored ticket and never fails the purchase.
+
+    Steps:
+        1. POST a ticket and wait for the pre-render.
+        2. GET its QR code.
+        3. POST another ticket with the pre-render patched to fail.
+
+    Ensures:
+        - The pre-rendered image is the one served, so the GET is a cache hit.
+        - A failing pre-render still returns 201 for the created ticket.
+    """
+    user_id, event_id = mock_user_and_event
+    qr_cache = app.extensions["qr_cache"]
+    rendered = []
+    prerender = qr_cache.prerender
+    monkeypatch.setattr(qr_cache, "prerender", lambda payload: rendered.append(prerender(payload)))
+
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    rendered[0].result()
+    assert client.get(f"/tickets/{ticket_id}/qr").status_code == 200
+    assert qr_cache.stats()["hits"] == 1
+
+    def fail(payload):
+        raise RuntimeError("renderer unavailable")
+
+    monkeypatch.setattr(qr_cache, "prerender", fail)
+    resp = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+    assert resp.status_code == 201
+    assert crud_ticket.get_ticket_by_id(resp.get_json()["ticket"])["status"] == "valid"
+
+
 def test_create_ticket_missing_data(client):
     """
     Test creating a ticket with an empty payload returns 400.
@@ -79,6 +112,28 @@ def test_create_ticket_missing_data(client):
     assert response.get_json()["error"] == "Missing data"
 
 
+def test_create_ticket_sold_out(client):
+    """
+    Test that buying a ticket for a full event returns 409.
+
+    Ensures:
+        - The seat check is applied on the POST /tickets path.
+    """
+    user_id = crud_users.create_user({
+        "username": "late",
+        "password": "pass",
+        "email": "late@example.com",
+        "role": "student"
+    })
+    event_id = crud_events.create_event({"title": "Tiny", "capacity": 1})["id"]
+
+    assert client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).status_code == 201
+
+    resp = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+    assert resp.status_code == 409
+    assert "sold out" in resp.get_json()["error"]
+
+
 # --- READ ---
 def test_get_all_tickets(client, mock_user_and_event):
     """
@@ -101,6 +156,39 @@ def test_get_all_tickets(client, mock_user_and_event):
     assert len(resp.get_json()) == 2
 
 
+def test_get_tickets_paginated(client, mock_user_and_event):
+    """
+    Test keyset pagination on GET /tickets.
+
+    Ensures:
+        - Only `limit` tickets are returned per page.
+        - The cursor resumes after the last ticket of the previous page.
+    """
+    user_id, event_id = mock_user_and_event
+    for _ in range(3):
+        client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+
+    first = client.get("/tickets?limit=2").get_json()
+    second = client.get(f"/tickets?limit=2&after={first['next_cursor']}").get_json()
+
+    assert len(first["items"]) == 2
+    assert len(second["items"]) == 1
+    assert second["items"][0]["id"] > first["items"][-1]["id"]
+
+
+def test_get_tickets_streamed(client, mock_user_and_event):
+    """
+    Test streaming GET /tickets as a JSON array.
+    """
+    user_id, event_id = mock_user_and_event
+    for _ in range(2):
+        client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id})
+
+    response = client.get("/tickets?stream=json")
+    assert response.status_code == 200
+    assert response.get_json() == client.get("/tickets").get_json()
+
+
 def test_get_all_tickets_internal_error(client, app):
     """
     Test that internal database failure surfaces as 500.
@@ -211,6 +299,77 @@ def test_get_student_tickets_with_details_internal_error(client, app):
     assert isinstance(data, dict) or isinstance(data, list)
 
 
+# --- QR CODES ---
+def test_get_ticket_qr_cached(client, app, mock_user_and_event):
+    """
+    Test the QR image is cached and revalidated with its ETag.
+
+    Steps:
+        1. Create a ticket with QR pre-rendering disabled.
+        2. GET the QR code twice.
+        3. GET it again with If-None-Match set to the returned ETag.
+
+    Ensures:
+        - The PNG is rendered once and served from the cache afterwards.
+        - Cache headers are set and a matching ETag returns 304 with no body.
+    """
+    user_id, event_id = mock_user_and_event
+    app.config["QR_PRERENDER"] = False
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+
+    first = client.get(f"/tickets/{ticket_id}/qr")
+    assert first.status_code == 200
+    assert first.mimetype == "image/png"
+    assert first.data.startswith(b"\x89PNG")
+    assert first.headers["ETag"]
+    assert "max-age" in first.headers["Cache-Control"]
+
+    second = client.get(f"/tickets/{ticket_id}/qr")
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    stats = app.extensions["qr_cache"].stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+    revalidated = client.get(f"/tickets/{ticket_id}/qr", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert app.extensions["qr_cache"].stats()["hits"] == 1
+
+
+def test_get_ticket_qr_not_found(client):
+    """
+    Test requesting the QR code of a missing ticket returns 404.
+    """
+    resp = client.get("/tickets/999/qr")
+    assert resp.status_code == 404
+
+
+def test_qr_cache_eviction_and_disk(tmp_path):
+    """
+    Test the QR cache stays bounded and reloads evicted images from disk.
+
+    Ensures:
+        - The least recently used entry is evicted past the size limit.
+        - Evicted images are read back from the cache directory, not re-rendered.
+    """
+    from utils import qr_codes
+
+    cache = qr_codes.QRCodeCache(max_entries=1, directory=str(tmp_path))
+    etag, png = cache.get("1")
+    cache.get("2")
+    assert cache.stats()["evictions"] == 1
+    assert (tmp_path / f"{etag}.png").exists()
+
+    original = qr_codes.render_qr_png
+    qr_codes.render_qr_png = lambda payload: pytest.fail("rendered a cached image")
+    try:
+        assert cache.get("1") == (etag, png)
+    finally:
+        qr_codes.render_qr_png = original
+
+
 # --- VALIDATE ---
 def test_validate_ticket_success(client, mock_user_and_event):
     """
@@ -238,6 +397,135 @@ def test_validate_ticket_success(client, mock_user_and_event):
     assert data["ticket"]["status"] == "checked-in"
 
 
+def _signed_code(app, ticket_id, event_id, attendee_id):
+    from utils.qr_codes import ticket_qr_payload
+    return ticket_qr_payload(ticket_id, event_id, attendee_id, app.config["QR_SIGNING_KEY"])
+
+
+def test_validate_ticket_signed_code(client, app, mock_user_and_event):
+    """
+    Test validating a ticket with the signed payload encoded in its QR code.
+
+    Steps:
+        1. Create ticket and build its signed QR payload.
+        2. POST the payload together with the event being scanned for.
+
+    Ensures:
+        - A correctly signed code checks the ticket in.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+
+    code = _signed_code(app, ticket_id, event_id, user_id)
+    resp = client.post("/tickets/validate", json={"ticketId": code, "eventId": event_id})
+
+    assert resp.status_code == 200
+    assert resp.get_json()["ticket"]["id"] == ticket_id
+
+
+def test_validate_ticket_rejects_forged_code(client, app, mock_user_and_event, monkeypatch):
+    """
+    Test tampered and wrong-event codes are rejected before the database is queried.
+
+    Steps:
+        1. Create ticket.
+        2. POST a code whose ticket ID was altered, and a valid code for another event,
+           with check-in patched to fail if it is reached.
+
+    Ensures:
+        - Both are rejected with 400 and the ticket stays valid.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    code = _signed_code(app, ticket_id, event_id, user_id)
+
+    monkeypatch.setattr(crud_ticket, "check_in_ticket", lambda *args: pytest.fail("reached the database"))
+
+    tampered = f"{ticket_id + 1}" + code[len(str(ticket_id)):]
+    resp = client.post("/tickets/validate", json={"ticketId": tampered})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Invalid ticket signature"
+
+    resp = client.post("/tickets/validate", json={"ticketId": code, "eventId": event_id + 1})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Ticket is for a different event"
+
+    monkeypatch.undo()
+    assert client.get(f"/tickets/{ticket_id}").get_json()["status"] == "valid"
+
+
+def test_validate_ticket_unsigned_disabled(client, app, mock_user_and_event):
+    """
+    Test bare ticket IDs are refused once QR_ACCEPT_UNSIGNED is turned off.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    app.config["QR_ACCEPT_UNSIGNED"] = False
+
+    resp = client.post("/tickets/validate", json={"ticketId": str(ticket_id)})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Unsigned ticket codes are not accepted"
+
+
+def _transfer_and_second_event(client, user_id, event_id, ticket_id):
+    """Create a second attendee and event, and transfer the ticket to the new attendee."""
+    other_user_id = crud_users.create_user({
+        "username": "newowner",
+        "password": "pass",
+        "email": "newowner@example.com",
+        "role": "attendee"
+    })
+    other_event_id = crud_events.create_event({"title": "Event B", "status": "active"})
+    other_event_id = other_event_id["id"] if isinstance(other_event_id, dict) else other_event_id
+    client.put(f"/tickets/{ticket_id}", json={"attendee_id": other_user_id})
+    return other_user_id, other_event_id
+
+
+def test_validate_ticket_stale_code_after_transfer(client, app, mock_user_and_event):
+    """
+    Test a signed code issued before a transfer no longer checks the ticket in.
+
+    Steps:
+        1. Create ticket and build its signed QR payload.
+        2. Transfer the ticket to another attendee and POST the old payload.
+        3. POST a payload issued to the new attendee.
+
+    Ensures:
+        - The stale code is rejected as an invalid ticket and the ticket stays valid.
+        - The new attendee's code checks the ticket in.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    stale = _signed_code(app, ticket_id, event_id, user_id)
+    other_user_id, _ = _transfer_and_second_event(client, user_id, event_id, ticket_id)
+
+    resp = client.post("/tickets/validate", json={"ticketId": stale, "eventId": event_id})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"valid": False, "error": "Ticket code was issued to another attendee"}
+    assert client.get(f"/tickets/{ticket_id}").get_json()["status"] == "valid"
+
+    current = _signed_code(app, ticket_id, event_id, other_user_id)
+    resp = client.post("/tickets/validate", json={"ticketId": current, "eventId": event_id})
+    assert resp.status_code == 200
+
+
+def test_validate_ticket_bare_id_wrong_event(client, mock_user_and_event):
+    """
+    Test a bare ticket ID scanned at another event is rejected as an invalid ticket.
+
+    Ensures:
+        - The scan returns 400 with the wrong-event error and the ticket stays valid.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    _, other_event_id = _transfer_and_second_event(client, user_id, event_id, ticket_id)
+
+    resp = client.post("/tickets/validate", json={"ticketId": str(ticket_id), "eventId": other_event_id})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"valid": False, "error": "Ticket is for a different event"}
+    assert client.get(f"/tickets/{ticket_id}").get_json()["status"] == "valid"
+
+
 def test_validate_ticket_not_found(client):
     """
     Test validating a nonexistent ticket returns 404.
@@ -330,6 +618,139 @@ def test_validate_ticket_internal_error(client, app, mock_user_and_event):
     assert "error" in resp.get_json()
 
 
+def test_validate_tickets_batch(client, mock_user_and_event):
+    """
+    Test uploading offline scans to POST /tickets/validate/batch.
+
+    Steps:
+        1. Create two tickets.
+        2. Upload scans out of time order, including a repeat, a missing and a malformed ID.
+
+    Ensures:
+        - Results come back in request order.
+        - The earliest scan of a repeated ticket is the one that checks it in.
+    """
+    user_id, event_id = mock_user_and_event
+    first = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    second = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+
+    resp = client.post("/tickets/validate/batch", json={"scans": [
+        {"ticketId": first, "scannedAt": "2025-11-01T18:05:00Z"},
+        {"ticketId": first, "scannedAt": "2025-11-01T18:00:00Z"},
+        {"ticketId": str(second)},
+        {"ticketId": 9999},
+        {"ticketId": "abc"}
+    ]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+
+    assert [r["result"] for r in body["results"]] == [
+        "duplicate", "checked-in", "checked-in", "not-found", "invalid"
+    ]
+    assert body["results"][1]["attendeeName"] == "ticketuser"
+    assert body["counts"] == {"duplicate": 1, "checked-in": 2, "not-found": 1, "invalid": 1}
+
+
+def test_validate_query_budget(client, mock_user_and_event, query_budget):
+    """
+    Test the SQL statements run by single and batch check-ins.
+
+    Steps:
+        1. Create twenty tickets.
+        2. Validate one ticket, then upload the other nineteen as a batch, inside query budgets.
+
+    Ensures:
+        - A single check-in takes at most two statements (the conditional UPDATE and the manifest log).
+        - The batch does not issue one statement per scan.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_ids = [
+        crud_ticket.create_ticket({"attendee_id": user_id, "event_id": event_id})
+        for _ in range(20)
+    ]
+
+    with query_budget(2):
+        resp = client.post("/tickets/validate", json={"ticketId": str(ticket_ids[0])})
+    assert resp.status_code == 200
+
+    with query_budget(3):
+        resp = client.post("/tickets/validate/batch", json={"scans": [
+            {"ticketId": str(ticket_id)} for ticket_id in ticket_ids[1:]
+        ]})
+    assert resp.get_json()["counts"] == {"checked-in": 19}
+
+
+def test_validate_tickets_batch_forged_code(client, app, mock_user_and_event):
+    """
+    Test a batch reports forged codes as invalid while checking in the signed ones.
+    """
+    user_id, event_id = mock_user_and_event
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    code = _signed_code(app, ticket_id, event_id, user_id)
+
+    resp = client.post("/tickets/validate/batch", json={
+        "eventId": event_id,
+        "scans": [{"ticketId": code[:-1] + ("A" if code[-1] != "A" else "B")}, {"ticketId": code}]
+    })
+    data = resp.get_json()
+
+    assert resp.status_code == 200
+    assert data["results"][0]["result"] == "invalid"
+    assert data["results"][0]["error"] == "Invalid ticket signature"
+    assert data["results"][1]["result"] == "checked-in"
+
+
+def test_validate_tickets_batch_mismatched_tickets(client, app, mock_user_and_event):
+    """
+    Test a batch reports stale and wrong-event scans as invalid without checking them in.
+
+    Steps:
+        1. Create two tickets; transfer the first to another attendee.
+        2. Upload, for a second event, the first ticket's stale signed code and the
+           second ticket's bare ID; then upload the second ticket's bare ID for its own event.
+
+    Ensures:
+        - Both mismatched scans are 'invalid' with their error and leave the tickets valid.
+        - The matching scan after them checks the second ticket in.
+    """
+    user_id, event_id = mock_user_and_event
+    first = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    second = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+    stale = _signed_code(app, first, event_id, user_id)
+    _, other_event_id = _transfer_and_second_event(client, user_id, event_id, first)
+
+    resp = client.post("/tickets/validate/batch", json={"scans": [
+        {"ticketId": stale},
+        {"ticketId": str(second), "scannedAt": "2024-01-01T10:00:00Z"}
+    ], "eventId": other_event_id})
+    assert resp.status_code == 200
+    results = resp.get_json()["results"]
+    assert [(result["result"], result.get("error")) for result in results] == [
+        ("invalid", "Ticket is for a different event"),
+        ("invalid", "Ticket is for a different event")
+    ]
+
+    resp = client.post("/tickets/validate/batch", json={"scans": [
+        {"ticketId": stale},
+        {"ticketId": str(second)}
+    ]})
+    results = resp.get_json()["results"]
+    assert [(result["result"], result.get("error")) for result in results] == [
+        ("invalid", "Ticket code was issued to another attendee"),
+        ("checked-in", None)
+    ]
+    assert client.get(f"/tickets/{first}").get_json()["status"] == "valid"
+
+
+def test_validate_tickets_batch_missing_scans(client):
+    """
+    Test that an empty batch is rejected.
+    """
+    resp = client.post("/tickets/validate/batch", json={"scans": []})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Scans required"
+
+
 # --- UPDATE ---
 def test_update_ticket_success(client, mock_user_and_event):
     """
@@ -372,6 +793,38 @@ def test_update_ticket_missing_data(client, mock_user_and_event):
     assert resp.get_json()["error"] == "Missing data"
 
 
+def test_update_ticket_same_event_on_full_event(client):
+    """
+    Test that resending a ticket's own event ID does not count as a move.
+
+    Steps:
+        1. Fill an event of capacity 1 with one ticket.
+        2. PUT the ticket with its event_id as a string, then as a number.
+        3. PUT a non-numeric event_id.
+
+    Ensures:
+        - Both no-op updates succeed instead of reporting the event sold out.
+        - A non-numeric event_id is rejected with 400.
+    """
+    user_id = crud_users.create_user({
+        "username": "holder",
+        "password": "pass",
+        "email": "holder@example.com",
+        "role": "student"
+    })
+    event_id = crud_events.create_event({"title": "Tiny", "capacity": 1})["id"]
+    ticket_id = client.post("/tickets", json={"attendee_id": user_id, "event_id": event_id}).get_json()["ticket"]
+
+    resp = client.put(f"/tickets/{ticket_id}", json={"event_id": str(event_id), "status": "valid"})
+    assert resp.status_code == 200
+    assert resp.get_json()["ticket"]["event_id"] == event_id
+    assert client.put(f"/tickets/{ticket_id}", json={"event_id": event_id}).status_code == 200
+
+    resp = client.put(f"/tickets/{ticket_id}", json={"event_id": "first"})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "Invalid Event ID format"
+
+
 # --- DELETE ---
 def test_delete_ticket_success(client, mock_user_and_event):
     """
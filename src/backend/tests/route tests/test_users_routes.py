@@ -1,3 +1,4 @@
+import json
 import pytest
 from db import db
 from db.models import User
@@ -150,6 +151,53 @@ def test_get_all_users(client):
     assert any(u["username"] == "u2" for u in users)
 
 
+def test_get_users_paginated(client):
+    """
+    Test keyset pagination on GET /users.
+
+    Ensures:
+        - A cursor without a limit is rejected.
+        - A limit switches the response to a page object.
+    """
+    client.post("/users", json={
+        "username": "u1",
+        "password": "p1",
+        "email": "u1@example.com",
+        "role": "user"
+    })
+
+    assert client.get("/users?after=abc").status_code == 400
+
+    response = client.get("/users?limit=10")
+    assert response.status_code == 200
+    page = response.get_json()
+    assert len(page["items"]) == 1
+    assert page["next_cursor"] is None
+
+
+def test_get_users_streamed(client):
+    """
+    Test streaming GET /users as NDJSON.
+
+    Ensures:
+        - Each line is one user object and passwords are never included.
+    """
+    for i in range(3):
+        client.post("/users", json={
+            "username": f"u{i}",
+            "password": "p",
+            "email": f"u{i}@example.com",
+            "role": "user"
+        })
+
+    response = client.get("/users?stream=ndjson")
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    users = [json.loads(line) for line in lines]
+    assert [u["username"] for u in users] == ["u0", "u1", "u2"]
+    assert all("password" not in u for u in users)
+
+
 def test_get_all_users_internal_error(client, app):
     """
     Test retrieving all users when DB is dropped.
@@ -0,0 +1,65 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import current_app, make_response, request
+from db.crud import crud_table_versions
+
+def collection_etag(table, version):
+    """Build the strong ETag of one representation of a versioned collection.
+
+    The query string and Accept header are part of the tag, because pages, streamed
+    formats and NDJSON are different bodies for the same table version.
+
+    Parameters: table (str): The table name.
+    version (int): The table's current version.
+
+    Returns: str: The ETag value (without quotes).
+    """
+    variant = hashlib.sha1(
+        request.query_string + b"|" + request.headers.get("Accept", "").encode()
+    ).hexdigest()[:12]
+    return f"{table}-{version}-{variant}"
+
+def versioned_collection(table):
+    """Decorate a list route with ETag/Last-Modified validators taken from a table's version.
+
+    The version is read with one primary key lookup before the view runs. A request whose
+    If-None-Match (or, without one, If-Modified-Since) still matches is answered with 304
+    and the view, and therefore the list query, is never called. If the version cannot be
+    read the view is served as usual, without validators.
+
+    Parameters: table (str): The table whose version is bumped by its CRUD write functions.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version, updated_at = crud_table_versions.get_version(table)
+            except RuntimeError:
+                return view(*args, **kwargs)
+
+            etag = collection_etag(table, version)
+            last_modified = None
+            if updated_at is not None:
+                last_modified = updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+
+            if request.if_none_match:
+                fresh = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                fresh = bool(last_modified and since and last_modified <= since)
+
+            if fresh:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            response.vary.add("Accept")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,331 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from flask import current_app, request
+from sqlalchemy import event as sa_event
+
+# Upper bounds of the histogram buckets, as in Prometheus' "le" label.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 500)
+RESPONSE_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class _SQLTally(threading.local):
+    """SQL statements, time and rows of the request running in the current thread."""
+    statements = 0
+    seconds = 0.0
+    rows = 0
+
+_tally = _SQLTally()
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds, rendered in Prometheus format."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        """Yield the _bucket, _sum and _count lines of this histogram."""
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{_labels(labels, le=bound)} {cumulative}'
+        yield f'{name}_sum{_labels(labels)} {self.sum}'
+        yield f'{name}_count{_labels(labels)} {self.count}'
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+def format_metric(name, kind, description, samples):
+    """
+    Format one metric family in the Prometheus text exposition format.
+
+    Parameters: name (str): The metric name.
+    kind (str): "counter" or "gauge".
+    description (str): The HELP text.
+    samples (list): (labels, value) pairs, where labels is a list of (name, value) pairs.
+
+    Returns: list: The exposition lines.
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+class RequestMetrics:
+    """
+    Per-endpoint request metrics of one app (and so one worker process).
+
+    Each request records its latency, status, the number of SQL statements it ran, the
+    time spent in them, the rows they returned and the size of the response.
+    """
+
+    def __init__(self):
+        self.requests = {}
+        self.latency = {}
+        self.sql_statements = {}
+        self.sql_seconds = {}
+        self.sql_rows = {}
+        self.response_bytes = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, method, status, seconds, statements, sql_seconds, rows, size):
+        """
+        Add one finished request to the metrics.
+
+        Parameters: endpoint (str): The view name, or "unmatched" when no route matched.
+        method (str): The HTTP method.
+        status (int): The response status code.
+        seconds (float): Time from the start of the request to its response, or to the
+        end of the body for streamed responses.
+        statements (int): SQL statements run by the request.
+        sql_seconds (float): Time spent executing them.
+        rows (int): Rows returned by them.
+        size (int or None): Response body size, or None for streamed responses.
+        """
+        with self._lock:
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self._histogram(self.latency, (endpoint, method), LATENCY_BUCKETS).observe(seconds)
+            self._histogram(self.sql_statements, endpoint, STATEMENT_BUCKETS).observe(statements)
+            self._histogram(self.sql_seconds, endpoint, LATENCY_BUCKETS).observe(sql_seconds)
+            self.sql_rows[endpoint] = self.sql_rows.get(endpoint, 0) + rows
+            if size is not None:
+                self._histogram(self.response_bytes, endpoint, RESPONSE_BYTES_BUCKETS).observe(size)
+
+    @staticmethod
+    def _histogram(histograms, key, buckets):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    def render(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns: list: The exposition lines.
+        """
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Requests handled, by endpoint, method and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels([('endpoint', endpoint), ('method', method), ('status', status)])} {count}")
+
+            sections = [
+                ("http_request_duration_seconds", "Request latency in seconds.", self.latency,
+                 lambda key: [("endpoint", key[0]), ("method", key[1])]),
+                ("http_request_sql_statements", "SQL statements run per request.", self.sql_statements,
+                 lambda key: [("endpoint", key)]),
+                ("http_request_sql_duration_seconds", "Time spent in SQL per request.", self.sql_seconds,
+                 lambda key: [("endpoint", key)]),
+                ("http_response_size_bytes", "Response body size (streamed responses excluded).", self.response_bytes,
+                 lambda key: [("endpoint", key)]),
+            ]
+            for name, description, histograms, labels in sections:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(histograms.items()):
+                    lines.extend(histogram.samples(name, labels(key)))
+
+            lines.append("# HELP http_request_sql_rows_total Rows returned by SQL statements, by endpoint.")
+            lines.append("# TYPE http_request_sql_rows_total counter")
+            for endpoint, rows in sorted(self.sql_rows.items()):
+                lines.append(f"http_request_sql_rows_total{_labels([('endpoint', endpoint)])} {rows}")
+        return lines
+
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    context.statement_start = time.perf_counter()
+
+def statement_seconds(context):
+    """
+    Return how long a statement took, from an after_cursor_execute listener.
+
+    Parameters: context (ExecutionContext): The statement's execution context, on an
+    engine passed to time_statements.
+
+    Returns: float: The seconds since the statement was sent to the database.
+    """
+    return time.perf_counter() - context.statement_start
+
+def time_statements(engine):
+    """
+    Record when each statement an engine runs starts, for statement_seconds().
+
+    The start time is kept on the statement's execution context, not on the pooled
+    connection, so a statement that fails leaves nothing behind.
+
+    Parameters: engine (Engine): The engine to time; calling this twice has no effect.
+    """
+    if not sa_event.contains(engine, "before_cursor_execute", _start_statement):
+        sa_event.listen(engine, "before_cursor_execute", _start_statement)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = statement_seconds(context)
+    _tally.statements += 1
+    _tally.seconds += seconds
+    if conn.dialect.name != "sqlite" and cursor.description is not None and cursor.rowcount > 0:
+        _tally.rows += cursor.rowcount
+
+def _count_row(cursor, row):
+    _tally.rows += 1
+    return row
+
+def _count_sqlite_rows(dbapi_connection, connection_record, connection_proxy):
+    # SQLite's cursor.rowcount is -1 for SELECT, so rows are counted as they are fetched.
+    if dbapi_connection.row_factory is not _count_row:
+        dbapi_connection.row_factory = _count_row
+
+def instrument_engine(engine):
+    """
+    Time every statement an engine runs and count the rows it returns.
+
+    Parameters: engine (Engine): The engine to instrument; calling this twice has no effect.
+    """
+    if sa_event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    time_statements(engine)
+    sa_event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if engine.dialect.name == "sqlite":
+        sa_event.listen(engine, "checkout", _count_sqlite_rows)
+
+def _start_request():
+    _tally.statements = 0
+    _tally.seconds = 0.0
+    _tally.rows = 0
+    request.environ["instrumentation.start"] = time.perf_counter()
+
+def _finish_request(response):
+    start = request.environ.get("instrumentation.start")
+    if start is None:
+        return response
+    metrics = current_app.extensions["metrics"]
+    endpoint, method, status = request.endpoint or "unmatched", request.method, response.status_code
+
+    def record(size=None):
+        metrics.record(
+            endpoint, method, status, time.perf_counter() - start,
+            _tally.statements, _tally.seconds, _tally.rows, size
+        )
+
+    if response.is_streamed and response.content_length is None:
+        # The body, and the SQL that produces it, only runs once this hook has returned.
+        response.call_on_close(record)
+    else:
+        record(response.calculate_content_length())
+    return response
+
+def normalize_statement(statement):
+    """
+    Collapse whitespace and expanded IN lists so the same query always has the same text.
+
+    Parameters: statement (str): A SQL statement as sent to the database.
+
+    Returns: str: The normalized statement.
+    """
+    return re.sub(r"\((?:\?|%s|%\(\w+\)s)(?:, (?:\?|%s|%\(\w+\)s))+\)", "(?, ...)", " ".join(statement.split()))
+
+class QueryCounter:
+    """
+    Context manager recording the SQL statements an engine runs inside a block.
+
+    Used as a regression guard against N+1 query patterns:
+
+        with QueryCounter(db.engine) as queries:
+            client.get("/events/1/participants")
+        queries.assert_at_most(3)
+
+    Attributes: statements (list): The statements run, in order.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        sa_event.listen(self.engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.engine, "after_cursor_execute", self._record)
+        return False
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated(self):
+        """
+        Group the recorded statements by their text, ignoring whitespace and IN-list length.
+
+        Returns: list: (statement, count) pairs for statements run more than once, most frequent first.
+        """
+        normalized = Counter(normalize_statement(statement) for statement in self.statements)
+        return [(statement, count) for statement, count in normalized.most_common() if count > 1]
+
+    def report(self):
+        """Describe the recorded statements, listing repeated ones first."""
+        lines = [f"{self.count} SQL statements"]
+        repeated = self.repeated()
+        if repeated:
+            lines.append("Repeated statements:")
+            lines.extend(f"  {count}x {statement}" for statement, count in repeated)
+        lines.append("All statements:")
+        lines.extend(f"  {index}. {' '.join(statement.split())}" for index, statement in enumerate(self.statements, 1))
+        return "\n".join(lines)
+
+    def assert_at_most(self, budget):
+        """
+        Fail when more statements than the budget were run.
+
+        Parameters: budget (int): The maximum number of statements allowed.
+
+        Raises: AssertionError: With the report of the statements, when the budget is exceeded.
+        """
+        if self.count > budget:
+            raise AssertionError(f"Query budget of {budget} exceeded: {self.report()}")
+
+def sql_tally():
+    """
+    Return the SQL statements, seconds and rows counted so far for the current request.
+
+    Returns: dict: "statements", "seconds" and "rows".
+    """
+    return {"statements": _tally.statements, "seconds": _tally.seconds, "rows": _tally.rows}
+
+def init_app(app):
+    """
+    Record request and SQL metrics for an app, unless METRICS_ENABLED is off.
+
+    Must be called after db.init_app(app), as it instruments the app's engine.
+
+    Parameters: app (Flask): The application to instrument.
+    """
+    from db import db
+
+    if not app.config.get("METRICS_ENABLED", True) or "metrics" in app.extensions:
+        return
+    app.extensions["metrics"] = RequestMetrics()
+    with app.app_context():
+        instrument_engine(db.engine)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
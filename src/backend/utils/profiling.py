@@ -0,0 +1,160 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from flask import current_app, g, request
+
+# Only one request is profiled at a time: cProfile cannot run two profilers at once
+# (Python 3.12+) and tracemalloc is process-wide. Requests arriving meanwhile run unprofiled.
+_profile_lock = threading.Lock()
+
+# Functions listed in the text report, by cumulative time.
+REPORT_FUNCTIONS = 40
+
+class RequestProfile:
+    """A cProfile run and, optionally, tracemalloc snapshots around one request."""
+
+    def __init__(self, trace_allocations):
+        self.profiler = cProfile.Profile()
+        self.started_tracing = False
+        self.before = None
+        self.after = None
+        if trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            self.before = tracemalloc.take_snapshot()
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        self.start = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.seconds = time.perf_counter() - self.start
+        if self.before is not None:
+            self.after = tracemalloc.take_snapshot()
+            if self.started_tracing:
+                tracemalloc.stop()
+
+    def report(self, title, top_allocations):
+        """Render the profile as text: the slowest functions and the largest allocation increases."""
+        out = io.StringIO()
+        out.write(f"{title}\n\n")
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+        if self.after is not None:
+            out.write(f"Top {top_allocations} allocation increases (tracemalloc):\n")
+            for stat in self.after.compare_to(self.before, "lineno")[:top_allocations]:
+                out.write(f"  {stat}\n")
+        return out.getvalue()
+
+def _requested(config):
+    """Tell whether the current request should be profiled, by admin header or sampling."""
+    token = config.get("PROFILE_TOKEN")
+    header = request.headers.get(config.get("PROFILE_HEADER", "X-Profile"))
+    if token and header and hmac.compare_digest(header.encode(), token.encode()):
+        return True
+    rate = config.get("PROFILE_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+def _start_profile():
+    config = current_app.config
+    if not _requested(config) or not _profile_lock.acquire(blocking=False):
+        return
+    try:
+        g.request_profile = RequestProfile(config.get("PROFILE_TRACEMALLOC", True))
+    except Exception:
+        _profile_lock.release()
+        raise
+
+def _rotate(directory, keep):
+    """Delete the oldest profiles so at most keep of them remain."""
+    stems = {}
+    for name in os.listdir(directory):
+        stem, extension = os.path.splitext(name)
+        if extension in (".prof", ".txt"):
+            stems.setdefault(stem, []).append(os.path.join(directory, name))
+    for stem in sorted(stems)[:max(len(stems) - keep, 0)]:
+        for path in stems[stem]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _complete(profile, app, endpoint, title):
+    """
+    Stop a profile, write it to PROFILE_DIR and release the profiling lock.
+
+    Returns: str or None: The stem of the profile's file names, or None if writing failed.
+    """
+    try:
+        profile.stop()
+        config = app.config
+        directory = config["PROFILE_DIR"]
+        os.makedirs(directory, exist_ok=True)
+        stem = f"{profile.stamp}-{endpoint}-{profile.seconds * 1000:.0f}ms"
+        profile.profiler.dump_stats(os.path.join(directory, stem + ".prof"))
+        with open(os.path.join(directory, stem + ".txt"), "w") as report:
+            report.write(profile.report(f"{title} in {profile.seconds * 1000:.1f} ms", config.get("PROFILE_TOP_ALLOCATIONS", 25)))
+        _rotate(directory, config.get("PROFILE_KEEP", 100))
+        return stem
+    except Exception as e:
+        app.logger.warning("Failed to write request profile: %s", e)
+        return None
+    finally:
+        _profile_lock.release()
+
+def _finish_profile(response):
+    profile = g.pop("request_profile", None)
+    if profile is None:
+        return response
+    app = current_app._get_current_object()
+    endpoint = re.sub(r"[^A-Za-z0-9_.-]", "_", request.endpoint or "unmatched")
+    title = f"{request.method} {request.full_path.rstrip('?')} -> {response.status_code}"
+
+    if response.is_streamed and response.content_length is None:
+        # The body is serialized while it is written, after this hook: keep profiling
+        # until the server closes the response. Only the start of the name is known now.
+        response.call_on_close(lambda: _complete(profile, app, endpoint, title))
+        response.headers["X-Profile-Id"] = f"{profile.stamp}-{endpoint}"
+        return response
+
+    stem = _complete(profile, app, endpoint, title)
+    if stem is not None:
+        response.headers["X-Profile-Id"] = stem
+    return response
+
+def _abandon_profile(error=None):
+    # The response hooks did not run (e.g. the client disconnected); stop without writing.
+    profile = g.pop("request_profile", None)
+    if profile is not None:
+        profile.stop()
+        _profile_lock.release()
+
+def init_app(app):
+    """
+    Profile requests that carry the admin profiling header, and a sample of the others.
+
+    A request is profiled when its PROFILE_HEADER header equals PROFILE_TOKEN, or at
+    random with probability PROFILE_SAMPLE_RATE. Its cProfile stats (.prof, readable
+    with pstats or snakeviz) and a text report with the slowest functions and the
+    tracemalloc allocation increases are written to PROFILE_DIR, named after the time,
+    the endpoint and the duration; only the newest PROFILE_KEEP profiles are kept. The
+    response names the profile in its X-Profile-Id header. A streamed response is
+    profiled until its body has been written, so its header only holds the start of
+    the name (the duration is not known yet).
+
+    Parameters: app (Flask): The application to profile.
+    """
+    if not app.config.get("PROFILE_TOKEN") and not app.config.get("PROFILE_SAMPLE_RATE"):
+        return
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abandon_profile)
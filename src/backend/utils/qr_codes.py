@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import hmac
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import qrcode
+
+# Bump when the content encoded in ticket QR codes changes, so cached images
+# and client ETags from the previous format are no longer reused.
+QR_PAYLOAD_VERSION = 2
+
+# Bytes of the HMAC-SHA256 digest kept in a signed payload; enough to make
+# forging a code infeasible while keeping the QR code small.
+SIGNATURE_BYTES = 12
+
+def _signature(message, key):
+    digest = hmac.new(key.encode(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:SIGNATURE_BYTES]).decode().rstrip("=")
+
+def _field(value):
+    return "" if value is None else str(int(value))
+
+def ticket_qr_payload(ticket_id, event_id, attendee_id, key):
+    """Build the signed text encoded into a ticket's QR code.
+
+    The payload has the form "<ticket>.<event>.<attendee>.<signature>", where the
+    signature is a truncated HMAC-SHA256 over the three IDs, so a scanner can check
+    that a code was issued by this server without looking the ticket up.
+
+    Parameters: ticket_id (int): The ID of the ticket.
+    event_id (int or None): The event the ticket is for.
+    attendee_id (int or None): The ticket holder.
+    key (str): The QR signing key.
+
+    Returns: str: The QR payload.
+    """
+    message = ".".join(_field(value) for value in (ticket_id, event_id, attendee_id))
+    return f"{message}.{_signature(message, key)}"
+
+def verify_ticket_payload(payload, key):
+    """Check the signature of a scanned QR payload without touching the database.
+
+    Parameters: payload (str): The scanned text.
+    key (str): The QR signing key.
+
+    Returns: dict: The ticket_id, event_id and attendee_id carried by the payload.
+
+    Raises: ValueError: If the payload is malformed or its signature does not match.
+    """
+    parts = payload.split(".")
+    if len(parts) != 4:
+        raise ValueError("Malformed ticket code")
+
+    message, signature = ".".join(parts[:3]), parts[3]
+    if not hmac.compare_digest(signature.encode(), _signature(message, key).encode()):
+        raise ValueError("Invalid ticket signature")
+
+    try:
+        ticket_id, event_id, attendee_id = (int(part) if part else None for part in parts[:3])
+    except ValueError:
+        raise ValueError("Malformed ticket code")
+    if ticket_id is None:
+        raise ValueError("Malformed ticket code")
+
+    return {"ticket_id": ticket_id, "event_id": event_id, "attendee_id": attendee_id}
+
+def render_qr_png(payload):
+    """Render a QR code image and encode it as PNG.
+
+    Parameters: payload (str): The text to encode.
+
+    Returns: bytes: The PNG image data.
+    """
+    img = qrcode.make(payload)
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+class QRCodeCache:
+    """Bounded LRU cache of rendered QR code PNGs, optionally backed by a directory on disk.
+
+    Entries are content-addressed: the key (also used as the HTTP ETag) is a hash of the
+    payload version and the payload, so it can be computed without rendering anything.
+    """
+
+    def __init__(self, max_entries=1024, directory=None, version=QR_PAYLOAD_VERSION):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qr-prerender")
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def etag(self, payload):
+        """Return the content address of a payload's QR image."""
+        return hashlib.sha256(f"v{self.version}:{payload}".encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._entries[key] = png
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, payload):
+        """Return the PNG for a payload, rendering it only on a miss in memory and on disk.
+
+        Parameters: payload (str): The text to encode.
+
+        Returns: tuple: The ETag and the PNG image data.
+        """
+        key = self.etag(payload)
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, png
+            self.misses += 1
+
+        png = None
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as f:
+                png = f.read()
+        if png is None:
+            png = render_qr_png(payload)
+            if self.directory:
+                tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(png)
+                os.replace(tmp_path, self._path(key))
+
+        self._remember(key, png)
+        return key, png
+
+    def prerender(self, payload):
+        """Render a payload's QR code in the background so the first view is a cache hit.
+
+        Parameters: payload (str): The text to encode.
+
+        Returns: Future: Completes once the image is cached.
+        """
+        return self._executor.submit(self.get, payload)
+
+    def stats(self):
+        """Return the cache's hit, miss and eviction counters and its current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries)
+            }
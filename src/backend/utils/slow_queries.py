@@ -0,0 +1,177 @@
+import sys
+import threading
+import time
+from sqlalchemy import event as sa_event
+from utils.instrumentation import normalize_statement, statement_seconds, time_statements
+
+# Statements whose plan is captured; other statements (PRAGMA, BEGIN, ...) are logged without one.
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+# Longest parameter text written to the log for one statement.
+MAX_PARAMETERS_LENGTH = 500
+
+# db.crud modules that only run other CRUD functions' work (transactions, the write
+# queue, the entity cache); statements are attributed to the function they ran for.
+INFRASTRUCTURE_MODULES = {"db.crud.crud_transactions", "db.crud.crud_write_queue", "db.crud.crud_cache"}
+
+def calling_crud_function():
+    """
+    Find the CRUD function that is running the current statement by walking up the stack.
+
+    The outermost CRUD function is reported, since that is the one a route called. When
+    the statement was issued further in (e.g. by an autoflush in a helper), the innermost
+    CRUD function is added after "via".
+
+    Returns: str or None: e.g. "crud_ticket.get_tickets_by_event", or None when the
+    statement was not issued from the db.crud package.
+    """
+    callers = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("db.crud.") and module not in INFRASTRUCTURE_MODULES:
+            code = frame.f_code
+            name = getattr(code, "co_qualname", code.co_name).split(".<locals>")[0]
+            callers.append(f"{module.rsplit('.', 1)[-1]}.{name}")
+        frame = frame.f_back
+    if not callers:
+        return None
+    if callers[0] != callers[-1]:
+        return f"{callers[-1]} via {callers[0]}"
+    return callers[-1]
+
+def explain(cursor, dialect, statement, parameters):
+    """
+    Return the query plan of a statement, run on the same DBAPI connection.
+
+    Parameters: cursor: The DBAPI cursor that ran the statement.
+    dialect (str): The SQLAlchemy dialect name.
+    statement (str): The statement.
+    parameters: The parameters it was run with.
+
+    Returns: list: The plan, one line per row, or an explanation of why it is missing.
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute(prefix + statement, parameters)
+        rows = plan_cursor.fetchall()
+    except Exception as e:
+        return [f"(plan unavailable: {e})"]
+    finally:
+        plan_cursor.close()
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [" ".join(str(value) for value in row) for row in rows]
+
+class SlowQueryLog:
+    """
+    Logs statements slower than a threshold, with a rate limit so logging stays off the hot path.
+
+    Each distinct statement (see normalize_statement) is logged at most once per interval
+    and at most limit entries are written per interval in total. Occurrences that are not
+    logged are counted and reported with the statement's next entry.
+    """
+
+    def __init__(self, logger, threshold, explain_plans=True, interval=60, limit=20, clock=time.monotonic):
+        self.logger = logger
+        self.threshold = threshold
+        self.explain_plans = explain_plans
+        self.interval = interval
+        self.limit = limit
+        self.clock = clock
+        self.slow = 0
+        self.logged = 0
+        self.suppressed = 0
+        self._last_logged = {}
+        self._pending = {}
+        self._window_start = clock()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def _admit(self, key):
+        """Decide whether to log a slow statement; returns the occurrences suppressed since its last entry, or None."""
+        now = self.clock()
+        with self._lock:
+            self.slow += 1
+            if now - self._window_start >= self.interval:
+                self._window_start = now
+                self._window_count = 0
+                self._last_logged = {
+                    statement: logged_at for statement, logged_at in self._last_logged.items()
+                    if now - logged_at < self.interval
+                }
+            last = self._last_logged.get(key)
+            if (last is not None and now - last < self.interval) or self._window_count >= self.limit:
+                self.suppressed += 1
+                self._pending[key] = self._pending.get(key, 0) + 1
+                return None
+            self._last_logged[key] = now
+            self._window_count += 1
+            self.logged += 1
+            return self._pending.pop(key, 0)
+
+    def observe(self, cursor, dialect, statement, parameters, seconds, executemany):
+        """Log a statement if it took longer than the threshold and the rate limit allows it."""
+        if seconds * 1000 < self.threshold:
+            return
+        key = normalize_statement(statement)
+        suppressed = self._admit(key)
+        if suppressed is None:
+            return
+
+        caller = calling_crud_function() or "(outside db.crud)"
+        params = repr(parameters)
+        if len(params) > MAX_PARAMETERS_LENGTH:
+            params = params[:MAX_PARAMETERS_LENGTH] + "..."
+        lines = [
+            f"Slow query ({seconds * 1000:.1f} ms) in {caller}",
+            f"  statement: {' '.join(statement.split())}",
+            f"  parameters: {params}",
+        ]
+        if suppressed:
+            lines.append(f"  similar slow queries not logged since the last entry: {suppressed}")
+        if self.explain_plans and not executemany:
+            plan = explain(cursor, dialect, statement, parameters)
+            if plan:
+                lines.append("  plan:")
+                lines.extend(f"    {row}" for row in plan)
+        self.logger.warning("\n".join(lines))
+
+    def stats(self):
+        """Return the number of slow statements seen, logged and suppressed by the rate limit."""
+        with self._lock:
+            return {"slow": self.slow, "logged": self.logged, "suppressed": self.suppressed}
+
+def init_app(app):
+    """
+    Log the app's slow statements, unless SLOW_QUERY_MS is None.
+
+    Must be called after db.init_app(app). The log is kept in app.extensions["slow_queries"].
+    Statements are timed by the listener shared with the request metrics (see
+    instrumentation.time_statements).
+
+    Parameters: app (Flask): The application whose engine is watched.
+    """
+    from db import db
+
+    threshold = app.config.get("SLOW_QUERY_MS")
+    if threshold is None or "slow_queries" in app.extensions:
+        return
+    log = SlowQueryLog(
+        app.logger,
+        threshold,
+        app.config.get("SLOW_QUERY_EXPLAIN", True),
+        app.config.get("SLOW_QUERY_LOG_INTERVAL", 60),
+        app.config.get("SLOW_QUERY_LOG_LIMIT", 20)
+    )
+    app.extensions["slow_queries"] = log
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.observe(cursor, conn.dialect.name, statement, parameters, statement_seconds(context), executemany)
+
+    with app.app_context():
+        time_statements(db.engine)
+        sa_event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
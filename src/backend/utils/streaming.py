@@ -0,0 +1,70 @@
+from itertools import chain, islice
+from flask import Response, current_app, stream_with_context
+
+STREAM_MIMETYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows encoded and joined into one chunk of a streamed response.
+STREAM_CHUNK_ROWS = 500
+
+def parse_stream_format(request):
+    """Work out whether a list request asked for a streamed response.
+
+    A client opts in with ?stream=json (one JSON array, written incrementally) or
+    ?stream=ndjson (one JSON object per line), or by accepting application/x-ndjson.
+
+    Parameters: request (Request): The current request.
+
+    Returns: str or None: "json", "ndjson", or None for a regular response.
+
+    Raises: ValueError: If the stream parameter is not a known format or is combined with a page limit.
+    """
+    stream = request.args.get('stream')
+    if stream is None:
+        best = request.accept_mimetypes.best_match(list(STREAM_MIMETYPES.values()))
+        stream = 'ndjson' if best == STREAM_MIMETYPES['ndjson'] else None
+    if stream is None:
+        return None
+
+    if stream not in STREAM_MIMETYPES:
+        raise ValueError("Stream must be 'json' or 'ndjson'")
+    if request.args.get('limit') is not None or request.args.get('after') is not None:
+        raise ValueError('Streaming cannot be combined with a page limit')
+    return stream
+
+def _json_array_chunks(rows, dumps):
+    yield "["
+    separator = ""
+    while True:
+        batch = [dumps(row) for row in islice(rows, STREAM_CHUNK_ROWS)]
+        if not batch:
+            break
+        yield separator + ",".join(batch)
+        separator = ","
+    yield "]"
+
+def _ndjson_chunks(rows, dumps):
+    while True:
+        batch = [dumps(row) for row in islice(rows, STREAM_CHUNK_ROWS)]
+        if not batch:
+            break
+        yield "\n".join(batch) + "\n"
+
+def stream_response(rows, stream_format):
+    """Build a response that writes rows to the client as they are read from the database.
+
+    The first row is fetched before the response is returned, so a failing query
+    still produces an error response instead of a truncated 200.
+
+    Parameters: rows (iterator): Row dictionaries, e.g. from a CRUD iter_* function.
+    stream_format (str): "json" or "ndjson", as returned by parse_stream_format.
+
+    Returns: Response: A streamed response with the matching mimetype.
+    """
+    rows = iter(rows)
+    rows = chain(list(islice(rows, 1)), rows)
+    dumps = current_app.json.dumps
+    chunks = _ndjson_chunks(rows, dumps) if stream_format == 'ndjson' else _json_array_chunks(rows, dumps)
+    return Response(stream_with_context(chunks), mimetype=STREAM_MIMETYPES[stream_format])
@@ -29,4 +29,33 @@ def validate_profile_data(data):
     return {
         'valid': len(errors) == 0,
         'errors': errors
-    }
\ No newline at end of file
+    }
+
+MAX_PAGE_LIMIT = 500
+
+def parse_page_args(args):
+    """Parse the optional keyset pagination parameters of a list request.
+
+    Parameters: args (MultiDict): The query string arguments of the request ("limit" and "after").
+
+    Returns: tuple: (limit, after). limit is None when the client did not ask for a page,
+    in which case the full collection should be returned.
+
+    Raises: ValueError: If limit is not a positive integer or a cursor is sent without a limit.
+    """
+    limit = args.get('limit')
+    after = args.get('after') or None
+
+    if limit is None:
+        if after is not None:
+            raise ValueError('A limit is required when using a cursor')
+        return None, None
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('Limit must be an integer')
+    if limit < 1:
+        raise ValueError('Limit must be a positive integer')
+
+    return min(limit, MAX_PAGE_LIMIT), after
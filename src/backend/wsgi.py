@@ -0,0 +1,13 @@
+"""Production WSGI entry point.
+
+Serve it with gunicorn from the src/backend directory (settings in gunicorn.conf.py):
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The profile defaults to "prod"; set APP_PROFILE to use another one.
+"""
+import os
+from app import create_app, prepare_database
+
+app = create_app(os.environ.get("APP_PROFILE", "prod"))
+prepare_database(app)
@@ -8,92 +8,48 @@ async function loadAnalytics() {
         console.log("Starting analytics load from:", BACKEND_URL);
 
         // ============================
-        // Fetch Events
+        // Fetch aggregated summary
         // ============================
-        console.log("Fetching events...");
-        const eventsResponse = await fetch(`${BACKEND_URL}/events`);
-        console.log("Events response status:", eventsResponse.status);
-        
-        if (!eventsResponse.ok) {
-            throw new Error(`Events fetch failed with status ${eventsResponse.status}`);
+        // The backend counts events, users and tickets in SQL, so we only
+        // download a handful of numbers instead of the three full tables.
+        console.log("Fetching analytics summary...");
+        const summaryResponse = await fetch(`${BACKEND_URL}/analytics/summary`);
+        console.log("Summary response status:", summaryResponse.status);
+
+        if (!summaryResponse.ok) {
+            throw new Error(`Summary fetch failed with status ${summaryResponse.status}`);
         }
-        
-        const events = await eventsResponse.json();
-        console.log("Events data received:", events);
 
-        const totalEvents = events.length;
-
-        // Your backend returns: status: "published"
-        const publishedEvents = events.filter(e =>
-            e.status && e.status.toLowerCase() === "published"
-        ).length;
+        const summary = await summaryResponse.json();
+        console.log("Summary data received:", summary);
 
+        // Events (status counts are lower-cased by the backend)
+        const totalEvents = summary.events.total;
+        const publishedEvents = summary.events.by_status.published || 0;
         console.log("Total events:", totalEvents, "Published:", publishedEvents);
         document.getElementById("stat-total-events").textContent = totalEvents;
         document.getElementById("stat-published-events").textContent = publishedEvents;
 
-
-        // ============================
-        // Fetch Users and filter by role
-        // ============================
-        console.log("Fetching users...");
-        const usersResponse = await fetch(`${BACKEND_URL}/users`);
-        console.log("Users response status:", usersResponse.status);
-        
-        if (!usersResponse.ok) {
-            throw new Error(`Users fetch failed with status ${usersResponse.status}`);
-        }
-        
-        const users = await usersResponse.json();
-        console.log("Users data received:", users);
-
-        // Filter students (role = "student")
-        const students = users.filter(u => u.role && u.role.toLowerCase() === "student");
-        console.log("Students count:", students.length);
-        document.getElementById("stat-total-students").textContent = students.length;
-
-        // Filter organizers (role = "organizer")
-        const organizers = users.filter(u => u.role && u.role.toLowerCase() === "organizer");
-        console.log("Organizers count:", organizers.length);
-        document.getElementById("stat-total-organizers").textContent = organizers.length;
-
-        // ============================
-        // Fetch Tickets for sales data
-        // ============================
-        console.log("Fetching tickets...");
-        const ticketsResponse = await fetch(`${BACKEND_URL}/tickets`);
-        console.log("Tickets response status:", ticketsResponse.status);
-        
-        if (ticketsResponse.ok) {
-            const tickets = await ticketsResponse.json();
-            console.log("Tickets data received:", tickets);
-
-            // Count total tickets purchased
-            const totalTickets = tickets.length;
-            console.log("Total tickets purchased:", totalTickets);
-            document.getElementById("stat-tickets-purchased").textContent = totalTickets;
-
-            // Calculate total sales from event prices
-            // We already have events data, so match tickets to events and sum prices
-            let totalSales = 0;
-            tickets.forEach(ticket => {
-                const event = events.find(e => e.id === ticket.event_id);
-                if (event && event.price) {
-                    totalSales += parseFloat(event.price);
-                }
-            });
-            console.log("Total sales:", totalSales);
-            document.getElementById("stat-total-sales").textContent = `$${totalSales.toFixed(2)}`;
-
-            // Count checked-in attendees (tickets with status 'checked-in')
-            const checkedInAttendees = tickets.filter(ticket => 
-                ticket.status && ticket.status.toLowerCase() === 'checked-in'
-            ).length;
-            console.log("Checked-in attendees:", checkedInAttendees);
-            document.getElementById("stat-total-attendees").textContent = checkedInAttendees;
-        } else {
-            console.warn("Could not fetch tickets:", ticketsResponse.status);
-        }
+        // Users by role
+        const students = summary.users.by_role.student || 0;
+        const organizers = summary.users.by_role.organizer || 0;
+        console.log("Students count:", students, "Organizers count:", organizers);
+        document.getElementById("stat-total-students").textContent = students;
+        document.getElementById("stat-total-organizers").textContent = organizers;
+
+        // Tickets and sales
+        const totalTickets = summary.tickets.total;
+        console.log("Total tickets purchased:", totalTickets);
+        document.getElementById("stat-tickets-purchased").textContent = totalTickets;
+
+        const totalSales = summary.sales || 0;
+        console.log("Total sales:", totalSales);
+        document.getElementById("stat-total-sales").textContent = `$${totalSales.toFixed(2)}`;
+
+        // Checked-in attendees
+        const checkedInAttendees = summary.tickets.by_status["checked-in"] || 0;
+        console.log("Checked-in attendees:", checkedInAttendees);
+        document.getElementById("stat-total-attendees").textContent = checkedInAttendees;
 
     } catch (error) {
         console.error("Error loading analytics:", error);
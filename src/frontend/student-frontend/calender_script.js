@@ -24,26 +24,29 @@ function getCookie(name) {
 
 // Cache for calendar events to avoid excessive API calls
 const eventCache = {
+  key: null,
   data: null,
   timestamp: null,
   TTL: 5 * 60 * 1000 // 5 minutes cache duration
 };
 
-function isCacheValid() {
-  return eventCache.data !== null && 
+function isCacheValid(key) {
+  return eventCache.key === key &&
+         eventCache.data !== null && 
          eventCache.timestamp !== null && 
          (Date.now() - eventCache.timestamp) < eventCache.TTL;
 }
 
-function getCachedEvents() {
-  if (isCacheValid()) {
+function getCachedEvents(key) {
+  if (isCacheValid(key)) {
     console.debug('Using cached events');
     return eventCache.data;
   }
   return null;
 }
 
-function setCachedEvents(data) {
+function setCachedEvents(key, data) {
+  eventCache.key = key;
   eventCache.data = data;
   eventCache.timestamp = Date.now();
   console.debug('Events cached, TTL:', eventCache.TTL);
@@ -195,8 +198,9 @@ function loadCalendarForStudent(calendarEl, studentId) {
         
         //DATA FEED CONFIGURATION
         events: function(fetchInfo, successCallback, failureCallback) {
-            // Check if we have cached events first
-            const cachedEvents = getCachedEvents();
+            // Check if we have cached events for the visible range first
+            const cacheKey = `${fetchInfo.startStr}|${fetchInfo.endStr}`;
+            const cachedEvents = getCachedEvents(cacheKey);
             if (cachedEvents) {
                 successCallback(cachedEvents);
                 return;
@@ -210,10 +214,12 @@ function loadCalendarForStudent(calendarEl, studentId) {
                 url: apiPath, 
                 method: 'GET',
                 dataType: 'json',
+                // Only ask the backend for the date range the calendar is showing
+                data: { start: fetchInfo.startStr, end: fetchInfo.endStr },
                 
                 success: function(response) {
                     // Cache the events
-                    setCachedEvents(response);
+                    setCachedEvents(cacheKey, response);
                     // Show all events that the student has tickets for
                     successCallback(response); 
                 },
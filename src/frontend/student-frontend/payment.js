@@ -185,7 +185,7 @@ form.addEventListener("submit", async (e) => {
 
       if (!resp.ok) {
         const err = await resp.json().catch(() => ({}));
-        throw new Error(err.message || `Server returned ${resp.status}`);
+        throw new Error(err.error || err.message || `Server returned ${resp.status}`);
       }
 
       const respPayload = await resp.json();